@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Offline mock of the parts of x.com the scrapers touch.
+
+Serves a login flow, /home, /<handle>, /<handle>/likes and
+/<handle>/with_replies with the markup the extraction scripts read
+(cellInnerDiv cells, <article>, data-testid="tweetText", <time> permalinks,
+engagement testids, quote cards and conversation threads). The timelines
+are rendered client-side from GraphQL-shaped responses at
+/i/api/graphql/mock/<Operation>, so interception mode works too.
+
+Everything is synthetic and deterministic for a given MockXConfig:
+timeline size, page size, API latency, quote depth and reply depth are
+configurable, and the page keeps only `window` cells mounted like X's
+virtualized list.
+
+Usage:
+    python benchmarks/mock_x_server.py --port 8765 --posts 500 --latency-ms 150
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+AUTH_COOKIE = "auth_token"
+NEWEST_ID = 1900000000000000000
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+AUTHORS = [
+    ("ada", "Ada Lovelace"),
+    ("alan", "Alan Turing"),
+    ("grace", "Grace Hopper"),
+    ("linus", "Linus Torvalds"),
+    ("margaret", "Margaret Hamilton"),
+    ("ken", "Ken Thompson"),
+]
+
+WORDS = ("graph", "scroll", "timeline", "latency", "cache", "browser", "thread", "signal", "network",
+         "index", "stream", "query", "vector", "session", "render", "parser", "memory", "bandwidth")
+
+# page path suffix -> GraphQL operation, as in timeline_interceptor.TIMELINE_OPERATIONS
+PAGE_OPERATIONS = {
+    "": "UserTweets",
+    "likes": "Likes",
+    "with_replies": "UserTweetsAndReplies",
+}
+
+
+class MockXConfig:
+    """Shape of the synthetic timelines"""
+
+    def __init__(self, total_posts=200, page_size=20, latency_ms=100, quote_depth=1, quote_every=5,
+                 reply_depth=2, window=60, seed=7):
+        self.total_posts = total_posts
+        self.page_size = page_size
+        self.latency_ms = latency_ms
+        self.quote_depth = quote_depth
+        self.quote_every = quote_every
+        self.reply_depth = reply_depth
+        self.window = window
+        self.seed = seed
+
+
+def _created_at(offset_minutes):
+    return (EPOCH - timedelta(minutes=offset_minutes)).strftime("%a %b %d %H:%M:%S +0000 %Y")
+
+
+class SyntheticTimeline:
+    """Deterministic GraphQL-shaped timeline entries for one (operation, handle)"""
+
+    def __init__(self, config, operation, handle):
+        self.config = config
+        self.operation = operation
+        self.handle = handle
+        self.rng = None
+        self._next_embedded_id = None
+
+    def _author(self, index):
+        if self.operation in ("UserTweets", "UserTweetsAndReplies"):
+            return self.handle, self.handle.capitalize()
+        return AUTHORS[index % len(AUTHORS)]
+
+    def _text(self):
+        return " ".join(self.rng.choice(WORDS) for _ in range(self.rng.randint(6, 24)))
+
+    def tweet(self, tweet_id, username, name, minutes_ago, quote_depth=0, reply_to=None):
+        legacy = {
+            "id_str": str(tweet_id),
+            "full_text": self._text(),
+            "created_at": _created_at(minutes_ago),
+            "favorite_count": self.rng.randint(0, 50000),
+            "retweet_count": self.rng.randint(0, 5000),
+            "reply_count": self.rng.randint(0, 900),
+            "quote_count": self.rng.randint(0, 300),
+        }
+        if self.rng.random() < 0.3:
+            legacy["extended_entities"] = {"media": [
+                {"type": "photo", "media_url_https": f"https://pbs.twimg.com/media/mock{tweet_id}.jpg"}
+            ]}
+        if reply_to:
+            legacy["in_reply_to_status_id_str"] = str(reply_to[0])
+            legacy["in_reply_to_screen_name"] = reply_to[1]
+        tweet = {
+            "__typename": "Tweet",
+            "rest_id": str(tweet_id),
+            "core": {"user_results": {"result": {"__typename": "User", "core": {"name": name, "screen_name": username}}}},
+            "legacy": legacy,
+            "views": {"count": str(self.rng.randint(100, 2000000))},
+        }
+        if quote_depth > 0:
+            self._next_embedded_id -= 1
+            quoted_username, quoted_name = self.rng.choice(AUTHORS)
+            tweet["quoted_status_result"] = {"result": self.tweet(
+                self._next_embedded_id, quoted_username, quoted_name, minutes_ago + 600, quote_depth - 1
+            )}
+        return tweet
+
+    @staticmethod
+    def _item(tweet):
+        return {"itemType": "TimelineTweet", "tweet_results": {"result": tweet}}
+
+    def entry(self, index):
+        # Seeded per entry so a post looks the same whichever page it is served on
+        self.rng = random.Random(f"{self.config.seed}:{self.operation}:{self.handle}:{index}")
+        self._next_embedded_id = NEWEST_ID - 10 ** 15 - index * 100
+        tweet_id = NEWEST_ID - index * 1000
+        username, name = self._author(index)
+        minutes_ago = index * 37
+        quote_depth = self.config.quote_depth if self.config.quote_every and index % self.config.quote_every == 1 else 0
+        if self.operation == "UserTweetsAndReplies" and self.config.reply_depth and index % 2 == 1:
+            # Conversation module: ancestors root-first, then the handle's reply
+            items, parent = [], None
+            for depth in range(self.config.reply_depth, 0, -1):
+                ancestor_id = tweet_id - depth
+                ancestor_username, ancestor_name = AUTHORS[(index + depth) % len(AUTHORS)]
+                items.append(self.tweet(ancestor_id, ancestor_username, ancestor_name, minutes_ago + depth * 5,
+                                        reply_to=parent))
+                parent = (ancestor_id, ancestor_username)
+            items.append(self.tweet(tweet_id, username, name, minutes_ago, quote_depth, reply_to=parent))
+            return {
+                "entryId": f"profile-conversation-{tweet_id}",
+                "content": {
+                    "entryType": "TimelineTimelineModule",
+                    "items": [{"entryId": f"profile-conversation-{tweet_id}-tweet-{t['rest_id']}",
+                               "item": {"itemContent": self._item(t)}} for t in items],
+                },
+            }
+        return {
+            "entryId": f"tweet-{tweet_id}",
+            "content": {"entryType": "TimelineTimelineItem",
+                        "itemContent": self._item(self.tweet(tweet_id, username, name, minutes_ago, quote_depth))},
+        }
+
+    def page(self, cursor):
+        """Response body for one page; the bottom cursor is omitted at the end of the timeline"""
+        start = int(cursor or 0)
+        end = min(start + self.config.page_size, self.config.total_posts)
+        entries = [self.entry(i) for i in range(start, end)]
+        if end < self.config.total_posts:
+            entries.append({"entryId": f"cursor-bottom-{end}",
+                            "content": {"entryType": "TimelineTimelineCursor", "cursorType": "Bottom", "value": str(end)}})
+        instructions = [{"type": "TimelineAddEntries", "entries": entries}]
+        if self.operation in ("HomeTimeline", "HomeLatestTimeline"):
+            return {"data": {"home": {"home_timeline_urt": {"instructions": instructions}}}}
+        return {"data": {"user": {"result": {"__typename": "User",
+                                             "timeline_v2": {"timeline": {"instructions": instructions}}}}}}
+
+
+LOGIN_PAGE = """<!doctype html>
+<html><head><title>Log in to X</title></head><body>
+<main>
+  <div id="step-username">
+    <input autocomplete="username" placeholder="Phone, email, or username">
+    <div role="button" id="next">Next</div>
+  </div>
+  <div id="step-password" style="display:none">
+    <input type="password" autocomplete="current-password">
+    <div role="button" data-testid="LoginButton">Log in</div>
+  </div>
+</main>
+<script>
+  document.getElementById('next').addEventListener('click', () => {
+    document.getElementById('step-username').style.display = 'none';
+    document.getElementById('step-password').style.display = 'block';
+  });
+  document.querySelector('[data-testid="LoginButton"]').addEventListener('click', () => {
+    document.cookie = 'auth_token=mock; path=/';
+    window.location.href = '/home';
+  });
+</script>
+</body></html>
+"""
+
+TIMELINE_PAGE = """<!doctype html>
+<html><head><title>X</title>
+<style>
+  body { margin: 0; font-family: sans-serif; }
+  nav { position: fixed; left: 0; top: 0; width: 200px; }
+  main { margin-left: 220px; width: 600px; }
+  article { border-bottom: 1px solid #ddd; padding: 12px; min-height: 120px; }
+  div[data-testid="tweet"] article { border: 1px solid #ccc; min-height: 40px; }
+</style></head><body>
+<nav>
+  <a data-testid="AppTabBar_Home_Link" href="/home" role="link">Home</a>
+  <div data-testid="SideNav_AccountSwitcher_Button" role="button">Account</div>
+</nav>
+<main>
+  <div aria-label="Timeline: __LABEL__">
+    <div id="spacer"></div>
+    <div id="cells"></div>
+    <div id="sentinel" style="height: 1px"></div>
+  </div>
+</main>
+<script>
+  const OPERATION = '__OPERATION__';
+  const WINDOW = __WINDOW__;
+  const cells = document.getElementById('cells');
+  const spacer = document.getElementById('spacer');
+  let cursor = '0';
+  let loading = false;
+
+  function compact(n) {
+    if (n >= 1e6) return (n / 1e6).toFixed(1).replace(/\\.0$/, '') + 'M';
+    if (n >= 1e3) return (n / 1e3).toFixed(1).replace(/\\.0$/, '') + 'K';
+    return String(n);
+  }
+
+  function el(tag, attrs, children) {
+    const node = document.createElement(tag);
+    Object.entries(attrs || {}).forEach(([k, v]) => node.setAttribute(k, v));
+    (children || []).forEach(child => node.append(child));
+    return node;
+  }
+
+  function renderTweet(tweet, nested) {
+    const user = tweet.core.user_results.result.core;
+    const legacy = tweet.legacy;
+    const date = new Date(legacy.created_at).toISOString();
+    const parts = [
+      el('div', {'data-testid': 'User-Name'}, [el('a', {role: 'link', href: '/' + user.screen_name}, [el('span', {}, [user.name])])]),
+      el('a', {href: '/' + user.screen_name + '/status/' + tweet.rest_id}, [el('time', {datetime: date}, [date.slice(0, 10)])]),
+    ];
+    if (legacy.in_reply_to_screen_name) {
+      parts.push(el('div', {}, ['Replying to @' + legacy.in_reply_to_screen_name]));
+    }
+    parts.push(el('div', {'data-testid': 'tweetText', lang: 'en'}, [legacy.full_text]));
+    ((legacy.extended_entities || {}).media || []).forEach(m => parts.push(el('img', {src: m.media_url_https, alt: 'Image'})));
+    const quoted = (tweet.quoted_status_result || {}).result;
+    if (quoted) {
+      parts.push(el('div', {'data-testid': 'tweet'}, [renderTweet(quoted, true)]));
+    }
+    if (!nested) {
+      parts.push(el('div', {role: 'group'}, [
+        el('div', {'data-testid': 'reply'}, [compact(legacy.reply_count)]),
+        el('div', {'data-testid': 'retweet'}, [compact(legacy.retweet_count)]),
+        el('div', {'data-testid': 'like'}, [compact(legacy.favorite_count)]),
+        el('div', {'data-testid': 'viewCount'}, [compact(Number(tweet.views.count))]),
+      ]));
+    }
+    return el('article', {role: 'article', tabindex: '0'}, parts);
+  }
+
+  function renderEntry(entry) {
+    const content = entry.content;
+    if (content.entryType === 'TimelineTimelineItem') {
+      return el('div', {'data-testid': 'cellInnerDiv'}, [renderTweet(content.itemContent.tweet_results.result)]);
+    }
+    if (content.entryType === 'TimelineTimelineModule') {
+      // Thread: sibling articles, ancestors first
+      return el('div', {'data-testid': 'cellInnerDiv'}, content.items.map(
+        item => renderTweet(item.item.itemContent.tweet_results.result)));
+    }
+    return null;
+  }
+
+  function virtualize() {
+    // Unmount cells that scrolled far out of view, keeping the scroll height stable
+    while (cells.children.length > WINDOW) {
+      const first = cells.firstElementChild;
+      spacer.style.height = (spacer.offsetHeight + first.offsetHeight) + 'px';
+      first.remove();
+    }
+  }
+
+  async function loadMore() {
+    if (loading || cursor === null) return;
+    loading = true;
+    try {
+      const variables = encodeURIComponent(JSON.stringify({cursor}));
+      const response = await fetch('/i/api/graphql/mock/' + OPERATION + '?variables=' + variables);
+      const body = await response.json();
+      cursor = null;
+      const instructions = (function find(obj) {
+        if (!obj || typeof obj !== 'object') return null;
+        if (Array.isArray(obj.instructions)) return obj.instructions;
+        for (const value of Object.values(obj)) { const r = find(value); if (r) return r; }
+        return null;
+      })(body.data) || [];
+      instructions.forEach(instruction => (instruction.entries || []).forEach(entry => {
+        if (entry.content.entryType === 'TimelineTimelineCursor') {
+          cursor = entry.content.value;
+          return;
+        }
+        const cell = renderEntry(entry);
+        if (cell) cells.append(cell);
+      }));
+      virtualize();
+    } finally {
+      loading = false;
+    }
+    if (cursor !== null && document.getElementById('sentinel').getBoundingClientRect().top < window.innerHeight * 2) {
+      loadMore();
+    }
+  }
+
+  window.addEventListener('scroll', () => {
+    if (document.getElementById('sentinel').getBoundingClientRect().top < window.innerHeight * 2) loadMore();
+  }, {passive: true});
+  loadMore();
+</script>
+</body></html>
+"""
+
+
+class MockXHandler(BaseHTTPRequestHandler):
+    server_version = "MockX/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _logged_in(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        return AUTH_COOKIE in cookie
+
+    def _timeline_page(self, operation, label):
+        config = self.server.config
+        page = (TIMELINE_PAGE.replace("__OPERATION__", operation)
+                .replace("__WINDOW__", str(config.window))
+                .replace("__LABEL__", label))
+        self._send(200, page)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        if url.path in ("/login", "/i/flow/login"):
+            return self._send(200, LOGIN_PAGE)
+        if parts[:3] == ["i", "api", "graphql"] and len(parts) == 5:
+            if not self._logged_in():
+                return self._send(401, json.dumps({"errors": [{"message": "Unauthorized"}]}), "application/json")
+            variables = json.loads(parse_qs(url.query).get("variables", ["{}"])[0])
+            time.sleep(self.server.config.latency_ms / 1000)
+            handle = self.server.handle_for(self.headers.get("Referer"))
+            body = SyntheticTimeline(self.server.config, parts[4], handle).page(variables.get("cursor"))
+            return self._send(200, json.dumps(body), "application/json")
+        if not parts or parts[0] == "favicon.ico":
+            return self._send(404, "Not found", "text/plain")
+        if not self._logged_in():
+            return self._send(302, "", headers={"Location": "/login"})
+        if parts == ["home"]:
+            return self._timeline_page("HomeTimeline", "Your Home Timeline")
+        suffix = parts[1] if len(parts) == 2 else ""
+        if len(parts) <= 2 and suffix in PAGE_OPERATIONS:
+            return self._timeline_page(PAGE_OPERATIONS[suffix], f"{parts[0]}'s posts")
+        return self._send(404, "Not found", "text/plain")
+
+
+class MockXServer:
+    """Runs the mock site on a background thread; port=0 picks a free port"""
+
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.config = config or MockXConfig()
+        self.httpd = ThreadingHTTPServer((host, port), MockXHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.config = self.config
+        self.httpd.handle_for = self.handle_for
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @staticmethod
+    def handle_for(referer):
+        """The timeline owner is the first path segment of the page making the API call"""
+        parts = [p for p in urlparse(referer or "").path.split("/") if p]
+        return parts[0] if parts and parts[0] != "home" else "home"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic, offline x.com for scraper benchmarks")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--latency-ms", type=int, default=100)
+    parser.add_argument("--quote-depth", type=int, default=1)
+    parser.add_argument("--reply-depth", type=int, default=2)
+    parser.add_argument("--window", type=int, default=60)
+    args = parser.parse_args()
+
+    config = MockXConfig(total_posts=args.posts, page_size=args.page_size, latency_ms=args.latency_ms,
+                         quote_depth=args.quote_depth, reply_depth=args.reply_depth, window=args.window)
+    server = MockXServer(config, port=args.port)
+    print(f"🧪 Mock X serving at {server.base_url} (log in with any credentials)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
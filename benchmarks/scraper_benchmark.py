@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+End-to-end scraper throughput benchmark against the offline mock X server.
+
+For every (scraper, mode) pair this logs in to the mock site, scrapes the
+synthetic timeline and reports posts, posts/sec, time to first post, scroll
+rounds and peak browser memory, so pacing and extraction changes can be
+measured before they ship.
+
+Time to first post is when posts first reach Python: the first streamed batch
+or intercepted response, or the end of extraction in plain DOM mode.
+Peak memory is the summed RSS of the Chromium processes under this process.
+
+Usage:
+    python benchmarks/scraper_benchmark.py --posts 300 --latency-ms 120
+    python benchmarks/scraper_benchmark.py --scrapers likes --modes dom stream intercept --json bench.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import psutil
+
+# Add the repository root to the path so we can import the scrapers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_x_server import MockXConfig, MockXServer
+from e2b_sandbox.browser_scrapers.playwright_likes_scraper import PlaywrightLikesScraper
+from e2b_sandbox.browser_scrapers.playwright_posts_scraper import PlaywrightPostsScraper
+from e2b_sandbox.browser_scrapers.playwright_replies_scraper import PlaywrightRepliesScraper
+from e2b_sandbox.browser_scrapers.scroll_pacing import ScrollPacing
+from e2b_sandbox.browser_scrapers.session_cache import SessionCache
+
+SCRAPERS = {
+    "likes": PlaywrightLikesScraper,
+    "posts": PlaywrightPostsScraper,
+    "replies": PlaywrightRepliesScraper,
+}
+
+MODES = {
+    "dom": {},
+    "stream": {"stream": True},
+    "intercept": {"intercept": True},
+    "blocked": {"block_resources": True},
+}
+
+
+class BrowserMemorySampler:
+    """Samples the summed RSS of Chromium processes below this one and keeps the peak"""
+
+    def __init__(self, interval=0.25):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._task = None
+
+    @staticmethod
+    def browser_rss():
+        total = 0
+        for process in psutil.Process().children(recursive=True):
+            try:
+                name = process.name().lower()
+                if "chrom" in name or "headless_shell" in name:
+                    total += process.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total
+
+    async def _sample(self):
+        while True:
+            self.peak_bytes = max(self.peak_bytes, self.browser_rss())
+            await asyncio.sleep(self.interval)
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self._sample())
+        return self
+
+    async def __aexit__(self, *exc):
+        self._task.cancel()
+        self.peak_bytes = max(self.peak_bytes, self.browser_rss())
+
+
+def watch_first_post(scraper, on_first_post):
+    """Wrap the points where posts first reach Python (streamed batches, intercepted responses)"""
+    write_batch = scraper._write_stream_batch
+
+    def write_stream_batch(posts):
+        if posts:
+            on_first_post()
+        return write_batch(posts)
+    scraper._write_stream_batch = write_stream_batch
+
+    if scraper.interceptor:
+        ingest = scraper.interceptor.ingest
+
+        def ingest_and_mark(payload):
+            added = ingest(payload)
+            if added:
+                on_first_post()
+            return added
+        scraper.interceptor.ingest = ingest_and_mark
+
+
+async def run_case(scraper_name, mode, base_url, pacing):
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = SCRAPERS[scraper_name](
+            username="bench", password="bench", target_handle="ada", base_url=base_url, output_dir=tmp,
+            session_cache=SessionCache(Path(tmp) / "sessions"), headless=True, pacing=pacing, **MODES[mode]
+        )
+        row = {"scraper": scraper_name, "mode": mode}
+        async with BrowserMemorySampler() as memory:
+            try:
+                await scraper.setup_browser()
+                await scraper.ensure_logged_in()
+                started = time.perf_counter()
+                first_post = []
+                watch_first_post(scraper, lambda: first_post or first_post.append(time.perf_counter()))
+                result = await scraper.scrape()
+                elapsed = time.perf_counter() - started
+                total = result.get("total_posts") or 0
+                row.update(
+                    success=True,
+                    posts=total,
+                    seconds=round(elapsed, 2),
+                    posts_per_sec=round(total / elapsed, 1) if elapsed else None,
+                    time_to_first_post=round((first_post[0] if first_post else time.perf_counter()) - started, 2),
+                    scroll_rounds=result.get("scroll_rounds"),
+                )
+            except Exception as e:
+                row.update(success=False, error=str(e))
+            finally:
+                if scraper.browser:
+                    await scraper.browser.close()
+                if scraper.playwright:
+                    await scraper.playwright.stop()
+        row["peak_browser_mb"] = round(memory.peak_bytes / 2 ** 20, 1)
+        return row
+
+
+def print_table(rows):
+    columns = ["scraper", "mode", "posts", "seconds", "posts_per_sec", "time_to_first_post", "scroll_rounds",
+               "peak_browser_mb"]
+    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        if not row.get("success"):
+            print(f"{row['scraper']:<{widths['scraper']}}  {row['mode']:<{widths['mode']}}  ❌ {row['error']}")
+            continue
+        print("  ".join(str(row.get(c, "")).ljust(widths[c]) for c in columns))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers against the offline mock X server")
+    parser.add_argument("--scrapers", nargs="+", default=sorted(SCRAPERS), choices=sorted(SCRAPERS))
+    parser.add_argument("--modes", nargs="+", default=["dom", "intercept"], choices=sorted(MODES))
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--latency-ms", type=int, default=100)
+    parser.add_argument("--quote-depth", type=int, default=1)
+    parser.add_argument("--reply-depth", type=int, default=2)
+    parser.add_argument("--window", type=int, default=60)
+    parser.add_argument("--pacing", choices=["adaptive", "fixed"], default="adaptive")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    config = MockXConfig(total_posts=args.posts, page_size=args.page_size, latency_ms=args.latency_ms,
+                         quote_depth=args.quote_depth, reply_depth=args.reply_depth, window=args.window)
+    pacing = ScrollPacing() if args.pacing == "adaptive" else ScrollPacing.fixed()
+    rows = []
+    with MockXServer(config) as server:
+        print(f"🧪 Mock X at {server.base_url}: {args.posts} posts, {args.latency_ms} ms latency, {args.pacing} pacing")
+        for scraper_name in args.scrapers:
+            for mode in args.modes:
+                print(f"⏱️  {scraper_name}/{mode}...")
+                rows.append(await run_case(scraper_name, mode, server.base_url, pacing))
+    print()
+    print_table(rows)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": rows}, f, indent=2)
+        print(f"Results saved to: {args.json}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
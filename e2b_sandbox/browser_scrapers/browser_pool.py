@@ -0,0 +1,350 @@
+"""
+Warm browser pool that scraper runs attach to over CDP.
+
+Every CLI/cron run used to pay a Chromium cold start plus a login before the
+first scroll. The pool daemon keeps N Chromium instances running, each with a
+persistent, logged-in default context and a remote debugging port bound to
+127.0.0.1. A scraper leases an instance over a small JSON-lines protocol,
+attaches with connect_over_cdp, opens a page in the logged-in context and
+releases the instance when it is done.
+
+Protocol (one JSON object per line, on one TCP connection per lease):
+    -> {"op": "lease", "timeout": 60}
+    <- {"ok": true, "lease_id": "...", "endpoint": "http://127.0.0.1:9301", "logged_in": true}
+    -> {"op": "release", "lease_id": "...", "healthy": true}
+    <- {"ok": true}
+    -> {"op": "status"}
+    <- {"ok": true, "instances": [...]}
+
+A lease whose connection drops (the client crashed) is released automatically.
+Instances are recycled after max_leases leases, when a client reports them
+unhealthy, or when the periodic health check fails. An instance whose
+relaunch fails stays in the pool as down (status "alive": false) and is
+relaunched again by the next lease or health check.
+
+The debugging ports are unauthenticated and carry a logged-in session: only
+run the pool on a machine you trust.
+
+Usage:
+    python -m e2b_sandbox.browser_scrapers.browser_pool --size 3
+    X_BROWSER_POOL=127.0.0.1:9300 python -m e2b_sandbox.browser_scrapers.playwright_likes_scraper
+"""
+import argparse
+import asyncio
+import json
+import os
+import uuid
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+from e2b_sandbox.browser_scrapers.session_cache import SessionCache, log_in, restore_storage_state, session_is_valid
+
+POOL_ADDRESS = os.getenv("X_BROWSER_POOL")
+DEFAULT_CONTROL_PORT = 9300
+PROFILE_DIR = os.getenv("X_BROWSER_POOL_PROFILES", ".browser_pool")
+
+
+class PoolError(Exception):
+    pass
+
+
+def parse_address(address):
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+class PooledBrowser:
+    """One warm Chromium instance and its lease bookkeeping"""
+
+    def __init__(self, index, debug_port):
+        self.index = index
+        self.debug_port = debug_port
+        self.context = None
+        self.logged_in = False
+        self.leases = 0
+        self.generation = 0
+        self.lease_id = None
+
+    @property
+    def endpoint(self):
+        return f"http://127.0.0.1:{self.debug_port}"
+
+    def status(self):
+        return {
+            "index": self.index,
+            "endpoint": self.endpoint,
+            "leased": self.lease_id is not None,
+            "leases": self.leases,
+            "generation": self.generation,
+            "logged_in": self.logged_in,
+            "alive": self.context is not None,
+        }
+
+
+class BrowserPool:
+    """Daemon side: launches, logs in, leases, health-checks and recycles instances"""
+
+    def __init__(self, size=2, control_port=DEFAULT_CONTROL_PORT, host="127.0.0.1", max_leases=50,
+                 health_interval=60, username=None, password=None, headless=True, profile_dir=PROFILE_DIR,
+                 session_cache=None):
+        # Imported here: the engine imports PoolClient from this module
+        from e2b_sandbox.browser_scrapers.scraper_engine import BROWSER_SETTINGS, X_PASSWORD, X_USERNAME
+
+        self.browser_settings = BROWSER_SETTINGS
+        self.size = max(1, size)
+        self.host = host
+        self.control_port = control_port
+        self.max_leases = max_leases
+        self.health_interval = health_interval
+        self.username = username or X_USERNAME
+        self.password = password or X_PASSWORD
+        self.headless = headless
+        self.profile_dir = Path(profile_dir)
+        self.session_cache = session_cache or SessionCache()
+        self.instances = [PooledBrowser(i, control_port + 1 + i) for i in range(self.size)]
+        self.idle = asyncio.Queue()
+        self.leased = {}
+        self.playwright = None
+        self._server = None
+
+    async def _launch(self, instance):
+        user_data_dir = self.profile_dir / f"instance-{instance.index}"
+        user_data_dir.mkdir(parents=True, exist_ok=True)
+        settings = self.browser_settings
+        instance.context = await self.playwright.chromium.launch_persistent_context(
+            str(user_data_dir),
+            headless=self.headless,
+            args=[f"--remote-debugging-port={instance.debug_port}", "--remote-debugging-address=127.0.0.1"],
+            viewport=settings["viewport"],
+            user_agent=settings["user_agent"],
+            locale=settings["locale"],
+            timezone_id=settings["timezone_id"],
+            geolocation=settings["geolocation"],
+            permissions=settings["permissions"],
+        )
+        instance.generation += 1
+        instance.leases = 0
+        await self._log_in(instance)
+        print(f"🔥 Instance {instance.index} warm at {instance.endpoint} (generation {instance.generation})")
+
+    async def _log_in(self, instance):
+        context = instance.context
+        storage_state = self.session_cache.load(self.username)
+        if storage_state:
+            await restore_storage_state(context, storage_state)
+        page = context.pages[0] if context.pages else await context.new_page()
+        try:
+            # The persistent profile may already be logged in even without a cached session
+            if await session_is_valid(page):
+                print(f"🔑 Instance {instance.index} is logged in")
+            else:
+                await log_in(page, self.username, self.password)
+                await self.session_cache.save(context, self.username)
+            instance.logged_in = True
+        except Exception as e:
+            print(f"⚠️  Instance {instance.index} could not log in: {e}")
+            instance.logged_in = False
+        await page.goto("about:blank")
+
+    async def _close(self, instance):
+        if instance.context is not None:
+            try:
+                await instance.context.close()
+            except Exception as e:
+                print(f"⚠️  Closing instance {instance.index} failed: {e}")
+            instance.context = None
+
+    async def _recycle(self, instance, reason):
+        print(f"♻️  Recycling instance {instance.index}: {reason}")
+        await self._close(instance)
+        await self._launch(instance)
+
+    async def _relaunch(self, instance, reason):
+        """Recycle, or leave the instance closed (down) for the next lease or health check to retry"""
+        try:
+            await self._recycle(instance, reason)
+            return True
+        except Exception as e:
+            print(f"❌ Relaunching instance {instance.index} failed: {e}")
+            await self._close(instance)
+            instance.logged_in = False
+            return False
+
+    async def _reset_pages(self, instance):
+        """Leave a single blank page behind a lease"""
+        pages = instance.context.pages
+        for page in pages[1:]:
+            await page.close()
+        if pages:
+            await pages[0].goto("about:blank")
+
+    async def _is_healthy(self, instance):
+        try:
+            page = await instance.context.new_page()
+            try:
+                return await page.evaluate("1 + 1") == 2
+            finally:
+                await page.close()
+        except Exception:
+            return False
+
+    async def lease(self, timeout=60):
+        try:
+            instance = await asyncio.wait_for(self.idle.get(), timeout)
+        except asyncio.TimeoutError:
+            raise PoolError(f"No browser free within {timeout}s")
+        if instance.context is None and not await self._relaunch(instance, "down when leased"):
+            self.idle.put_nowait(instance)
+            raise PoolError(f"Browser instance {instance.index} is down and could not be relaunched")
+        instance.lease_id = uuid.uuid4().hex
+        instance.leases += 1
+        self.leased[instance.lease_id] = instance
+        return {"lease_id": instance.lease_id, "endpoint": instance.endpoint, "logged_in": instance.logged_in}
+
+    async def release(self, lease_id, healthy=True):
+        instance = self.leased.pop(lease_id, None)
+        if instance is None:
+            raise PoolError(f"Unknown lease {lease_id}")
+        instance.lease_id = None
+        try:
+            if not healthy:
+                await self._relaunch(instance, "reported unhealthy by its client")
+            elif instance.leases >= self.max_leases:
+                await self._relaunch(instance, f"served {instance.leases} leases")
+            else:
+                try:
+                    await self._reset_pages(instance)
+                except Exception as e:
+                    print(f"⚠️  Release of instance {instance.index} failed ({e}), relaunching")
+                    await self._relaunch(instance, "release failed")
+        finally:
+            # Even a down instance goes back: the pool never shrinks
+            self.idle.put_nowait(instance)
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_interval)
+            # Only idle instances: a leased one belongs to its client
+            for _ in range(self.idle.qsize()):
+                instance = self.idle.get_nowait()
+                if not await self._is_healthy(instance):
+                    await self._relaunch(instance, "failed health check")
+                self.idle.put_nowait(instance)
+
+    async def _handle_client(self, reader, writer):
+        held = set()
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    op = request.get("op")
+                    if op == "lease":
+                        response = await self.lease(request.get("timeout", 60))
+                        held.add(response["lease_id"])
+                    elif op == "release":
+                        held.discard(request.get("lease_id"))
+                        await self.release(request.get("lease_id"), request.get("healthy", True))
+                        response = {}
+                    elif op == "status":
+                        response = {"instances": [instance.status() for instance in self.instances]}
+                    else:
+                        raise PoolError(f"Unknown op {op!r}")
+                    response = {"ok": True, **response}
+                except (PoolError, ValueError) as e:
+                    response = {"ok": False, "error": str(e)}
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for lease_id in held:
+                print(f"⚠️  Client went away holding lease {lease_id}, releasing it")
+                await self.release(lease_id, healthy=True)
+            writer.close()
+
+    async def serve(self):
+        self.playwright = await async_playwright().start()
+        health_task = None
+        try:
+            for instance in self.instances:
+                await self._launch(instance)
+                self.idle.put_nowait(instance)
+            self._server = await asyncio.start_server(self._handle_client, self.host, self.control_port)
+            health_task = asyncio.create_task(self._health_loop())
+            print(f"🏊 Browser pool of {self.size} listening on {self.host}:{self.control_port}")
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            if health_task:
+                health_task.cancel()
+            for instance in self.instances:
+                await self._close(instance)
+            await self.playwright.stop()
+
+
+class PoolClient:
+    """Scraper side: one connection per lease, so a crashed run frees its browser"""
+
+    def __init__(self, address=None):
+        address = address or POOL_ADDRESS
+        if not address:
+            raise PoolError("No browser pool address (set X_BROWSER_POOL)")
+        self.host, self.port = parse_address(address)
+        self._reader = None
+        self._writer = None
+        self.lease_id = None
+
+    async def _send(self, message):
+        self._writer.write((json.dumps(message) + "\n").encode())
+        await self._writer.drain()
+        line = await self._reader.readline()
+        if not line:
+            raise PoolError("Browser pool closed the connection")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise PoolError(response.get("error", "Browser pool request failed"))
+        return response
+
+    async def lease(self, timeout=60):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            response = await self._send({"op": "lease", "timeout": timeout})
+        except Exception:
+            await self.close()
+            raise
+        self.lease_id = response["lease_id"]
+        return response
+
+    async def release(self, healthy=True):
+        if self.lease_id is None:
+            return
+        try:
+            await self._send({"op": "release", "lease_id": self.lease_id, "healthy": healthy})
+        finally:
+            self.lease_id = None
+            await self.close()
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Keep warm, logged-in Chromium instances for scraper runs")
+    parser.add_argument("--size", type=int, default=2)
+    parser.add_argument("--port", type=int, default=DEFAULT_CONTROL_PORT,
+                        help="Control port; instances use the following ports for CDP")
+    parser.add_argument("--max-leases", type=int, default=50)
+    parser.add_argument("--health-interval", type=float, default=60)
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+
+    pool = BrowserPool(size=args.size, control_port=args.port, max_leases=args.max_leases,
+                       health_interval=args.health_interval, headless=not args.headed)
+    await pool.serve()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
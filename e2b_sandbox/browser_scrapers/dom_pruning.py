@@ -0,0 +1,43 @@
+"""
+Virtualization-aware article selection for the extraction scripts.
+
+X renders the timeline as a virtualized list of cellInnerDiv nodes, but the
+scroll loops used to run querySelectorAll('article') and re-extract every
+article still mounted on every pass, so late passes paid for the whole
+visible window (and, on posts/replies, for the recursive reply_chain/quote
+extraction) before deduping by ID. PRUNING_JS marks processed articles and
+their cells with data-pf-done so each pass only extracts what is new.
+
+An article is only marked once it yielded an identity (ID or permalink): a
+cell that is still rendering is picked up again on the next pass.
+"""
+
+PRUNING_JS = """
+  // DOM pruning: only extract articles that appeared since the last pass
+  const PROCESSED_ATTR = 'data-pf-done';
+  const CELL_SELECTOR = '[data-testid="cellInnerDiv"]';
+  let articlesProcessed = 0;
+  // Marks left by an earlier attempt on the same page (retries without a reload) belong to that run
+  document.querySelectorAll(`[${PROCESSED_ATTR}]`).forEach(node => node.removeAttribute(PROCESSED_ATTR));
+
+  function pendingArticles() {
+    if (!document.querySelector(CELL_SELECTOR)) {
+      // Not a virtualized list (or the markup changed): fall back to bare articles
+      return Array.from(document.querySelectorAll(`article:not([${PROCESSED_ATTR}])`));
+    }
+    const articles = [];
+    document.querySelectorAll(`${CELL_SELECTOR}:not([${PROCESSED_ATTR}])`).forEach(cell => {
+      cell.querySelectorAll(`article:not([${PROCESSED_ATTR}])`).forEach(article => articles.push(article));
+    });
+    return articles;
+  }
+
+  function markProcessed(article) {
+    article.setAttribute(PROCESSED_ATTR, '');
+    articlesProcessed++;
+    const cell = article.closest(CELL_SELECTOR);
+    if (cell && !cell.querySelector(`article:not([${PROCESSED_ATTR}])`)) {
+      cell.setAttribute(PROCESSED_ATTR, '');
+    }
+  }
+"""
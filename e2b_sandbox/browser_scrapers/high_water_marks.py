@@ -0,0 +1,120 @@
+"""
+Incremental scraping state.
+
+For every (handle, pageType) we persist the newest tweet ID seen so far and the
+IDs at the head of the feed from the last run. The in-page scroll loops get the
+head IDs as options.knownIds and stop as soon as a non-pinned known post shows
+up, so a daily refresh only scrolls through what is new. The delta is appended
+to extracted_data/{handle}_{pageType}.jsonl instead of rewriting the whole
+per-day JSON file.
+"""
+import json
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Expects `options` in scope. Defines `reachedKnownPost()`, true once a
+# non-pinned post from options.knownIds is rendered on the page.
+INCREMENTAL_JS = """
+  const knownSelector = (options.knownIds || [])
+    .map(id => `a[href$="/status/${id}"]`).join(', ');
+
+  function reachedKnownPost() {
+    if (!knownSelector) return false;
+    for (const link of document.querySelectorAll(knownSelector)) {
+      if (!link.querySelector('time')) continue;
+      const article = link.closest('article');
+      const context = article && article.querySelector('[data-testid="socialContext"]');
+      if (!(context && /pinned/i.test(context.textContent))) return true;
+    }
+    return false;
+  }
+"""
+
+STATUS_ID_RE = re.compile(r"status/(\d+)")
+
+
+def post_id(post):
+    """Tweet ID of a post, falling back to its permalink (likes output has no id field)"""
+    if post.get("id"):
+        return str(post["id"])
+    match = STATUS_ID_RE.search(post.get("permalink") or "")
+    return match.group(1) if match else None
+
+
+class HighWaterMarkStore:
+    """Persisted newest-seen tweet IDs per (handle, pageType) plus the append-only delta files"""
+
+    def __init__(self, output_dir="extracted_data", recent_limit=50):
+        self.output_dir = Path(output_dir)
+        self.state_path = self.output_dir / "high_water_marks.json"
+        self.recent_limit = recent_limit
+
+    def _load(self):
+        if not self.state_path.exists():
+            return {}
+        with open(self.state_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save(self, state):
+        self.output_dir.mkdir(exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    @staticmethod
+    def _key(handle, page_type):
+        return f"{handle.lower()}/{page_type}"
+
+    def get(self, handle, page_type):
+        return self._load().get(self._key(handle, page_type))
+
+    def known_ids(self, handle, page_type):
+        """IDs at the head of the feed from the previous run, newest first"""
+        mark = self.get(handle, page_type)
+        return list(mark["recent_ids"]) if mark else []
+
+    def delta_path(self, handle, page_type):
+        return self.output_dir / f"{handle.lower()}_{page_type}.jsonl"
+
+    def new_posts(self, handle, page_type, posts):
+        """Posts in feed order up to the first non-pinned post a previous run already saved"""
+        known = set(self.known_ids(handle, page_type))
+        delta = []
+        for post in posts:
+            pid = post_id(post)
+            # Tweets referenced by a new post (normalized output) can be old without ending the delta
+            if pid in known and not post.get("embedded"):
+                if post.get("pinned"):
+                    continue
+                break
+            delta.append(post)
+        return delta
+
+    def append_delta(self, handle, page_type, posts):
+        """Append the unseen posts to the durable store and advance the high-water mark"""
+        delta = self.new_posts(handle, page_type, posts)
+        state = self._load()
+        key = self._key(handle, page_type)
+        mark = state.get(key) or {"newest_id": None, "recent_ids": []}
+        self.output_dir.mkdir(exist_ok=True)
+        filepath = self.delta_path(handle, page_type)
+        if delta:
+            with open(filepath, "a", encoding="utf-8") as f:
+                for post in delta:
+                    f.write(json.dumps(post, ensure_ascii=False) + "\n")
+        delta_ids = [pid for pid in (post_id(p) for p in delta if not p.get("embedded")) if pid]
+        # A pinned post can be arbitrarily old, so it never moves the high-water mark
+        ids = [int(pid) for pid in (post_id(p) for p in delta if not p.get("pinned") and not p.get("embedded")) if pid]
+        if mark["newest_id"]:
+            ids.append(int(mark["newest_id"]))
+        state[key] = {
+            "newest_id": str(max(ids)) if ids else None,
+            "recent_ids": (delta_ids + [i for i in mark["recent_ids"] if i not in delta_ids])[:self.recent_limit],
+            "updated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        }
+        self._save(state)
+        print(f"Appended {len(delta)} new posts to: {filepath}")
+        return filepath, len(delta)
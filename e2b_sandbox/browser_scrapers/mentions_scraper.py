@@ -1,3 +1,31 @@
-from e2b_sandbox.browser_scrapers.base_browser_config import browser_settings
+"""
+Mentions page type for the shared scraping engine.
 
-# TODO: Implement mentions scraping logic using browser-use and browser_settings 
\ No newline at end of file
+Scrapes the logged-in account's mentions tab with the posts extraction script.
+Mentions are served by a REST endpoint rather than a GraphQL timeline, so
+interception mode falls back to DOM extraction.
+"""
+import asyncio
+
+from e2b_sandbox.browser_scrapers.playwright_posts_scraper import EXTRACTION_SCRIPT
+from e2b_sandbox.browser_scrapers.scraper_engine import PageStrategy, PlaywrightScraper, run_scraper
+
+
+class MentionsStrategy(PageStrategy):
+    page_type = "mentions"
+    extraction_script = EXTRACTION_SCRIPT
+
+    def build_url(self, handle, base_url="https://x.com"):
+        return f"{base_url}/notifications/mentions"
+
+
+class PlaywrightMentionsScraper(PlaywrightScraper):
+    """Scrapes posts mentioning the logged-in account"""
+    strategy = MentionsStrategy()
+
+
+async def main():
+    await run_scraper(PlaywrightMentionsScraper())
+
+if __name__ == "__main__":
+    asyncio.run(main())
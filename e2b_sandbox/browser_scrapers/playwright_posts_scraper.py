@@ -17,35 +17,36 @@ SCHEMA DOCUMENTATION
 | perplexity_context | object/null    | Embedded @AskPerplexity context (if exists) |
 | poll               | object/null    | Poll details, if present                    |
 | status             | string/null    | "unavailable" if deleted/protected         |
-"""
-import asyncio
-import json
-import os
-from datetime import datetime
-from pathlib import Path
-from dotenv import load_dotenv
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
-from glob import glob
+| pinned             | boolean/null   | true for the profile's pinned post          |
+| likes              | integer        | Like count (interception mode only)         |
+| retweets           | integer        | Repost count (interception mode only)       |
+| replies            | integer        | Reply count (interception mode only)        |
+| quotes             | integer        | Quote count (interception mode only)        |
+| views              | integer        | View count (interception mode only)         |
 
-load_dotenv()
+Pass pipeline=PostPipeline(normalized=True) to get every tweet once, with
+retweet/reply_chain/perplexity_context replaced by quoted_id/parent_id/
+context_id references (see post_normalization.py).
 
-X_USERNAME = os.getenv("X_USERNAME")
-X_PASSWORD = os.getenv("X_PASSWORD")
-TARGET_HANDLE = os.getenv("TARGET_HANDLE", X_USERNAME)
+Pass intercept=True to read posts from the timeline API responses instead of
+walking the DOM (see timeline_interceptor.py).
 
-BROWSER_SETTINGS = {
-    "headless": False,
-    "viewport": {"width": 1280, "height": 720},
-    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/122.0.0.0 Safari/537.36",
-    "locale": "en-US",
-    "timezone_id": "America/New_York",
-    "geolocation": {"latitude": 40.7128, "longitude": -74.0060},
-    "permissions": ["geolocation"],
-}
+EXTRACTION_SCRIPT is shared by every page type that renders a tweet timeline
+(posts, replies, home timeline, mentions); options.pageType names the output.
+"""
+import asyncio
+
+from e2b_sandbox.browser_scrapers.dom_pruning import PRUNING_JS
+from e2b_sandbox.browser_scrapers.high_water_marks import INCREMENTAL_JS
+from e2b_sandbox.browser_scrapers.post_normalization import NORMALIZE_JS
+from e2b_sandbox.browser_scrapers.scraper_engine import PageStrategy, PlaywrightScraper, run_scraper
+from e2b_sandbox.browser_scrapers.scroll_pacing import PACING_JS
+from e2b_sandbox.browser_scrapers.stream_sink import STREAM_JS
 
 EXTRACTION_SCRIPT = """
-async () => {
+async (options = {}) => {
   const sleep = ms => new Promise(res => setTimeout(res, ms));
+""" + PACING_JS + INCREMENTAL_JS + STREAM_JS + NORMALIZE_JS + PRUNING_JS + """
 
   function omitNulls(obj) {
     if (Array.isArray(obj)) {
@@ -63,8 +64,8 @@ async () => {
     }
   }
 
-  async function expandAllShowMore() {
-    let buttons = Array.from(document.querySelectorAll('article button')).filter(
+  async function expandAllShowMore(articles) {
+    let buttons = articles.flatMap(article => Array.from(article.querySelectorAll('button'))).filter(
       btn => /show more|show thread/i.test(btn.textContent)
     );
     for (const btn of buttons) {
@@ -117,8 +118,13 @@ async () => {
     return {username: null, author: null};
   }
 
+  // Ancestors and quotes are shared by many articles of a thread; extract each node once.
+  // Keyed by the DOM node, so entries go away when the virtualized list unmounts it.
+  const nestedCache = new WeakMap();
+
   async function extractTweetFromArticle(article, warnings, recursionDepth = 0, seen = new Set(), fallbackUsername = null, fallbackAuthor = null) {
     if (!article) return null;
+    if (recursionDepth > 0 && nestedCache.has(article)) return nestedCache.get(article);
     await expandShowMoreInArticle(article);
     // Extract id and permalink early for cycle detection
     const timeElem = article.querySelector('time');
@@ -233,6 +239,8 @@ async () => {
     }
     let status = null;
     if (!id) status = 'unavailable';
+    const socialContext = recursionDepth === 0 ? article.querySelector('[data-testid="socialContext"]') : null;
+    const pinned = socialContext && /pinned/i.test(socialContext.textContent) ? true : null;
     let result = {
       id,
       parent_id,
@@ -247,9 +255,12 @@ async () => {
       replying_to,
       perplexity_context,
       poll,
-      status
+      status,
+      pinned
     };
-    return omitNulls(result);
+    result = omitNulls(result);
+    if (recursionDepth > 0 && id) nestedCache.set(article, result);
+    return result;
   }
 
   // Extract composer text if present
@@ -261,380 +272,60 @@ async () => {
     return null;
   }
 
-  let lastHeight = 0, sameCount = 0, maxNoChange = 15;
-  let allPosts = new Map();
   let warnings = [];
-  while (sameCount < maxNoChange) {
-    await expandAllShowMore();
-    const articles = document.querySelectorAll('article');
+  let reachedKnown = false;
+  let firstPost = null;
+  while (!reachedKnown && pacing.idleRounds < pacing.maxIdleRounds) {
+    const articles = pendingArticles();
+    await expandAllShowMore(articles);
     for (const article of articles) {
       const postObj = await extractTweetFromArticle(article, warnings, 0, new Set());
-      if (postObj && postObj.id && !allPosts.has(postObj.id)) {
-        allPosts.set(postObj.id, postObj);
-      } else if (postObj && postObj.permalink && !allPosts.has(postObj.permalink)) {
-        allPosts.set(postObj.permalink, postObj);
+      if (!postObj || !(postObj.id || postObj.permalink)) continue;
+      markProcessed(article);
+      if (collectTweet(postObj)) {
+        firstPost = firstPost || postObj;
       }
     }
-    window.scrollTo(0, document.body.scrollHeight);
-    await sleep(3500);
-    let newHeight = document.body.scrollHeight;
-    if (newHeight === lastHeight) {
-      sameCount++;
-    } else {
-      sameCount = 0;
-      lastHeight = newHeight;
+    await flushBatch();
+    if (reachedKnownPost()) {
+      reachedKnown = true;
+      break;
     }
+    await scrollAndWait();
   }
-  const postsArr = Array.from(allPosts.values()).map(omitNulls);
-  let username = postsArr.length > 0 ? postsArr[0].username : null;
-  let pageType = 'posts';
+  await flushBatch();
+  let username = firstPost ? firstPost.username : null;
+  let pageType = options.pageType || 'posts';
   let dateStr = null;
-  if (postsArr.length > 0 && postsArr[0].date) {
-    dateStr = postsArr[0].date.split('T')[0];
+  if (firstPost && firstPost.date) {
+    dateStr = firstPost.date.split('T')[0];
   }
   // Extract composer text if present
   const composer_text = extractComposerText();
-  return { posts: postsArr, totalPosts: postsArr.length, username, pageType, dateStr, composer_text };
+  return { posts: keptPosts, totalPosts: seenIds.size, streamedPosts, articlesProcessed, username, pageType, dateStr, composer_text, scrollRounds: pacing.scrollRounds, scrollRoundMs: pacing.roundMs, reachedKnown };
 }
 """
 
-class PlaywrightPostsScraper:
-    def __init__(self, username=None, password=None, target_handle=None):
-        self.username = username or X_USERNAME
-        self.password = password or X_PASSWORD
-        self.target_handle = target_handle or TARGET_HANDLE
-        self.browser = None
-        self.page = None
-    
-    async def setup_browser(self):
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(
-            headless=BROWSER_SETTINGS["headless"]
-        )
-        context = await self.browser.new_context(
-            viewport=BROWSER_SETTINGS["viewport"],
-            user_agent=BROWSER_SETTINGS["user_agent"],
-            locale=BROWSER_SETTINGS["locale"],
-            timezone_id=BROWSER_SETTINGS["timezone_id"],
-            geolocation=BROWSER_SETTINGS["geolocation"],
-            permissions=BROWSER_SETTINGS["permissions"]
-        )
-        self.page = await context.new_page()
-    
-    async def login(self):
-        print(f"Logging in as {self.username}...")
-        await self.page.goto("https://x.com/login")
-        await self.page.wait_for_load_state("networkidle")
-        try:
-            username_input = await self.page.wait_for_selector(
-                'input[autocomplete="username"], input[placeholder*="username"], input[placeholder*="email"], input[placeholder*="phone"]',
-                timeout=10000
-            )
-            await username_input.fill(self.username)
-            next_button = await self.page.wait_for_selector(
-                'div[role="button"]:has-text("Next"), div[role="button"]:has-text("Continue"), button:has-text("Next"), button:has-text("Continue")',
-                timeout=5000
-            )
-            await next_button.click()
-            await self.page.wait_for_timeout(2000)
-        except Exception as e:
-            print(f"Username step failed: {e}")
-            try:
-                username_input = await self.page.wait_for_selector('input[autocomplete="username"]', timeout=5000)
-                await username_input.fill(self.username)
-            except:
-                pass
-        try:
-            password_input = await self.page.wait_for_selector(
-                'input[type="password"], input[autocomplete="current-password"]',
-                timeout=10000
-            )
-            await password_input.fill(self.password)
-            login_button = await self.page.wait_for_selector(
-                'div[role="button"]:has-text("Log in"), button:has-text("Log in"), div[data-testid="LoginButton"]',
-                timeout=5000
-            )
-            await login_button.click()
-        except Exception as e:
-            print(f"Password step failed: {e}")
-            raise
-        try:
-            await self.page.wait_for_selector(
-                '[data-testid="SideNav_AccountSwitcher_Button"], [data-testid="AppTabBar_Home_Link"], nav',
-                timeout=15000
-            )
-            print("Login successful!")
-        except Exception as e:
-            print(f"Login verification failed: {e}")
-            if await self.page.locator('text=Two-factor authentication').count() > 0:
-                print("2FA required - please handle manually")
-                await self.page.pause()
-            else:
-                raise Exception("Login failed - could not verify successful login")
-    
+
+class PostsStrategy(PageStrategy):
+    page_type = "posts"
+    extraction_script = EXTRACTION_SCRIPT
+    timeline_operations = ("UserTweets",)
+
+    def build_url(self, handle, base_url="https://x.com"):
+        return f"{base_url}/{handle}"
+
+
+class PlaywrightPostsScraper(PlaywrightScraper):
+    """Scrapes a user's own posts"""
+    strategy = PostsStrategy()
+
     async def navigate_to_posts(self):
-        print(f"🧭 Navigating to {self.target_handle}'s posts page...")
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                print(f"📍 Step 1: Going to profile posts page (attempt {attempt+1})...")
-                await self.page.goto(f"https://x.com/{self.target_handle}")
-                await self.page.wait_for_load_state("networkidle")
-                print(f"✅ Posts page loaded: {self.page.url}")
-                await self.page.wait_for_timeout(3000)
-                # Wait for a robust posts-specific selector
-                print("🔍 Waiting for posts content to load...")
-                await self.page.wait_for_selector('article', timeout=20000)
-                print("✅ At least one post article found.")
-                return
-            except PlaywrightTimeoutError:
-                print(f"⚠️  Timeout waiting for posts content (attempt {attempt+1})")
-                if attempt < max_retries - 1:
-                    print("🔄 Retrying navigation...")
-                    await self.page.reload()
-                    await self.page.wait_for_timeout(3000)
-                else:
-                    print("❌ Navigation failed after retries. Proceeding anyway.")
-                    return
-            except Exception as e:
-                print(f"❌ Navigation error: {e}")
-                if attempt < max_retries - 1:
-                    print("🔄 Retrying navigation...")
-                    await self.page.reload()
-                    await self.page.wait_for_timeout(3000)
-                else:
-                    print("❌ Navigation failed after retries. Proceeding anyway.")
-                    return
+        await self.navigate()
 
-    async def execute_extraction_script(self):
-        print("🚀 Starting extraction script execution...")
-        print(f"📍 Current URL: {self.page.url}")
-        max_retries = 5
-        for attempt in range(max_retries):
-            try:
-                print(f"📝 Extraction attempt {attempt + 1}/{max_retries}")
-                print("=" * 50)
-                print("⚡ Step 3: Injecting and executing extraction script...")
-                result = await self._execute_script_with_multiple_methods()
-                print("✅ Step 3 complete")
-                if result and result.get('posts'):
-                    print(f"✅ Extraction completed successfully!")
-                    print(f"📊 Found {result['totalPosts']} posts")
-                    print(f"👤 Username: {result.get('username')}")
-                    return result
-                else:
-                    print("⚠️  Script executed but returned no data")
-                    raise Exception("Script executed but returned no data")
-            except Exception as e:
-                if 'Execution context was destroyed' in str(e):
-                    print(f"⚠️  Execution context destroyed (likely due to navigation/reload). Retrying after short wait...")
-                    await self.page.wait_for_timeout(5000)
-                    continue
-                print(f"❌ Extraction attempt {attempt + 1} failed: {e}")
-                print(f"📍 Failed at URL: {self.page.url}")
-                if attempt < max_retries - 1:
-                    print("🔄 Retrying extraction...")
-                    await self._handle_extraction_error()
-                    await self.page.wait_for_timeout(5000)
-                else:
-                    print("💥 All extraction attempts failed")
-                    raise Exception(f"Extraction failed after {max_retries} attempts: {e}")
-    
-    async def _handle_extraction_error(self):
-        print("🔧 Attempting to recover from extraction error...")
-        try:
-            print("🔄 Refreshing page...")
-            await self.page.reload()
-            await self.page.wait_for_load_state("networkidle")
-            await self.page.wait_for_timeout(3000)
-            if await self.page.locator('text=Log in').count() > 0:
-                print("⚠️  Lost login session, attempting to re-login...")
-                await self.login()
-                await self.navigate_to_posts()
-        except Exception as e:
-            print(f"⚠️  Recovery attempt failed: {e}")
-    
-    async def _execute_script_with_multiple_methods(self):
-        methods = [
-            self._execute_via_evaluate,
-            self._execute_via_script_tag,
-            self._execute_via_devtools
-        ]
-        for i, method in enumerate(methods, 1):
-            try:
-                print(f"🔧 Trying injection method {i}/{len(methods)}: {method.__name__}")
-                print(f"⏱️  Starting method: {method.__name__}")
-                result = await method()
-                if result and result.get('posts'):
-                    print(f"✅ Method {method.__name__} succeeded!")
-                    return result
-                else:
-                    print(f"⚠️  Method {method.__name__} returned no data")
-            except Exception as e:
-                if 'Execution context was destroyed' in str(e):
-                    print(f"⚠️  Execution context destroyed during {method.__name__}. Retrying...")
-                    await self.page.wait_for_timeout(3000)
-                    continue
-                print(f"❌ Method {method.__name__} failed: {e}")
-                continue
-        raise Exception("All script injection methods failed")
-    
-    async def _execute_via_evaluate(self):
-        print("⚡ Executing script directly...")
-        current_url = self.page.url
-        if "compose" in current_url.lower():
-            print("⚠️  Page navigated to compose, trying to go back...")
-            await self.page.go_back()
-            await self.page.wait_for_load_state("networkidle")
-            await self.page.wait_for_timeout(3000)
-        return await self.page.evaluate(EXTRACTION_SCRIPT)
-    
-    async def _execute_via_devtools(self):
-        print("🔧 Using CDP for script execution...")
-        try:
-            cdp = await self.page.context.new_cdp_session(self.page)
-            result = await cdp.send("Runtime.evaluate", {
-                "expression": EXTRACTION_SCRIPT,
-                "returnByValue": True,
-                "awaitPromise": True
-            })
-            if result.get("result", {}).get("value"):
-                return result["result"]["value"]
-            else:
-                raise Exception("CDP execution returned no value")
-        except Exception as e:
-            print(f"CDP method failed: {e}")
-            raise
-    
-    async def _execute_via_script_tag(self):
-        print("📜 Injecting script tag...")
-        # Only inject a valid function body, not an illegal return statement
-        script_body = EXTRACTION_SCRIPT.strip()
-        if script_body.startswith('async () => {'):
-            script_body = script_body[len('async () => {'):-1].strip()
-        await self.page.evaluate(f'(async () => {{ {script_body} }})')
-        await self.page.wait_for_timeout(5000)
-        # Try to get result
-        result = await self.page.evaluate("window.lastExtractionResult || null")
-        if result:
-            return result
-        return await self._extract_from_page()
-    
-    async def _extract_from_page(self):
-        print("🔄 Fallback: extracting data directly from page...")
-        posts = await self.page.evaluate("""
-            const articles = document.querySelectorAll('article');
-            const posts = [];
-            articles.forEach(article => {
-                const textElem = article.querySelector('div[data-testid=\"tweetText\"]');
-                const timeElem = article.querySelector('time');
-                const userLinks = article.querySelectorAll('a[href^=\"/\"][role=\"link\"]');
-                let username = null, author = null;
-                for (const link of userLinks) {
-                    const match = link.getAttribute('href').match(/^\/(.+)$/);
-                    if (match) {
-                        username = match[1];
-                        const displaySpan = link.querySelector('span');
-                        if (displaySpan) {
-                            author = displaySpan.textContent;
-                        }
-                        break;
-                    }
-                }
-                posts.push({
-                    author: author,
-                    username: username,
-                    text: textElem ? textElem.innerText : '',
-                    date: timeElem ? timeElem.getAttribute('datetime') : null
-                });
-            });
-            return {
-                username: window.location.pathname.split('/')[1] || 'unknown',
-                pageType: 'posts',
-                dateStr: new Date().toISOString().split('T')[0],
-                posts: posts,
-                totalPosts: posts.length
-            };
-        """)
-        return posts
-    
-    async def save_results(self, results):
-        if not results or not results.get('posts'):
-            print("No results to save")
-            return None
-        output_dir = Path("extracted_data")
-        output_dir.mkdir(exist_ok=True)
-        filename = f"{results['username']}_{results['pageType']}_{results['dateStr']}.json"
-        filepath = output_dir / filename
-        # Remove previous file for same user/pageType/date
-        username = results.get('username')
-        if not username and results.get('posts'):
-            username = results['posts'][0].get('username', 'unknown')
-        pageType = results.get('pageType', 'posts')
-        dateStr = results.get('dateStr')
-        if not dateStr and results.get('posts'):
-            first_date = results['posts'][0].get('date')
-            if first_date:
-                dateStr = first_date.split('T')[0]
-        pattern = f"{username}_{pageType}_{dateStr}.json"
-        for oldfile in glob(str(output_dir / pattern)):
-            try:
-                os.remove(oldfile)
-            except Exception as e:
-                print(f"Could not remove old file {oldfile}: {e}")
-        # Add root-level metadata
-        scrape_metadata = {
-            "scrape_timestamp": datetime.utcnow().isoformat() + 'Z',
-            "code_version": "1.0.0",  # Update as needed
-            "user": username,
-            "pageType": pageType,
-            "dateStr": dateStr,
-            "warnings": results.get('warnings', []),
-            "totalPosts": results.get('totalPosts', len(results.get('posts', [])))
-        }
-        # Save results directly, nulls already omitted in JS
-        output = { **scrape_metadata, "posts": results['posts'] }
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
-        print(f"Results saved to: {filepath}")
-        return filepath
-    
-    async def run(self):
-        try:
-            await self.setup_browser()
-            await self.login()
-            await self.navigate_to_posts()
-            results = await self.execute_extraction_script()
-            filepath = await self.save_results(results)
-            return {
-                "success": True,
-                "filepath": filepath,
-                "total_posts": results.get('totalPosts', len(results.get('posts', []))),
-                "username": results.get('username'),
-                "pageType": results.get('pageType'),
-                "dateStr": results.get('dateStr')
-            }
-        except Exception as e:
-            print(f"Scraping failed: {e}")
-            return {
-                "success": False,
-                "error": str(e)
-            }
-        finally:
-            if self.browser:
-                await self.browser.close()
-            if hasattr(self, 'playwright'):
-                await self.playwright.stop()
 
 async def main():
-    scraper = PlaywrightPostsScraper()
-    result = await scraper.run()
-    if result["success"]:
-        print(f"✅ Scraping completed successfully!")
-        print(f"📁 Results saved to: {result['filepath']}")
-        print(f"📊 Total posts extracted: {result['total_posts']}")
-    else:
-        print(f"❌ Scraping failed: {result['error']}")
+    await run_scraper(PlaywrightPostsScraper())
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    asyncio.run(main())
@@ -0,0 +1,160 @@
+"""
+Normalized post output: every tweet once, relationships by ID.
+
+The posts/replies extractor embeds full copies of related tweets in each
+post: the quoted tweet in `retweet`, every ancestor in `reply_chain` (each
+with its own reply_chain) and the @AskPerplexity reply in
+`perplexity_context`. On a busy thread the same parent is serialized under
+every reply. With PostPipeline(normalized=True) the output is flat instead:
+
+| Field      | Type        | Description                                      |
+|------------|-------------|--------------------------------------------------|
+| parent_id  | string/null | Parent tweet's ID (also set on ancestors)        |
+| quoted_id  | string/null | ID of the quoted tweet (was `retweet`)           |
+| context_id | string/null | ID of the @AskPerplexity reply (was `perplexity_context`) |
+| embedded   | boolean     | true if the tweet was only seen inside another one |
+
+Referenced tweets are emitted as records of their own, once per run.
+rebuild_nested() turns records back into the nested schema when a consumer
+needs it.
+
+NORMALIZE_JS is spliced into the posts extraction script (after STREAM_JS)
+and provides collectTweet(); normalize_posts() does the same flattening for
+intercepted posts.
+"""
+from e2b_sandbox.browser_scrapers.high_water_marks import post_id
+
+NESTED_FIELDS = ("retweet", "reply_chain", "perplexity_context")
+
+# Expects `options` in scope.
+NORMALIZE_JS = """
+  // Normalized mode: emit each tweet once, nesting becomes parent_id/quoted_id/context_id
+  const normalized = Boolean(options.normalized);
+  // Keys collected only as embedded copies so far
+  const embeddedOnly = new Set();
+
+  // Returns [tweet, ...referenced tweets], all flat
+  function flattenTweet(tweet) {
+    const {retweet, reply_chain, perplexity_context, ...flat} = tweet;
+    const records = [flat];
+    let previousId = null;
+    for (const ancestor of reply_chain || []) {
+      const ancestorRecords = flattenTweet(ancestor);
+      if (!ancestorRecords[0].parent_id && previousId) ancestorRecords[0].parent_id = previousId;
+      previousId = ancestorRecords[0].id || previousId;
+      records.push(...ancestorRecords);
+    }
+    if (retweet) {
+      const quoted = flattenTweet(retweet);
+      if (quoted[0].id) flat.quoted_id = quoted[0].id;
+      records.push(...quoted);
+    }
+    if (perplexity_context) {
+      const context = flattenTweet(perplexity_context);
+      if (context[0].id) flat.context_id = context[0].id;
+      records.push(...context);
+    }
+    return records;
+  }
+
+  // Collects a post, plus its referenced tweets in normalized mode; true if the post itself was new.
+  // As in normalize_posts(), a tweet seen on its own replaces an earlier embedded copy.
+  function collectTweet(post) {
+    if (!normalized) return collectPost(post.id || post.permalink, post);
+    const [flat, ...referenced] = flattenTweet(post);
+    const key = flat.id || flat.permalink;
+    let isNew;
+    if (key && embeddedOnly.has(key)) {
+      embeddedOnly.delete(key);
+      replacePost(key, flat);
+      isNew = true;
+    } else {
+      isNew = collectPost(key, flat);
+    }
+    for (const record of referenced) {
+      const recordKey = record.id || record.permalink;
+      if (collectPost(recordKey, {...record, embedded: true})) embeddedOnly.add(recordKey);
+    }
+    return isNew;
+  }
+"""
+
+
+def flatten_post(post):
+    """[post, *referenced tweets] with nested copies replaced by parent_id/quoted_id/context_id"""
+    flat = {k: v for k, v in post.items() if k not in NESTED_FIELDS}
+    records = [flat]
+    previous_id = None
+    for ancestor in post.get("reply_chain") or []:
+        ancestor_records = flatten_post(ancestor)
+        if not ancestor_records[0].get("parent_id") and previous_id:
+            ancestor_records[0]["parent_id"] = previous_id
+        previous_id = post_id(ancestor_records[0]) or previous_id
+        records.extend(ancestor_records)
+    for field, ref in (("retweet", "quoted_id"), ("perplexity_context", "context_id")):
+        if isinstance(post.get(field), dict):
+            nested_records = flatten_post(post[field])
+            if post_id(nested_records[0]):
+                flat[ref] = post_id(nested_records[0])
+            records.extend(nested_records)
+    return records
+
+
+def normalize_posts(posts):
+    """Flatten posts and keep each tweet once, in first-seen order; already-flat records pass through.
+
+    Records with neither an id nor a permalink cannot be matched with other
+    copies, so each one is kept as it is (like NdjsonSink does).
+    """
+    records = {}
+    for post in posts:
+        flat, *referenced = flatten_post(post)
+        key = post_id(flat) or flat.get("permalink") or object()
+        # A tweet seen on its own beats an earlier embedded copy
+        if key not in records or records[key].get("embedded"):
+            records[key] = flat
+        for record in referenced:
+            key = post_id(record) or record.get("permalink") or object()
+            if key not in records:
+                records[key] = {**record, "embedded": True}
+    return list(records.values())
+
+
+def rebuild_nested(records, ids=None):
+    """Nested view of normalized records: the listed ids, or every non-embedded record.
+
+    Nested copies are shared between the posts that reference them, so the
+    rebuild stays linear in the number of records.
+    """
+    by_id = {post_id(r): r for r in records if post_id(r)}
+    built = {}
+
+    def build(tweet_id, path):
+        if tweet_id in built:
+            return built[tweet_id]
+        record = by_id.get(tweet_id)
+        if record is None or tweet_id in path:
+            return None
+        path = path | {tweet_id}
+        post = {k: v for k, v in record.items() if k not in ("quoted_id", "context_id", "embedded")}
+        quoted = build(record.get("quoted_id"), path)
+        if quoted:
+            post["retweet"] = quoted
+        chain = []
+        parent_id = record.get("parent_id")
+        while parent_id in by_id and parent_id not in path:
+            path = path | {parent_id}
+            chain.insert(0, build(parent_id, path - {parent_id}))
+            parent_id = by_id[parent_id].get("parent_id")
+        post["reply_chain"] = [ancestor for ancestor in chain if ancestor]
+        context = build(record.get("context_id"), path)
+        if context:
+            post["perplexity_context"] = context
+        built[tweet_id] = post
+        return post
+
+    if ids is None:
+        wanted = [r for r in records if not r.get("embedded")]
+    else:
+        wanted = [by_id[str(i)] for i in ids if str(i) in by_id]
+    return [build(post_id(r), frozenset()) if post_id(r) else dict(r) for r in wanted]
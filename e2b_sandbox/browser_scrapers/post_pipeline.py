@@ -0,0 +1,69 @@
+"""
+What happens to extracted posts between the page and disk.
+
+PlaywrightScraper runs every batch of posts (streamed batches and the final
+results alike) through one PostPipeline, configured once instead of through
+a scraper argument per stage:
+
+| Stage           | Option          | What it does                                           |
+|-----------------|-----------------|--------------------------------------------------------|
+| normalize       | normalized      | every tweet once, nesting becomes parent_id/quoted_id/ |
+|                 |                 | context_id references (post_normalization.py)          |
+| numeric counts  | numeric_counts  | "1.2K" -> 1200 in bulk, failures counted in the trace; |
+|                 | keep_raw_counts | raw strings kept under raw_counts (engagement.py)      |
+| dedup           | dedup           | a NearDuplicateIndex sets dup_cluster_id               |
+| store           | store           | a PostStore (or database path) instead of a JSON file  |
+| trends          | trends          | a TrendDetector counts every batch                     |
+
+prepare() runs the stages that rewrite posts before they are written;
+observe() feeds the written posts to the counting stages. The
+network_intelligence modules (and NumPy) are imported only by the stages
+that need them, so plain scraping does not depend on them.
+
+Usage:
+    pipeline = PostPipeline(normalized=True, numeric_counts=True, store="extracted_data/posts.db")
+    scraper = PlaywrightPostsScraper(pipeline=pipeline)
+"""
+from pathlib import Path
+
+from e2b_sandbox.browser_scrapers.post_normalization import normalize_posts
+
+
+class PostPipeline:
+    """Per-batch post processing shared by every page type"""
+
+    def __init__(self, normalized=False, numeric_counts=False, keep_raw_counts=False, dedup=None, store=None,
+                 trends=None):
+        self.normalized = normalized
+        self.numeric_counts = numeric_counts
+        self.keep_raw_counts = keep_raw_counts
+        self.dedup = dedup
+        if isinstance(store, (str, Path)):
+            from e2b_sandbox.network_intelligence.post_store import PostStore
+            store = PostStore(store)
+        self.store = store
+        self.trends = trends
+
+    def prepare(self, posts, tracer=None):
+        """Normalize, convert counts and tag near-duplicates; returns the posts to write"""
+        if self.normalized:
+            posts = normalize_posts(posts)
+        if self.numeric_counts:
+            self._normalize_counts(posts, tracer)
+        if self.dedup is not None:
+            self.dedup.add(posts)
+        return posts
+
+    def observe(self, posts):
+        """Count posts into the trend detector"""
+        if self.trends is not None:
+            self.trends.add_posts(posts)
+
+    def _normalize_counts(self, posts, tracer):
+        from e2b_sandbox.network_intelligence.engagement import normalize_counts
+
+        failures = normalize_counts(posts, keep_raw=self.keep_raw_counts)
+        if failures:
+            if tracer is not None:
+                tracer.count("count_parse_failures", len(failures))
+            print(f"⚠️ {len(failures)} engagement counts could not be parsed, e.g. {failures[0][1]}={failures[0][2]!r}")
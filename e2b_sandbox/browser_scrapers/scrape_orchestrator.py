@@ -0,0 +1,209 @@
+"""
+Concurrent multi-handle scraping over a bounded pool of browser contexts.
+
+One Chromium process is launched and logged in once (reusing the cached
+session when it is still valid); its storage state is cloned into N
+BrowserContexts that are leased to (handle, pageType) tasks.
+Each task gets a per-task timeout and the results are aggregated into a single
+report, instead of paying a full browser launch and login per handle.
+
+Usage:
+    python -m e2b_sandbox.browser_scrapers.scrape_orchestrator alice bob --page-types likes posts --concurrency 4
+"""
+import argparse
+import asyncio
+import json
+from itertools import product
+
+from playwright.async_api import async_playwright
+
+from e2b_sandbox.browser_scrapers.playwright_likes_scraper import PlaywrightLikesScraper
+from e2b_sandbox.browser_scrapers.playwright_posts_scraper import PlaywrightPostsScraper
+from e2b_sandbox.browser_scrapers.playwright_replies_scraper import PlaywrightRepliesScraper
+from e2b_sandbox.browser_scrapers.post_pipeline import PostPipeline
+from e2b_sandbox.browser_scrapers.scraper_engine import (
+    BROWSER_SETTINGS,
+    X_PASSWORD,
+    X_USERNAME,
+    add_metrics_arguments,
+)
+from e2b_sandbox.browser_scrapers.session_cache import SessionCache
+from e2b_sandbox.browser_scrapers.tracing import REGISTRY, serve_metrics
+
+SCRAPER_CLASSES = {
+    "likes": PlaywrightLikesScraper,
+    "posts": PlaywrightPostsScraper,
+    "replies": PlaywrightRepliesScraper,
+}
+
+
+class ScrapeOrchestrator:
+    """Runs many (handle, pageType) scrapes over a shared, logged-in browser"""
+
+    def __init__(self, handles, page_types=("likes", "posts", "replies"), concurrency=4, task_timeout=900,
+                 username=None, password=None, headless=True, scraper_options=None, session_cache=None):
+        unknown = set(page_types) - set(SCRAPER_CLASSES)
+        if unknown:
+            raise ValueError(f"Unknown page types: {', '.join(sorted(unknown))}")
+        self.handles = list(handles)
+        self.page_types = list(page_types)
+        self.concurrency = max(1, concurrency)
+        self.task_timeout = task_timeout
+        self.username = username or X_USERNAME
+        self.password = password or X_PASSWORD
+        self.headless = headless
+        self.scraper_options = scraper_options or {}
+        self.session_cache = session_cache or SessionCache()
+
+    def _context_settings(self):
+        return {
+            "viewport": BROWSER_SETTINGS["viewport"],
+            "user_agent": BROWSER_SETTINGS["user_agent"],
+            "locale": BROWSER_SETTINGS["locale"],
+            "timezone_id": BROWSER_SETTINGS["timezone_id"],
+            "geolocation": BROWSER_SETTINGS["geolocation"],
+            "permissions": BROWSER_SETTINGS["permissions"],
+        }
+
+    async def _login(self, browser):
+        """Log in once (or reuse the cached session) and return the storage state shared by every context"""
+        storage_state = self.session_cache.load(self.username)
+        context = await browser.new_context(storage_state=storage_state, **self._context_settings())
+        try:
+            scraper = PlaywrightLikesScraper(username=self.username, password=self.password,
+                                             session_cache=self.session_cache, **self.scraper_options)
+            scraper.page = await context.new_page()
+            scraper.session_restored = storage_state is not None
+            await scraper.ensure_logged_in()
+            return await context.storage_state()
+        finally:
+            await context.close()
+
+    async def _run_task(self, contexts, handle, page_type):
+        context = await contexts.get()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        page = None
+        result = {"handle": handle, "page_type": page_type}
+        try:
+            page = await context.new_page()
+            scraper = SCRAPER_CLASSES[page_type](
+                username=self.username, password=self.password, target_handle=handle, **self.scraper_options
+            )
+            print(f"🚀 [{handle}/{page_type}] started")
+            result.update(await asyncio.wait_for(scraper.scrape(page), timeout=self.task_timeout))
+        except asyncio.TimeoutError:
+            result.update(success=False, error=f"Timed out after {self.task_timeout}s")
+        except Exception as e:
+            result.update(success=False, error=str(e), error_type=type(e).__name__)
+        finally:
+            if page is not None:
+                try:
+                    await page.close()
+                except Exception as e:
+                    print(f"⚠️  [{handle}/{page_type}] could not close page: {e}")
+            contexts.put_nowait(context)
+        result["duration"] = round(loop.time() - started, 2)
+        status = "✅" if result.get("success") else "❌"
+        print(f"{status} [{handle}/{page_type}] finished in {result['duration']}s")
+        return result
+
+    @staticmethod
+    def aggregate(results, duration):
+        succeeded = [r for r in results if r.get("success")]
+        return {
+            "success": len(succeeded) == len(results),
+            "total_tasks": len(results),
+            "succeeded": len(succeeded),
+            "failed": len(results) - len(succeeded),
+            "total_posts": sum(r.get("total_posts") or 0 for r in succeeded),
+            "estimated_bytes_saved": sum((r.get("resources_blocked") or {}).get("estimated_bytes_saved", 0)
+                                         for r in succeeded),
+            "duration": round(duration, 2),
+            "results": results,
+        }
+
+    async def run_tasks(self, contexts):
+        """Every (handle, pageType) task, each leasing a context from the queue; results in task order"""
+        return await asyncio.gather(*[
+            self._run_task(contexts, handle, page_type)
+            for handle, page_type in product(self.handles, self.page_types)
+        ])
+
+    async def run(self):
+        """Scrape every (handle, pageType) pair and return an aggregated report"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        playwright = await async_playwright().start()
+        browser = None
+        contexts = asyncio.Queue()
+        try:
+            browser = await playwright.chromium.launch(headless=self.headless)
+            storage_state = await self._login(browser)
+            pool_size = min(self.concurrency, len(self.handles) * len(self.page_types)) or 1
+            for _ in range(pool_size):
+                contexts.put_nowait(await browser.new_context(storage_state=storage_state, **self._context_settings()))
+            print(f"🧵 Running {len(self.handles) * len(self.page_types)} tasks over {pool_size} contexts")
+            results = await self.run_tasks(contexts)
+        finally:
+            while not contexts.empty():
+                await contexts.get_nowait().close()
+            if browser:
+                await browser.close()
+            await playwright.stop()
+        return self.aggregate(results, loop.time() - started)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Scrape many X.com handles concurrently")
+    parser.add_argument("handles", nargs="+")
+    parser.add_argument("--page-types", nargs="+", default=["likes", "posts", "replies"], choices=sorted(SCRAPER_CLASSES))
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--task-timeout", type=float, default=900)
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--block-resources", action="store_true", help="Abort image/video/font/analytics requests")
+    parser.add_argument("--normalized", action="store_true", help="Emit each tweet once with parent/quote/context IDs")
+    parser.add_argument("--numeric-counts", action="store_true", help="Store engagement counts as ints, not '1.2K'")
+    parser.add_argument("--keep-raw-counts", action="store_true", help="With --numeric-counts, keep the strings too")
+    parser.add_argument("--store", help="Upsert posts into this SQLite database instead of per-day JSON files")
+    parser.add_argument("--trends", help="Count posts into the trend detector state at this path (.npz)")
+    parser.add_argument("--dedup", help="Tag near-duplicate posts with dup_cluster_id, keeping the index at this path")
+    add_metrics_arguments(parser)
+    args = parser.parse_args()
+
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+    trends = dedup = None
+    if args.trends:
+        from e2b_sandbox.network_intelligence.trends import TrendDetector
+        trends = TrendDetector(state_path=args.trends)
+    if args.dedup:
+        from e2b_sandbox.network_intelligence.near_duplicates import NearDuplicateIndex
+        dedup = NearDuplicateIndex(path=args.dedup)
+    pipeline = PostPipeline(normalized=args.normalized, numeric_counts=args.numeric_counts,
+                            keep_raw_counts=args.keep_raw_counts, dedup=dedup, store=args.store, trends=trends)
+    orchestrator = ScrapeOrchestrator(
+        args.handles,
+        page_types=args.page_types,
+        concurrency=args.concurrency,
+        task_timeout=args.task_timeout,
+        headless=not args.headed,
+        scraper_options={"block_resources": args.block_resources, "pipeline": pipeline},
+    )
+    report = await orchestrator.run()
+    if trends is not None:
+        trends.save()
+        print(f"🔥 Trending: {', '.join(s['term'] for s in trends.trending(10)) or 'nothing yet'}")
+    if dedup is not None:
+        dedup.save()
+        print(f"🧬 {len(dedup)} posts indexed, {len(dedup.clusters())} near-duplicate clusters")
+    if args.metrics_textfile:
+        REGISTRY.write_textfile(args.metrics_textfile)
+    print(json.dumps({k: v for k, v in report.items() if k != "results"}, indent=2))
+    for r in report["results"]:
+        if not r.get("success"):
+            print(f"❌ {r['handle']}/{r['page_type']}: {r['error']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
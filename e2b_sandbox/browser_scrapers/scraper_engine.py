@@ -0,0 +1,667 @@
+"""
+Shared async scraping engine for X.com page types.
+
+Everything that used to be copied across the likes/posts/replies scrapers
+(browser setup, session reuse, login, script injection, retries, saving) lives
+in PlaywrightScraper. What differs per page type is a PageStrategy:
+
+- build_url(handle, base_url)   where to go
+- ready_selector                what to wait for before extracting
+- extraction_script             in-page extractor, called with options
+- timeline_operations           GraphQL operations for interception mode
+
+Options the engine itself handles:
+
+- intercept        read posts from timeline API responses (timeline_interceptor.py)
+- incremental      stop at the previous run's newest posts, append a delta (high_water_marks.py)
+- stream           flush posts to NDJSON while the page scrolls (stream_sink.py)
+- block_resources  abort image/video/font/analytics requests (resource_blocking.py)
+- pool_address     lease a warm, logged-in browser (browser_pool.py), or X_BROWSER_POOL
+
+What happens to the posts themselves (normalization, numeric counts,
+near-duplicate tagging, the SQLite store, trend counting) is configured on a
+PostPipeline (post_pipeline.py) passed as pipeline=.
+
+Every run is traced (tracing.py): phase spans, scroll rounds and counters go to
+<output_dir>/traces.jsonl and the process-wide Prometheus registry.
+
+Page-type modules (playwright_likes_scraper.py, timeline_scraper.py, ...)
+define a strategy plus a thin PlaywrightScraper subclass, so pacing, caching
+and concurrency improvements apply to every page type at once.
+"""
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+from glob import glob
+from pathlib import Path
+
+from dotenv import load_dotenv
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright
+
+from e2b_sandbox.browser_scrapers.browser_pool import POOL_ADDRESS, PoolClient, PoolError
+from e2b_sandbox.browser_scrapers.high_water_marks import HighWaterMarkStore
+from e2b_sandbox.browser_scrapers.post_pipeline import PostPipeline
+from e2b_sandbox.browser_scrapers.resource_blocking import ResourceBlocker, ResourceBlockingProfile
+from e2b_sandbox.browser_scrapers.script_executor import (
+    DEFAULT_METHOD_CACHE,
+    ContextDestroyedError,
+    NoDataYetError,
+    ScriptCrashedError,
+    ScriptExecutor,
+)
+from e2b_sandbox.browser_scrapers.scroll_pacing import ScrollPacing
+from e2b_sandbox.browser_scrapers.session_cache import SessionCache, log_in, session_is_valid
+from e2b_sandbox.browser_scrapers.stream_sink import EMIT_FUNCTION, NdjsonSink
+from e2b_sandbox.browser_scrapers.timeline_interceptor import SCROLL_SCRIPT, TimelineInterceptor
+from e2b_sandbox.browser_scrapers.tracing import REGISTRY, Tracer, serve_metrics
+
+load_dotenv()
+
+# Extract credentials from environment variables
+X_USERNAME = os.getenv("X_USERNAME")
+X_PASSWORD = os.getenv("X_PASSWORD")
+TARGET_HANDLE = os.getenv("TARGET_HANDLE", X_USERNAME)
+
+BASE_URL = "https://x.com"
+
+# Browser settings
+BROWSER_SETTINGS = {
+    "headless": False,  # Set to True for production
+    "viewport": {"width": 1280, "height": 720},
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/122.0.0.0 Safari/537.36",
+    "locale": "en-US",
+    "timezone_id": "America/New_York",
+    "geolocation": {"latitude": 40.7128, "longitude": -74.0060},
+    "permissions": ["geolocation"],
+}
+
+# Last-resort extractor used when the strategy's script cannot be run
+FALLBACK_SCRIPT = """
+(pageType) => {
+  const articles = document.querySelectorAll('article');
+  const posts = [];
+  articles.forEach(article => {
+    const textElem = article.querySelector('div[data-testid="tweetText"]');
+    const timeElem = article.querySelector('time');
+    const userLinks = article.querySelectorAll('a[href^="/"][role="link"]');
+    let username = null, author = null;
+    for (const link of userLinks) {
+      const match = link.getAttribute('href').match(/^\\/([^\\/]+)$/);
+      if (match) {
+        username = match[1];
+        const displaySpan = link.querySelector('span');
+        if (displaySpan) {
+          author = displaySpan.textContent;
+        }
+        break;
+      }
+    }
+    posts.push({
+      author: author,
+      username: username,
+      text: textElem ? textElem.innerText : '',
+      date: timeElem ? timeElem.getAttribute('datetime') : null
+    });
+  });
+  return {
+    username: window.location.pathname.split('/')[1] || 'unknown',
+    pageType,
+    dateStr: new Date().toISOString().split('T')[0],
+    posts: posts,
+    totalPosts: posts.length
+  };
+}
+"""
+
+
+class PageStrategy:
+    """What a page type needs to provide to the engine"""
+    page_type = None
+    ready_selector = "article"
+    extraction_script = None
+    timeline_operations = ()
+
+    def build_url(self, handle, base_url=BASE_URL):
+        raise NotImplementedError
+
+    def finalize(self, results, handle):
+        """Fill in result metadata the in-page script could not know"""
+        results["pageType"] = results.get("pageType") or self.page_type
+        if not results.get("username"):
+            posts = results.get("posts") or []
+            results["username"] = (posts[0].get("username") if posts else None) or handle
+        if not results.get("dateStr"):
+            results["dateStr"] = datetime.now().strftime("%Y-%m-%d")
+        results.setdefault("totalPosts", len(results.get("posts") or []))
+        return results
+
+
+class PlaywrightScraper:
+    """Async scraping engine; subclasses or callers provide the PageStrategy"""
+    strategy = None
+
+    def __init__(self, username=None, password=None, target_handle=None, strategy=None, intercept=False,
+                 pacing=None, incremental=False, output_dir="extracted_data", session_cache=None,
+                 base_url=BASE_URL, headless=None, stream=False, method_cache=None, script_tag_timeout_ms=120000,
+                 block_resources=False, pool_address=None, tracer=None, pipeline=None):
+        self.username = username or X_USERNAME
+        self.password = password or X_PASSWORD
+        self.target_handle = target_handle or TARGET_HANDLE
+        self.strategy = strategy or self.strategy
+        if self.strategy is None:
+            raise ValueError("A PageStrategy is required")
+        self.page_type = self.strategy.page_type
+        self.intercept = intercept
+        self.pacing = pacing or ScrollPacing()
+        self.incremental = incremental
+        self.output_dir = Path(output_dir)
+        self.high_water_marks = HighWaterMarkStore(output_dir)
+        self.session_cache = session_cache or SessionCache()
+        self.session_restored = False
+        self.base_url = base_url.rstrip("/")
+        self.headless = BROWSER_SETTINGS["headless"] if headless is None else headless
+        self.stream = stream
+        self.method_cache = method_cache or DEFAULT_METHOD_CACHE
+        self.resource_blocker = None
+        if block_resources:
+            profile = block_resources if isinstance(block_resources, ResourceBlockingProfile) else None
+            self.resource_blocker = ResourceBlocker(profile)
+        self.script_tag_timeout_ms = script_tag_timeout_ms
+        self.sink = None
+        self._stream_page = None
+        self.tracer = tracer or Tracer(self.output_dir / "traces.jsonl", labels={"page_type": self.page_type},
+                                       handle=self.target_handle, page_type=self.page_type)
+        self.pipeline = pipeline or PostPipeline()
+        self.pool_address = pool_address or POOL_ADDRESS
+        self.pool_client = None
+        self.pool_lease = None
+        self.interceptor = None
+        self.playwright = None
+        self.browser = None
+        self.page = None
+
+    async def setup_browser(self):
+        """Initialize browser with settings, restoring the cached session if we have one"""
+        self.playwright = await async_playwright().start()
+        if self.pool_address and await self._attach_to_pool():
+            return
+        self.browser = await self.playwright.chromium.launch(headless=self.headless)
+        storage_state = self.session_cache.load(self.username)
+        self.session_restored = storage_state is not None
+        context = await self.browser.new_context(
+            viewport=BROWSER_SETTINGS["viewport"],
+            user_agent=BROWSER_SETTINGS["user_agent"],
+            locale=BROWSER_SETTINGS["locale"],
+            timezone_id=BROWSER_SETTINGS["timezone_id"],
+            geolocation=BROWSER_SETTINGS["geolocation"],
+            permissions=BROWSER_SETTINGS["permissions"],
+            storage_state=storage_state
+        )
+        self.page = await context.new_page()
+        await self._prepare_page()
+
+    async def _attach_to_pool(self):
+        """Lease a warm browser from the pool; False means launch locally instead"""
+        try:
+            self.pool_client = PoolClient(self.pool_address)
+            self.pool_lease = await self.pool_client.lease()
+            self.browser = await self.playwright.chromium.connect_over_cdp(self.pool_lease["endpoint"])
+            # The pool keeps each instance's persistent, logged-in context as the default one
+            self.page = await self.browser.contexts[0].new_page()
+        except (OSError, PoolError, PlaywrightError) as e:
+            print(f"⚠️  Browser pool unavailable ({e}), launching a local browser")
+            if self.pool_lease:
+                # An endpoint that refused CDP goes back unhealthy, so the pool relaunches it
+                await self._release_pool_lease()
+            self.pool_client = self.pool_lease = self.browser = self.page = None
+            return False
+        print(f"🏊 Leased pooled browser at {self.pool_lease['endpoint']}")
+        await self._prepare_page()
+        return True
+
+    async def _release_pool_lease(self):
+        healthy = self.browser is not None and self.browser.is_connected()
+        if self.page and healthy:
+            try:
+                await self.page.close()
+            except Exception as e:
+                print(f"⚠️  Could not close pooled page: {e}")
+        try:
+            await self.pool_client.release(healthy=healthy)
+        except (OSError, PoolError) as e:
+            print(f"⚠️  Could not release browser lease: {e}")
+
+    async def _prepare_page(self):
+        """Per-page hooks that must be in place before the first navigation"""
+        if self.resource_blocker:
+            await self.resource_blocker.install(self.page)
+        self._attach_interceptor()
+
+    def _attach_interceptor(self):
+        """Capture timeline API responses before any navigation happens"""
+        if not self.intercept:
+            return
+        if not self.strategy.timeline_operations:
+            print(f"⚠️  Interception is not supported for {self.page_type} pages, using DOM extraction")
+            return
+        on_posts = self._write_stream_batch if self.stream else None
+        self.interceptor = TimelineInterceptor(self.page_type, self.strategy.timeline_operations, on_posts)
+        self.interceptor.attach(self.page)
+
+    async def ensure_logged_in(self):
+        """Reuse the cached session if it is still valid, otherwise log in and cache the new one"""
+        if self.pool_lease and self.pool_lease.get("logged_in"):
+            print("🔑 Using the pool's logged-in browser")
+            return
+        if self.session_restored:
+            if await session_is_valid(self.page, self.base_url):
+                print("🔑 Reusing cached session")
+                return
+            print("⌛ Cached session expired, logging in again...")
+            self.session_cache.invalidate(self.username)
+        await self.login()
+        await self.session_cache.save(self.page.context, self.username)
+
+    async def login(self):
+        """Handle X.com login"""
+        await log_in(self.page, self.username, self.password, self.base_url)
+
+    async def navigate(self):
+        """Open the strategy's page for the target handle and wait until it is ready"""
+        url = self.strategy.build_url(self.target_handle, self.base_url)
+        print(f"🧭 Navigating to {self.target_handle}'s {self.page_type} page: {url}")
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                await self.page.goto(url)
+                await self.page.wait_for_load_state("networkidle")
+                print(f"✅ Page loaded: {self.page.url}")
+                await self.page.wait_for_selector(self.strategy.ready_selector, timeout=20000)
+                print(f"✅ Content ready ({self.strategy.ready_selector})")
+                return
+            except Exception as e:
+                print(f"⚠️  Waiting for {self.page_type} content failed (attempt {attempt + 1}): {e}")
+                if attempt < max_retries - 1:
+                    print("🔄 Retrying navigation...")
+                    await self.page.reload()
+                else:
+                    print("❌ Navigation failed after retries. Proceeding anyway.")
+
+    async def execute_extraction_script(self):
+        """Execute the extraction script, retrying only failures that can go away, or collect intercepted responses"""
+        print("🚀 Starting extraction script execution...")
+        print(f"📍 Current URL: {self.page.url}")
+        if self.interceptor:
+            return await self._execute_via_interception()
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                print(f"📝 Extraction attempt {attempt + 1}/{max_retries}")
+                print("=" * 50)
+                result = await self._execute_script_with_multiple_methods()
+                print(f"✅ Extraction completed successfully!")
+                print(f"📊 Found {result['totalPosts']} posts")
+                print(f"👤 Username: {result.get('username')}")
+                return result
+            except ScriptCrashedError as e:
+                print(f"💥 Extraction script crashed, not retrying: {e}")
+                print(f"📍 Failed at URL: {self.page.url}")
+                raise
+            except (NoDataYetError, ContextDestroyedError) as e:
+                print(f"⚠️  {type(e).__name__} on attempt {attempt + 1}: {e}")
+                if attempt == max_retries - 1:
+                    print("💥 All extraction attempts failed")
+                    raise
+                self.tracer.count("extraction_retries", reason=type(e).__name__)
+                if isinstance(e, ContextDestroyedError):
+                    # A navigation replaced the document; let it settle and run again
+                    await self._wait_for_settle()
+                else:
+                    await self._handle_extraction_error()
+                await self.page.wait_for_timeout(1000 * 2 ** attempt)
+
+    async def _wait_for_settle(self):
+        try:
+            await self.page.wait_for_load_state("networkidle", timeout=10000)
+        except Exception as e:
+            print(f"⚠️  Page did not settle: {e}")
+
+    async def _handle_extraction_error(self):
+        """Handle extraction errors and try to recover"""
+        print("🔧 Attempting to recover from extraction error...")
+        try:
+            print("🔄 Refreshing page...")
+            await self.page.reload()
+            await self.page.wait_for_load_state("networkidle")
+            if await self.page.locator('text=Log in').count() > 0:
+                print("⚠️  Lost login session, attempting to re-login...")
+                self.session_cache.invalidate(self.username)
+                await self.login()
+                await self.session_cache.save(self.page.context, self.username)
+                await self.navigate()
+        except Exception as e:
+            print(f"⚠️  Recovery attempt failed: {e}")
+
+    async def _execute_script_with_multiple_methods(self):
+        """Execute the extraction script, starting with the injection method that last worked for this page type"""
+        executor = ScriptExecutor(
+            self.page_type,
+            [self._execute_via_evaluate, self._execute_via_script_tag, self._execute_via_devtools],
+            has_data=self._has_data,
+            cache=self.method_cache,
+        )
+        try:
+            with self.tracer.span("inject") as span:
+                result = await executor.run()
+                span.set(method=executor.method_used)
+        finally:
+            print(f"⏱️  Script execution took {span.duration:.2f} seconds")
+        self.tracer.count("injection_method", method=executor.method_used)
+        return self.strategy.finalize(result, self.target_handle)
+
+    @staticmethod
+    def _has_data(result):
+        return bool(result and (result.get('posts') or result.get('streamedPosts')))
+
+    def _script_options(self):
+        """Options passed to the in-page scripts"""
+        options = {"pacing": self.pacing.to_options(), "pageType": self.page_type}
+        if self.incremental:
+            options["knownIds"] = self.high_water_marks.known_ids(self.target_handle, self.page_type)
+        if self.stream:
+            options["stream"] = True
+        if self.pipeline.normalized:
+            options["normalized"] = True
+        return options
+
+    def _stream_sink(self):
+        if self.sink is None:
+            dateStr = datetime.now().strftime("%Y-%m-%d")
+            self.sink = NdjsonSink(self.output_dir / f"{self.target_handle}_{self.page_type}_{dateStr}.ndjson")
+            print(f"🌊 Streaming posts to: {self.sink.path}")
+        return self.sink
+
+    def _write_stream_batch(self, posts):
+        """Called from the page (and the interceptor) with each batch of new posts"""
+        posts = self.pipeline.prepare(posts, self.tracer)
+        written = self._stream_sink().write_batch(posts)
+        if self.pipeline.store:
+            self.pipeline.store.upsert_posts(posts, self.target_handle, self.page_type)
+        self.pipeline.observe(posts)
+        if written:
+            print(f"🌊 +{written} posts ({self.sink.count} streamed)")
+        return written
+
+    async def _expose_stream(self):
+        """Expose the batch callback to the page once; it survives reloads"""
+        if self._stream_page is self.page:
+            return
+        await self.page.expose_function(EMIT_FUNCTION, self._write_stream_batch)
+        self._stream_page = self.page
+
+    async def _execute_via_interception(self):
+        """Scroll the timeline and collect posts from intercepted API responses"""
+        print("📡 Collecting posts from intercepted timeline responses...")
+        scroll_stats = await self.page.evaluate(SCROLL_SCRIPT, self._script_options())
+        await self.interceptor.drain()
+        result = self.interceptor.results(self.target_handle)
+        result["scrollRounds"] = scroll_stats.get("scrollRounds", 0)
+        result["scrollRoundMs"] = scroll_stats.get("scrollRoundMs", [])
+        print(f"📊 Intercepted {result['totalPosts']} posts from {self.interceptor.responses_seen} responses "
+              f"in {result['scrollRounds']} scroll rounds")
+        if not result['totalPosts']:
+            raise NoDataYetError("No timeline responses were intercepted", self.page_type, "interception")
+        return result
+
+    async def _leave_compose(self):
+        # Some clicks open the composer; go back before running the script
+        if "compose" in self.page.url.lower():
+            print("⚠️  Page navigated to compose, trying to go back...")
+            await self.page.go_back()
+            await self.page.wait_for_load_state("networkidle")
+
+    async def _execute_via_evaluate(self):
+        """Execute script directly via page.evaluate"""
+        print("⚡ Executing script directly...")
+        await self._leave_compose()
+        return await self.page.evaluate(self.strategy.extraction_script, self._script_options())
+
+    async def _execute_via_devtools(self):
+        """Execute script via CDP (Chrome DevTools Protocol)"""
+        print("🔧 Using CDP for script execution...")
+        try:
+            cdp = await self.page.context.new_cdp_session(self.page)
+            result = await cdp.send("Runtime.evaluate", {
+                "expression": f"({self.strategy.extraction_script})({json.dumps(self._script_options())})",
+                "returnByValue": True,
+                "awaitPromise": True
+            })
+            details = result.get("exceptionDetails")
+            if details:
+                raise Exception(details.get("exception", {}).get("description") or details.get("text"))
+            return result.get("result", {}).get("value")
+        except Exception as e:
+            print(f"CDP method failed: {e}")
+            raise
+
+    async def _execute_via_script_tag(self):
+        """Execute script by injecting a script tag that stores its result (or error) on window"""
+        print("📜 Injecting script tag...")
+        await self._leave_compose()
+        await self.page.evaluate("""([source, options]) => {
+            window.lastExtractionResult = null;
+            window.lastExtractionError = null;
+            const script = document.createElement('script');
+            script.textContent = `(${source})(${JSON.stringify(options)}).then(
+                r => { window.lastExtractionResult = r; },
+                e => { window.lastExtractionError = String(e && e.stack || e); });`;
+            document.head.appendChild(script);
+        }""", [self.strategy.extraction_script, self._script_options()])
+        try:
+            await self.page.wait_for_function(
+                "() => window.lastExtractionResult !== null || window.lastExtractionError !== null",
+                timeout=self.script_tag_timeout_ms,
+            )
+        except PlaywrightTimeoutError:
+            # CSP may have blocked the tag; a one-screen fallback beats nothing
+            return await self._extract_from_page()
+        error = await self.page.evaluate("window.lastExtractionError")
+        if error:
+            raise Exception(error)
+        return await self.page.evaluate("window.lastExtractionResult")
+
+    async def _extract_from_page(self):
+        """Fallback: extract data directly from page without the strategy script"""
+        print("🔄 Fallback: extracting data directly from page...")
+        return await self.page.evaluate(FALLBACK_SCRIPT, self.page_type)
+
+    async def save_results(self, results):
+        """Save the extracted results to a JSON file, replacing any earlier one for the same key"""
+        if not results or not results.get('posts'):
+            print("No results to save")
+            return None
+        output_dir = self.output_dir
+        output_dir.mkdir(exist_ok=True)
+        username = results.get('username') or self.target_handle
+        pageType = results.get('pageType') or self.page_type
+        dateStr = results.get('dateStr')
+        filename = f"{username}_{pageType}_{dateStr}.json"
+        filepath = output_dir / filename
+        # Remove previous file for same user/pageType/date
+        for oldfile in glob(str(output_dir / filename)):
+            try:
+                os.remove(oldfile)
+            except Exception as e:
+                print(f"Could not remove old file {oldfile}: {e}")
+        # Add root-level metadata
+        scrape_metadata = {
+            "scrape_timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            "code_version": "1.1.0",
+            "username": username,
+            "user": username,  # kept for readers of the original posts/replies format
+            "pageType": pageType,
+            "dateStr": dateStr,
+            "warnings": results.get('warnings', []),
+            "totalPosts": results.get('totalPosts', len(results.get('posts', [])))
+        }
+        output = {**scrape_metadata, "posts": results['posts']}
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+        print(f"Results saved to: {filepath}")
+        return filepath
+
+    async def save_to_store(self, results):
+        """Upsert the extracted posts into the SQLite post store"""
+        if not results or not results.get('posts'):
+            print("No results to save")
+            return None
+        store = self.pipeline.store
+        written = store.upsert_posts(results['posts'], results.get('username') or self.target_handle,
+                                     results.get('pageType') or self.page_type)
+        print(f"Results stored in: {store.path} ({written} rows)")
+        return store.path
+
+    async def save_stream(self, results):
+        """Finish the NDJSON stream; posts the script returned instead of streaming are written too"""
+        sink = self._stream_sink()
+        if results.get('posts'):
+            sink.write_batch(results['posts'])
+            if self.pipeline.store:
+                self.pipeline.store.upsert_posts(results['posts'], self.target_handle, self.page_type)
+        sink.close()
+        results['totalPosts'] = sink.count
+        print(f"Results streamed to: {sink.path}")
+        return sink.path
+
+    async def save_delta(self, results):
+        """Append only posts newer than the stored high-water mark (incremental mode)"""
+        filepath, new_posts = self.high_water_marks.append_delta(self.target_handle, self.page_type, results['posts'])
+        results['newPosts'] = new_posts
+        return filepath
+
+    async def scrape(self, page=None):
+        """Navigate, extract and save using an already logged-in page.
+
+        When a page is passed in, the caller owns the browser and its lifecycle
+        (see scrape_orchestrator.py); otherwise self.page from setup_browser is used.
+        """
+        if page is not None:
+            self.page = page
+            await self._prepare_page()
+        if self.stream:
+            await self._expose_stream()
+        with self.tracer.span("navigate", page_type=self.page_type):
+            await self.navigate()
+        try:
+            with self.tracer.span("extraction", intercept=bool(self.interceptor)):
+                results = await self.execute_extraction_script()
+                if results.get('posts'):
+                    # Intercepted posts arrive nested; the DOM script already emits flat records
+                    results['posts'] = self.pipeline.prepare(results['posts'], self.tracer)
+                    if self.pipeline.normalized and not self.stream:
+                        results['totalPosts'] = len(results['posts'])
+                self._record_scroll_rounds(results)
+            if results.get('posts'):
+                # Posts already counted from streamed batches are skipped by the detector's seen filter
+                self.pipeline.observe(results['posts'])
+        except Exception:
+            if self.sink:
+                self.sink.close()
+                print(f"💾 {self.sink.count} posts streamed before the failure are kept in {self.sink.path}")
+            raise
+        with self.tracer.span("save", stream=self.stream, incremental=self.incremental):
+            if self.stream:
+                filepath = await self.save_stream(results)
+                if self.incremental:
+                    # Deltas are small, so reading the run back for the high-water marks is cheap
+                    results['posts'] = self.sink.read_all()
+                    filepath = await self.save_delta(results)
+            elif self.incremental:
+                filepath = await self.save_delta(results)
+                if self.pipeline.store:
+                    await self.save_to_store(results)
+            elif self.pipeline.store:
+                filepath = await self.save_to_store(results)
+            else:
+                filepath = await self.save_results(results)
+        self.tracer.count("posts_found", results.get('totalPosts', len(results.get('posts', []))))
+        if self.resource_blocker:
+            report = self.resource_blocker.report()
+            print(f"🚫 Blocked {report['blocked_requests']} requests, an estimated "
+                  f"{report['estimated_bytes_saved'] / 1_000_000:.1f} MB not downloaded (per-type averages, not measured)")
+        return {
+            "success": True,
+            "filepath": filepath,
+            "total_posts": results.get('totalPosts', len(results.get('posts', []))),
+            "new_posts": results.get('newPosts'),
+            "username": results.get('username'),
+            "pageType": results.get('pageType'),
+            "dateStr": results.get('dateStr'),
+            "scroll_rounds": results.get('scrollRounds'),
+            "resources_blocked": self.resource_blocker.report() if self.resource_blocker else None,
+            "trace_id": self.tracer.trace_id,
+            "phases": self.tracer.phase_totals()
+        }
+
+    def _record_scroll_rounds(self, results):
+        round_seconds = [ms / 1000 for ms in results.get('scrollRoundMs') or []]
+        self.tracer.record_spans("scroll_round", round_seconds)
+        for seconds in round_seconds:
+            self.tracer.observe("scroll_round_seconds", seconds)
+        self.tracer.count("scroll_rounds", results.get('scrollRounds') or len(round_seconds))
+
+    async def run(self):
+        """Main execution method: launch, log in, scrape and tear down"""
+        try:
+            with self.tracer.span("run", handle=self.target_handle, page_type=self.page_type):
+                with self.tracer.span("setup_browser", pooled=bool(self.pool_address)):
+                    await self.setup_browser()
+                with self.tracer.span("login", session_restored=self.session_restored):
+                    await self.ensure_logged_in()
+                return await self.scrape()
+        except Exception as e:
+            print(f"Scraping failed: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "partial_filepath": self.sink.path if self.sink else None
+            }
+        finally:
+            if self.pool_client:
+                # Only disconnect: the pooled browser outlives this run
+                await self._release_pool_lease()
+            elif self.browser:
+                await self.browser.close()
+            if self.playwright:
+                await self.playwright.stop()
+
+
+def add_metrics_arguments(parser):
+    """--metrics-port / --metrics-textfile, shared by the scraper CLIs and the orchestrator"""
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this port while running")
+    parser.add_argument("--metrics-textfile",
+                        help="Write Prometheus metrics to this file when done (node_exporter textfile collector)")
+
+
+async def run_scraper(scraper, argv=None):
+    """Run a scraper and print a summary; shared by the page-type modules' main()"""
+    parser = argparse.ArgumentParser(description=f"Scrape the {scraper.page_type} page of {scraper.target_handle}")
+    add_metrics_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+    result = await scraper.run()
+    if args.metrics_textfile:
+        REGISTRY.write_textfile(args.metrics_textfile)
+    if result["success"]:
+        print(f"✅ Scraping completed successfully!")
+        print(f"📁 Results saved to: {result['filepath']}")
+        print(f"📊 Total posts extracted: {result['total_posts']}")
+        phases = ", ".join(f"{name} {seconds}s" for name, seconds in result.get("phases", {}).items())
+        print(f"⏱️  Phases: {phases}")
+    else:
+        print(f"❌ Scraping failed: {result['error']}")
+    return result
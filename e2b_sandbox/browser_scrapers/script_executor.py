@@ -0,0 +1,120 @@
+"""
+Execution layer for the in-page extraction scripts.
+
+The engine used to try page.evaluate, a script tag and CDP strictly in order
+on every attempt, and wrap that in 5 retries with reloads, whatever went
+wrong. ScriptExecutor starts with the method that last worked for the page
+type (MethodCache) and turns failures into structured errors so the engine
+can tell what is worth retrying:
+
+- NoDataYetError         the script ran but found nothing; the page may still be loading
+- ContextDestroyedError  a navigation/reload killed the script mid-run
+- ScriptCrashedError     the script threw under every method; retrying will not help
+
+The methods are not raced in parallel: each one runs the full scroll loop on
+the same page, so two at once would fight over the scroll position.
+"""
+
+CONTEXT_DESTROYED_MARKERS = (
+    "Execution context was destroyed",
+    "Cannot find context with specified id",
+    "Target closed",
+    "Target page, context or browser has been closed",
+)
+
+
+class ExtractionError(Exception):
+    """Base class for extraction failures; carries the page type and method"""
+
+    retryable = False
+
+    def __init__(self, message, page_type=None, method=None):
+        super().__init__(message)
+        self.page_type = page_type
+        self.method = method
+
+
+class NoDataYetError(ExtractionError):
+    retryable = True
+
+
+class ContextDestroyedError(ExtractionError):
+    retryable = True
+
+
+class ScriptCrashedError(ExtractionError):
+    pass
+
+
+def classify_error(error, page_type=None, method=None):
+    """Map an exception raised while running a script onto an ExtractionError"""
+    if isinstance(error, ExtractionError):
+        return error
+    message = str(error)
+    if any(marker in message for marker in CONTEXT_DESTROYED_MARKERS):
+        return ContextDestroyedError(message, page_type, method)
+    return ScriptCrashedError(message, page_type, method)
+
+
+class MethodCache:
+    """Last injection method that returned data, per page type"""
+
+    def __init__(self):
+        self._methods = {}
+
+    def get(self, page_type):
+        return self._methods.get(page_type)
+
+    def record(self, page_type, method_name):
+        self._methods[page_type] = method_name
+
+    def forget(self, page_type):
+        self._methods.pop(page_type, None)
+
+
+# Shared by every scraper in the process, e.g. all tasks of an orchestrator run
+DEFAULT_METHOD_CACHE = MethodCache()
+
+
+class ScriptExecutor:
+    """Runs a script through injection methods, preferring the cached one"""
+
+    def __init__(self, page_type, methods, has_data, cache=None):
+        self.page_type = page_type
+        self.methods = list(methods)
+        self.has_data = has_data
+        self.cache = cache or DEFAULT_METHOD_CACHE
+        self.method_used = None
+
+    def ordered_methods(self):
+        cached = self.cache.get(self.page_type)
+        return sorted(self.methods, key=lambda method: method.__name__ != cached)
+
+    async def run(self):
+        """Return the first result with data.
+
+        A method that ran cleanly but found nothing ends the attempt with
+        NoDataYetError: another method would run the same script on the same page.
+        """
+        crashes = []
+        for method in self.ordered_methods():
+            name = method.__name__
+            try:
+                result = await method()
+            except Exception as e:
+                error = classify_error(e, self.page_type, name)
+                if isinstance(error, ContextDestroyedError):
+                    raise error from e
+                print(f"❌ Method {name} failed: {error}")
+                crashes.append(error)
+                continue
+            if self.has_data(result):
+                if self.cache.get(self.page_type) != name:
+                    print(f"📌 Using {name} for {self.page_type} pages from now on")
+                self.cache.record(self.page_type, name)
+                self.method_used = name
+                return result
+            raise NoDataYetError(f"{name} returned no data", self.page_type, name)
+        self.cache.forget(self.page_type)
+        details = "; ".join(f"{e.method}: {e}" for e in crashes)
+        raise ScriptCrashedError(f"All script injection methods failed ({details})", self.page_type)
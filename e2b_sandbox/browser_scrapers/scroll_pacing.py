@@ -0,0 +1,168 @@
+"""
+Adaptive scroll pacing for the in-page extraction loops.
+
+The original scripts slept a fixed 3.5 s after every scroll and only stopped
+after 15 rounds without a height change, so every run ended with 52 s of dead
+waiting. The pacing engine below waits on real signals instead:
+
+- a MutationObserver on the timeline container that sees new cellInnerDiv nodes
+- an in-flight counter for fetch/XHR so a round ends once the network settles
+- scrollHeight growth as a last-resort signal
+
+When a round sees nothing new, the wait doubles (up to max_wait_ms) and the
+loop stops after max_idle_rounds consecutive idle rounds.
+
+PACING_JS is spliced into each extraction script; the policy is passed in as
+options.pacing, built from ScrollPacing.to_options().
+"""
+
+
+class ScrollPacing:
+    """Timing policy for the scroll loop, exposed as the `pacing` scraper parameter"""
+
+    def __init__(self, initial_wait_ms=1500, max_wait_ms=8000, backoff=2.0, settle_ms=400,
+                 max_idle_rounds=4, poll_ms=100, adaptive=True):
+        self.initial_wait_ms = initial_wait_ms
+        self.max_wait_ms = max_wait_ms
+        self.backoff = backoff
+        self.settle_ms = settle_ms
+        self.max_idle_rounds = max_idle_rounds
+        self.poll_ms = poll_ms
+        self.adaptive = adaptive
+
+    @classmethod
+    def fixed(cls, sleep_ms=3500, max_idle_rounds=15):
+        """The legacy policy: sleep a fixed time every round, stop after N unchanged rounds"""
+        return cls(initial_wait_ms=sleep_ms, max_wait_ms=sleep_ms, backoff=1.0,
+                   max_idle_rounds=max_idle_rounds, adaptive=False)
+
+    def worst_case_idle_ms(self):
+        """Time spent waiting at the end of a run before the loop gives up"""
+        total, wait = 0, self.initial_wait_ms
+        for _ in range(self.max_idle_rounds):
+            total += wait
+            wait = min(wait * self.backoff, self.max_wait_ms)
+        return total
+
+    def to_options(self):
+        return {
+            "initialWaitMs": self.initial_wait_ms,
+            "maxWaitMs": self.max_wait_ms,
+            "backoff": self.backoff,
+            "settleMs": self.settle_ms,
+            "maxIdleRounds": self.max_idle_rounds,
+            "pollMs": self.poll_ms,
+            "adaptive": self.adaptive,
+        }
+
+    def __repr__(self):
+        return (f"ScrollPacing(initial_wait_ms={self.initial_wait_ms}, max_wait_ms={self.max_wait_ms}, "
+                f"backoff={self.backoff}, settle_ms={self.settle_ms}, max_idle_rounds={self.max_idle_rounds}, "
+                f"adaptive={self.adaptive})")
+
+
+# Expects `options` in scope. Defines `pacing` and `scrollAndWait()`, which
+# scrolls to the bottom, waits for the page to react and returns true if the
+# timeline grew. The caller loops while pacing.idleRounds < pacing.maxIdleRounds.
+PACING_JS = """
+  const pacing = Object.assign({
+    initialWaitMs: 1500, maxWaitMs: 8000, backoff: 2, settleMs: 400,
+    maxIdleRounds: 4, pollMs: 100, adaptive: true
+  }, options.pacing || {});
+  pacing.idleRounds = 0;
+  pacing.waitMs = pacing.initialWaitMs;
+  pacing.scrollRounds = 0;
+  // Duration of every round in ms, reported back for tracing
+  pacing.roundMs = [];
+
+  // Count in-flight fetch/XHR requests (installed once per page)
+  function installNetworkTracker() {
+    if (window.__pfNetwork) return window.__pfNetwork;
+    const tracker = { inflight: 0, lastActivity: performance.now() };
+    const done = () => {
+      tracker.inflight = Math.max(0, tracker.inflight - 1);
+      tracker.lastActivity = performance.now();
+    };
+    const origFetch = window.fetch;
+    window.fetch = function(...args) {
+      tracker.inflight++;
+      tracker.lastActivity = performance.now();
+      return origFetch.apply(this, args).finally(done);
+    };
+    const origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function(...args) {
+      tracker.inflight++;
+      tracker.lastActivity = performance.now();
+      this.addEventListener('loadend', done, { once: true });
+      return origSend.apply(this, args);
+    };
+    window.__pfNetwork = tracker;
+    return tracker;
+  }
+
+  function timelineContainer() {
+    return document.querySelector('div[aria-label^="Timeline"]') ||
+      document.querySelector('[data-testid="primaryColumn"]') ||
+      document.body;
+  }
+
+  // Resolve true as soon as new timeline cells appear and the network has
+  // been quiet for settleMs; resolve false if nothing grows within timeoutMs.
+  function waitForTimelineGrowth(timeoutMs) {
+    const startHeight = document.body.scrollHeight;
+    if (!pacing.adaptive) {
+      return new Promise(res => setTimeout(res, timeoutMs))
+        .then(() => document.body.scrollHeight !== startHeight);
+    }
+    const network = installNetworkTracker();
+    const container = timelineContainer();
+    return new Promise(resolve => {
+      const start = performance.now();
+      let grew = false, lastMutation = start;
+      const observer = new MutationObserver(mutations => {
+        for (const m of mutations) {
+          for (const node of m.addedNodes) {
+            if (node.nodeType === 1 && (node.matches('div[data-testid="cellInnerDiv"]') ||
+                node.querySelector('div[data-testid="cellInnerDiv"], article'))) {
+              grew = true;
+              lastMutation = performance.now();
+            }
+          }
+        }
+      });
+      observer.observe(container, { childList: true, subtree: true });
+      const timer = setInterval(() => {
+        const now = performance.now();
+        if (!grew && document.body.scrollHeight !== startHeight) {
+          grew = true;
+          lastMutation = now;
+        }
+        const settled = network.inflight === 0 &&
+          now - network.lastActivity >= pacing.settleMs &&
+          now - lastMutation >= pacing.settleMs;
+        if ((grew && settled) || now - start >= timeoutMs) {
+          clearInterval(timer);
+          observer.disconnect();
+          resolve(grew);
+        }
+      }, pacing.pollMs);
+    });
+  }
+
+  async function scrollAndWait() {
+    const roundStart = performance.now();
+    window.scrollTo(0, document.body.scrollHeight);
+    pacing.scrollRounds++;
+    const grew = await waitForTimelineGrowth(pacing.waitMs);
+    pacing.roundMs.push(Math.round(performance.now() - roundStart));
+    if (grew) {
+      pacing.idleRounds = 0;
+      pacing.waitMs = pacing.initialWaitMs;
+    } else {
+      // Back off only while the page is truly idle
+      pacing.idleRounds++;
+      pacing.waitMs = Math.min(pacing.waitMs * pacing.backoff, pacing.maxWaitMs);
+    }
+    return grew;
+  }
+"""
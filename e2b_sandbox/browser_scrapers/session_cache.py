@@ -0,0 +1,159 @@
+"""
+Persisted authenticated sessions for the Playwright scrapers.
+
+Logging in through the username/password form costs 15-30 s per run and trips
+rate limits when many jobs run. The cache stores Playwright storage_state
+(cookies + localStorage) per account under .sessions/, validates a restored
+session with a single lightweight page load, and only falls back to the full
+login flow when the session has expired.
+
+Contexts created with new_context(storage_state=...) get the whole state;
+persistent contexts (the browser pool's) cannot take one, so
+restore_storage_state() replays the cookies and each origin's localStorage
+into them. log_in() needs only a page, so both the engine and the pool use it.
+"""
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+SESSION_DIR = os.getenv("X_SESSION_DIR", ".sessions")
+
+LOGGED_IN_SELECTOR = '[data-testid="SideNav_AccountSwitcher_Button"], [data-testid="AppTabBar_Home_Link"]'
+
+RESTORE_LOCAL_STORAGE_JS = "items => { for (const { name, value } of items) localStorage.setItem(name, value); }"
+
+
+class SessionCache:
+    """storage_state files keyed by account"""
+
+    def __init__(self, cache_dir=SESSION_DIR, max_age_hours=24 * 14):
+        self.cache_dir = Path(cache_dir)
+        self.max_age_seconds = max_age_hours * 3600
+
+    def path_for(self, account):
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", (account or "default").lower())
+        return self.cache_dir / f"{safe_name}.json"
+
+    def load(self, account):
+        """Path of a cached storage state for the account, or None if missing/stale"""
+        path = self.path_for(account)
+        if not path.exists():
+            return None
+        if time.time() - path.stat().st_mtime > self.max_age_seconds:
+            print(f"⌛ Cached session for {account} is older than the max age, ignoring it")
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Cached session for {account} is unreadable: {e}")
+            return None
+        return str(path)
+
+    async def save(self, context, account):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(account)
+        state = await context.storage_state()
+        # Session cookies are credentials: the file is created 0600 and renamed into place,
+        # so it is never readable by others, not even briefly
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.unlink(missing_ok=True)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+        print(f"💾 Session cached at: {path}")
+        return path
+
+    def invalidate(self, account):
+        path = self.path_for(account)
+        if path.exists():
+            path.unlink()
+
+
+async def session_is_valid(page, base_url="https://x.com", timeout=8000):
+    """One lightweight check: load /home and look for the logged-in navigation"""
+    try:
+        await page.goto(f"{base_url}/home", wait_until="domcontentloaded")
+        if "/login" in page.url or "/i/flow/login" in page.url:
+            return False
+        await page.wait_for_selector(LOGGED_IN_SELECTOR, timeout=timeout)
+        return True
+    except Exception as e:
+        print(f"⚠️  Session check failed: {e}")
+        return False
+
+
+async def restore_storage_state(context, path):
+    """Replay a saved storage state (cookies and every origin's localStorage) into an existing context"""
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("cookies"):
+        await context.add_cookies(state["cookies"])
+    origins = [origin for origin in state.get("origins", []) if origin.get("localStorage")]
+    if not origins:
+        return
+    page = await context.new_page()
+    try:
+        # Each origin is opened as an empty document: only its localStorage is needed, not the app
+        await page.route("**/*", lambda route: route.fulfill(status=200, content_type="text/html", body=""))
+        for origin in origins:
+            await page.goto(origin["origin"])
+            await page.evaluate(RESTORE_LOCAL_STORAGE_JS, origin["localStorage"])
+    finally:
+        await page.close()
+
+
+async def log_in(page, username, password, base_url="https://x.com"):
+    """X.com login through the username/password form, on any page"""
+    print(f"Logging in as {username}...")
+    await page.goto(f"{base_url}/login")
+    await page.wait_for_load_state("networkidle")
+    try:
+        username_input = await page.wait_for_selector(
+            'input[autocomplete="username"], input[placeholder*="username"], input[placeholder*="email"], input[placeholder*="phone"]',
+            timeout=10000
+        )
+        await username_input.fill(username)
+        next_button = await page.wait_for_selector(
+            'div[role="button"]:has-text("Next"), div[role="button"]:has-text("Continue"), button:has-text("Next"), button:has-text("Continue")',
+            timeout=5000
+        )
+        await next_button.click()
+        await page.wait_for_timeout(2000)
+    except Exception as e:
+        print(f"Username step failed: {e}")
+        try:
+            username_input = await page.wait_for_selector('input[autocomplete="username"]', timeout=5000)
+            await username_input.fill(username)
+        except:
+            pass
+    try:
+        password_input = await page.wait_for_selector(
+            'input[type="password"], input[autocomplete="current-password"]',
+            timeout=10000
+        )
+        await password_input.fill(password)
+        login_button = await page.wait_for_selector(
+            'div[role="button"]:has-text("Log in"), button:has-text("Log in"), div[data-testid="LoginButton"]',
+            timeout=5000
+        )
+        await login_button.click()
+    except Exception as e:
+        print(f"Password step failed: {e}")
+        raise
+    try:
+        await page.wait_for_selector(
+            '[data-testid="SideNav_AccountSwitcher_Button"], [data-testid="AppTabBar_Home_Link"], nav',
+            timeout=15000
+        )
+        print("Login successful!")
+    except Exception as e:
+        print(f"Login verification failed: {e}")
+        if await page.locator('text=Two-factor authentication').count() > 0:
+            print("2FA required - please handle manually")
+            await page.pause()
+        else:
+            raise Exception("Login failed - could not verify successful login")
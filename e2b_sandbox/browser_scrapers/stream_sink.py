@@ -0,0 +1,123 @@
+"""
+Streaming extraction: posts are pushed to Python in batches while scrolling.
+
+The extraction scripts used to keep every post in an in-page Map and return
+one huge object at the end, so a page crash lost everything and tab memory
+grew without bound. In streaming mode the page only keeps IDs for dedup and
+hands each round's new posts to a function exposed with page.expose_function;
+NdjsonSink appends them to disk as they arrive.
+
+STREAM_JS is spliced into the extraction scripts and provides collectPost(),
+replacePost() and flushBatch(). A replaced post whose batch was already
+flushed is emitted again; NdjsonSink writes the new copy and read_all() keeps
+it in place of the old one.
+"""
+import json
+from pathlib import Path
+
+EMIT_FUNCTION = "__parrotfishEmit"
+
+# Expects `options` in scope.
+STREAM_JS = """
+  // Streaming mode: new posts go to Python in batches, only IDs stay in the page
+  const streaming = Boolean(options.stream) && typeof window.__parrotfishEmit === 'function';
+  const seenIds = new Set();
+  const keptPosts = [];
+  const keptIndex = new Map();
+  let pendingBatch = [];
+  let streamedPosts = 0;
+
+  function collectPost(key, post) {
+    if (!key || seenIds.has(key)) return false;
+    seenIds.add(key);
+    if (streaming) {
+      pendingBatch.push(post);
+    } else {
+      keptIndex.set(key, keptPosts.length);
+      keptPosts.push(post);
+    }
+    return true;
+  }
+
+  // Swaps the record collected under key, re-emitting it if its batch already went to Python
+  function replacePost(key, post) {
+    if (!streaming) {
+      keptPosts[keptIndex.get(key)] = post;
+      return;
+    }
+    const pending = pendingBatch.findIndex(p => (p.id || p.permalink) === key);
+    if (pending >= 0) {
+      pendingBatch[pending] = post;
+    } else {
+      pendingBatch.push(post);
+    }
+  }
+
+  async function flushBatch() {
+    if (!streaming || pendingBatch.length === 0) return;
+    const batch = pendingBatch;
+    pendingBatch = [];
+    streamedPosts += batch.length;
+    await window.__parrotfishEmit(batch);
+  }
+"""
+
+
+class NdjsonSink:
+    """Appends post batches to an NDJSON file, flushing after every batch"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One file per run key, like save_results replacing the day's JSON
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._seen = set()
+        # Keys written only as an embedded copy (normalized mode), which a standalone copy may supersede
+        self._embedded = set()
+        self.count = 0
+        self.batches = 0
+
+    def write_batch(self, posts):
+        """Write the posts not seen yet in this run; returns how many were written"""
+        written = 0
+        for post in posts:
+            key = post.get("id") or post.get("permalink")
+            if key in self._seen:
+                if post.get("embedded") or key not in self._embedded:
+                    continue
+                # A standalone copy supersedes the embedded one written earlier
+                self._embedded.discard(key)
+            else:
+                self.count += 1
+                if key:
+                    self._seen.add(key)
+                    if post.get("embedded"):
+                        self._embedded.add(key)
+            self._file.write(json.dumps(post, ensure_ascii=False) + "\n")
+            written += 1
+        self._file.flush()
+        self.batches += 1
+        return written
+
+    def read_all(self):
+        if not self._file.closed:
+            self._file.flush()
+        posts, positions = [], {}
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                post = json.loads(line)
+                key = post.get("id") or post.get("permalink")
+                if key in positions:
+                    # A standalone copy written after an embedded one takes its place
+                    posts[positions[key]] = post
+                    continue
+                if key:
+                    positions[key] = len(posts)
+                posts.append(post)
+        return posts
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
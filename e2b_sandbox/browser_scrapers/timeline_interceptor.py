@@ -0,0 +1,357 @@
+"""
+Network-response interception for X.com timelines.
+
+Instead of walking every <article> in the DOM, the interceptor listens to the
+GraphQL timeline calls the page already makes while scrolling (Likes,
+UserTweets, UserTweetsAndReplies) and decodes their JSON bodies into the post
+schema documented at the top of playwright_posts_scraper.py. Engagement counts
+are exact integers and IDs come straight from the API instead of permalinks.
+
+parse_timeline_response() is pure and can be exercised offline against
+recorded response fixtures.
+"""
+import asyncio
+import html
+from datetime import datetime
+from urllib.parse import urlparse
+
+from e2b_sandbox.browser_scrapers.high_water_marks import INCREMENTAL_JS
+from e2b_sandbox.browser_scrapers.scroll_pacing import PACING_JS
+
+# GraphQL operation names that carry timeline entries for each page type
+TIMELINE_OPERATIONS = {
+    "likes": ("Likes",),
+    "posts": ("UserTweets",),
+    "replies": ("UserTweetsAndReplies",),
+}
+
+# Scroll-only driver used in interception mode: no DOM walk, just keep the
+# timeline loading until the page goes idle under the ScrollPacing policy.
+SCROLL_SCRIPT = """
+async (options = {}) => {
+""" + PACING_JS + INCREMENTAL_JS + """
+  let reachedKnown = false;
+  while (pacing.idleRounds < pacing.maxIdleRounds) {
+    if (reachedKnownPost()) {
+      reachedKnown = true;
+      break;
+    }
+    await scrollAndWait();
+  }
+  return { scrollRounds: pacing.scrollRounds, scrollRoundMs: pacing.roundMs, reachedKnown };
+}
+"""
+
+MAX_EMBED_DEPTH = 5
+
+
+def omit_nulls(obj):
+    """Drop None values recursively, mirroring omitNulls() in the extraction scripts"""
+    if isinstance(obj, dict):
+        return {k: omit_nulls(v) for k, v in obj.items() if v is not None}
+    elif isinstance(obj, list):
+        return [omit_nulls(i) for i in obj]
+    else:
+        return obj
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _iso_date(created_at):
+    """Convert X's 'Wed Oct 10 20:19:24 +0000 2018' into the <time datetime> format"""
+    if not created_at:
+        return None
+    try:
+        parsed = datetime.strptime(created_at, "%a %b %d %H:%M:%S %z %Y")
+    except ValueError:
+        return None
+    return parsed.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def _find_instructions(obj):
+    """Locate the timeline 'instructions' list regardless of the response envelope"""
+    if isinstance(obj, dict):
+        instructions = obj.get("instructions")
+        if isinstance(instructions, list):
+            return instructions
+        for value in obj.values():
+            found = _find_instructions(value)
+            if found is not None:
+                return found
+    elif isinstance(obj, list):
+        for value in obj:
+            found = _find_instructions(value)
+            if found is not None:
+                return found
+    return None
+
+
+def _unwrap_tweet(result):
+    """Return the Tweet object behind visibility wrappers, or None for tombstones"""
+    if not result:
+        return None
+    typename = result.get("__typename")
+    if typename == "TweetWithVisibilityResults":
+        return result.get("tweet")
+    if typename in ("TweetTombstone", "TweetUnavailable"):
+        return None
+    if "legacy" in result and "rest_id" in result:
+        return result
+    return None
+
+
+def _user_fields(tweet):
+    user = ((tweet.get("core") or {}).get("user_results") or {}).get("result") or {}
+    core = user.get("core") or {}
+    legacy = user.get("legacy") or {}
+    author = core.get("name") or legacy.get("name")
+    username = core.get("screen_name") or legacy.get("screen_name")
+    return author, username
+
+
+def _tweet_text(tweet):
+    note = (((tweet.get("note_tweet") or {}).get("note_tweet_results") or {}).get("result") or {})
+    legacy = tweet.get("legacy") or {}
+    if note.get("text"):
+        text = note["text"]
+        urls = (note.get("entity_set") or {}).get("urls", [])
+    else:
+        text = legacy.get("full_text", "")
+        display_range = legacy.get("display_text_range")
+        if display_range and len(display_range) == 2:
+            # display_text_range counts code points and hides the trailing media link
+            text = text[display_range[0]:display_range[1]]
+        urls = (legacy.get("entities") or {}).get("urls", [])
+    for url in urls:
+        if url.get("url") and url.get("expanded_url"):
+            text = text.replace(url["url"], url["expanded_url"])
+    return html.unescape(text)
+
+
+def _tweet_media(tweet):
+    legacy = tweet.get("legacy") or {}
+    media_items = (legacy.get("extended_entities") or legacy.get("entities") or {}).get("media", [])
+    media = []
+    for item in media_items:
+        variants = [v for v in (item.get("video_info") or {}).get("variants", []) if v.get("content_type") == "video/mp4"]
+        if variants:
+            best = max(variants, key=lambda v: v.get("bitrate", 0))
+            media.append(best["url"])
+        elif item.get("media_url_https"):
+            media.append(item["media_url_https"])
+    return media
+
+
+def _tweet_poll(tweet):
+    card = (tweet.get("card") or {}).get("legacy") or {}
+    if not card.get("name", "").startswith("poll"):
+        return None
+    values = {b.get("key"): (b.get("value") or {}).get("string_value") for b in card.get("binding_values", [])}
+    options = []
+    for i in range(1, 5):
+        label = values.get(f"choice{i}_label")
+        if label is not None:
+            options.append(label)
+    return {"options": options} if options else None
+
+
+def parse_tweet(result, depth=0):
+    """Convert a GraphQL tweet result into the posts schema (see playwright_posts_scraper.py)"""
+    tweet = _unwrap_tweet(result)
+    if tweet is None:
+        return None
+    legacy = tweet.get("legacy") or {}
+    # A plain retweet renders as the original tweet in the DOM; keep that behaviour
+    retweeted = (legacy.get("retweeted_status_result") or {}).get("result")
+    if retweeted and depth < MAX_EMBED_DEPTH:
+        original = parse_tweet(retweeted, depth + 1)
+        if original:
+            return original
+    tweet_id = tweet.get("rest_id") or legacy.get("id_str")
+    author, username = _user_fields(tweet)
+    permalink = f"https://x.com/{username}/status/{tweet_id}" if username and tweet_id else None
+    retweet = None
+    quoted = (tweet.get("quoted_status_result") or {}).get("result")
+    if quoted and depth < MAX_EMBED_DEPTH:
+        retweet = parse_tweet(quoted, depth + 1)
+    replying_to = None
+    if legacy.get("in_reply_to_status_id_str") and legacy.get("in_reply_to_screen_name"):
+        replying_to = f"Replying to @{legacy['in_reply_to_screen_name']}"
+    post = {
+        "id": tweet_id,
+        "parent_id": legacy.get("in_reply_to_status_id_str"),
+        "author": author,
+        "username": username,
+        "text": _tweet_text(tweet),
+        "permalink": permalink,
+        "date": _iso_date(legacy.get("created_at")),
+        "media": _tweet_media(tweet),
+        "retweet": retweet,
+        "reply_chain": [],
+        "replying_to": replying_to,
+        "poll": _tweet_poll(tweet),
+        "likes": _to_int(legacy.get("favorite_count")),
+        "retweets": _to_int(legacy.get("retweet_count")),
+        "replies": _to_int(legacy.get("reply_count")),
+        "quotes": _to_int(legacy.get("quote_count")),
+        "views": _to_int((tweet.get("views") or {}).get("count")),
+    }
+    return omit_nulls(post)
+
+
+def _unavailable(entry_id):
+    tweet_id = entry_id.rsplit("-", 1)[-1] if entry_id else None
+    return {"id": tweet_id if tweet_id and tweet_id.isdigit() else None, "status": "unavailable"}
+
+
+def _item_tweet(item_content, entry_id):
+    if not item_content or item_content.get("itemType") != "TimelineTweet":
+        return None
+    result = (item_content.get("tweet_results") or {}).get("result")
+    post = parse_tweet(result)
+    if post is None and result is not None:
+        return omit_nulls(_unavailable(entry_id))
+    return post
+
+
+def _attach_reply_chains(module_posts):
+    """Fill reply_chain for conversation-module items from their in-module ancestors"""
+    by_id = {p["id"]: p for p in module_posts if p.get("id")}
+    for post in module_posts:
+        chain = []
+        parent_id = post.get("parent_id")
+        seen = {post.get("id")}
+        while parent_id in by_id and parent_id not in seen:
+            seen.add(parent_id)
+            parent = by_id[parent_id]
+            chain.insert(0, {k: v for k, v in parent.items() if k != "reply_chain"})
+            parent_id = parent.get("parent_id")
+        if chain:
+            post["reply_chain"] = chain
+
+
+def _entry_posts(entry):
+    content = entry.get("content") or {}
+    entry_id = entry.get("entryId", "")
+    entry_type = content.get("entryType") or content.get("__typename")
+    if entry_type == "TimelineTimelineItem":
+        post = _item_tweet(content.get("itemContent"), entry_id)
+        return [post] if post else []
+    if entry_type == "TimelineTimelineModule":
+        posts = []
+        for module_item in content.get("items", []):
+            item = module_item.get("item") or {}
+            post = _item_tweet(item.get("itemContent"), module_item.get("entryId", ""))
+            if post:
+                posts.append(post)
+        _attach_reply_chains(posts)
+        return posts
+    return []
+
+
+def parse_timeline_response(payload):
+    """Decode a timeline GraphQL response body into a list of posts in timeline order"""
+    instructions = _find_instructions(payload.get("data", payload)) or []
+    posts = []
+    for instruction in instructions:
+        kind = instruction.get("type")
+        if kind == "TimelineAddEntries":
+            for entry in instruction.get("entries", []):
+                posts.extend(_entry_posts(entry))
+        elif kind == "TimelinePinEntry":
+            for post in _entry_posts(instruction.get("entry") or {}):
+                post["pinned"] = True
+                posts.append(post)
+        elif kind == "TimelineReplaceEntry":
+            if instruction.get("entry"):
+                posts.extend(_entry_posts(instruction["entry"]))
+        elif kind == "TimelineAddToModule":
+            for module_item in instruction.get("moduleItems", []):
+                item = module_item.get("item") or {}
+                post = _item_tweet(item.get("itemContent"), module_item.get("entryId", ""))
+                if post:
+                    posts.append(post)
+    return posts
+
+
+class TimelineInterceptor:
+    """Collects posts from the timeline API responses of a Playwright page"""
+
+    def __init__(self, page_type, operations=None, on_posts=None):
+        self.page_type = page_type
+        self.operations = tuple(operations or TIMELINE_OPERATIONS[page_type])
+        # With on_posts set, new posts are handed off per response and only their IDs are kept
+        self.on_posts = on_posts
+        self.seen_ids = set()
+        self.posts = {}
+        self.responses_seen = 0
+        self.errors = []
+        self._pending = set()
+
+    def matches(self, url):
+        """True if the URL is one of the GraphQL timeline calls for this page type"""
+        path = urlparse(url).path
+        return "/graphql/" in path and path.rsplit("/", 1)[-1] in self.operations
+
+    def attach(self, page):
+        page.on("response", self._on_response)
+
+    def detach(self, page):
+        page.remove_listener("response", self._on_response)
+
+    def _on_response(self, response):
+        if not self.matches(response.url):
+            return
+        task = asyncio.ensure_future(self._consume(response))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _consume(self, response):
+        try:
+            payload = await response.json()
+        except Exception as e:
+            self.errors.append({"url": response.url, "error": str(e)})
+            return
+        self.ingest(payload)
+
+    def ingest(self, payload):
+        """Add the posts of one response body; returns how many were new"""
+        self.responses_seen += 1
+        new_posts = []
+        for post in parse_timeline_response(payload):
+            key = post.get("id") or post.get("permalink")
+            if key and key not in self.seen_ids:
+                self.seen_ids.add(key)
+                new_posts.append(post)
+        if self.on_posts:
+            if new_posts:
+                self.on_posts(new_posts)
+        else:
+            for post in new_posts:
+                self.posts[post.get("id") or post.get("permalink")] = post
+        return len(new_posts)
+
+    async def drain(self):
+        """Wait for response bodies that are still being decoded"""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    def results(self, username):
+        """Return collected posts in the same shape as the extraction scripts"""
+        posts = list(self.posts.values())
+        return {
+            "username": username,
+            "pageType": self.page_type,
+            "dateStr": datetime.now().strftime("%Y-%m-%d"),
+            "posts": posts,
+            "totalPosts": len(self.seen_ids),
+            "streamedPosts": len(self.seen_ids) - len(posts),
+            "source": "interception",
+            "responsesSeen": self.responses_seen,
+            "warnings": [{"message": "Could not decode timeline response", **e} for e in self.errors],
+        }
@@ -1,3 +1,31 @@
-from e2b_sandbox.browser_scrapers.base_browser_config import browser_settings
+"""
+Home timeline page type for the shared scraping engine.
 
-# TODO: Implement timeline scraping logic using browser-use and browser_settings 
\ No newline at end of file
+Scrapes the logged-in account's "For you" timeline with the posts extraction
+script; the target handle only names the output file.
+"""
+import asyncio
+
+from e2b_sandbox.browser_scrapers.playwright_posts_scraper import EXTRACTION_SCRIPT
+from e2b_sandbox.browser_scrapers.scraper_engine import PageStrategy, PlaywrightScraper, run_scraper
+
+
+class TimelineStrategy(PageStrategy):
+    page_type = "timeline"
+    extraction_script = EXTRACTION_SCRIPT
+    timeline_operations = ("HomeTimeline", "HomeLatestTimeline")
+
+    def build_url(self, handle, base_url="https://x.com"):
+        return f"{base_url}/home"
+
+
+class PlaywrightTimelineScraper(PlaywrightScraper):
+    """Scrapes the logged-in account's home timeline"""
+    strategy = TimelineStrategy()
+
+
+async def main():
+    await run_scraper(PlaywrightTimelineScraper())
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,244 @@
+"""
+Per-phase tracing and metrics for scraper runs.
+
+Tracer records spans (setup_browser, login, navigate, extraction, each
+scroll round, save), counters (posts found, scroll rounds, retries,
+injection method used) and histograms, so a slow run can be attributed to
+login, waiting, extraction or I/O instead of guessed from print output.
+
+Exports:
+- a JSON-lines trace file, one record per span/counter (Tracer.trace_path)
+- Prometheus text format from a MetricsRegistry, served over HTTP with
+  serve_metrics() or written to a file for the node_exporter textfile collector
+
+Every scraper CLI (run_scraper in scraper_engine.py) and the orchestrator
+take --metrics-port to serve /metrics while running and --metrics-textfile to
+write the metrics once done:
+
+    python -m e2b_sandbox.browser_scrapers.playwright_likes_scraper --metrics-textfile /var/lib/node_exporter/x.prom
+
+Scroll rounds run inside the page; their durations come back with the script
+result (pacing.roundMs) and are recorded after the fact with record_spans().
+"""
+import contextvars
+import json
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+METRIC_PREFIX = "parrotfish_"
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+_current_span = contextvars.ContextVar("parrotfish_current_span", default=None)
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key, extra=None):
+    pairs = list(key) + list(extra or [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class MetricsRegistry:
+    """Process-wide counters and histograms, rendered in Prometheus text format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        with self._lock:
+            self.counters[(name, _label_key(labels))] += value
+
+    def observe(self, name, value, **labels):
+        with self._lock:
+            key = (name, _label_key(labels))
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(value)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for name in sorted({name for name, _ in self.counters}):
+                lines.append(f"# TYPE {METRIC_PREFIX}{name} counter")
+                for (metric, key), value in sorted(self.counters.items()):
+                    if metric == name:
+                        lines.append(f"{METRIC_PREFIX}{name}{_format_labels(key)} {value:g}")
+            for name in sorted({name for name, _ in self.histograms}):
+                lines.append(f"# TYPE {METRIC_PREFIX}{name} histogram")
+                for (metric, key), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+                    if metric != name:
+                        continue
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f"{METRIC_PREFIX}{name}_bucket{_format_labels(key, [('le', f'{bound:g}')])} {count}")
+                    lines.append(f"{METRIC_PREFIX}{name}_bucket{_format_labels(key, [('le', '+Inf')])} {histogram.count}")
+                    lines.append(f"{METRIC_PREFIX}{name}_sum{_format_labels(key)} {histogram.sum:g}")
+                    lines.append(f"{METRIC_PREFIX}{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Atomically write the metrics for node_exporter's textfile collector"""
+        path = Path(path)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(self.render(), encoding="utf-8")
+        tmp_path.replace(path)
+
+
+REGISTRY = MetricsRegistry()
+
+
+class Span:
+    def __init__(self, name, trace_id, parent_id=None, attributes=None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.status = "ok"
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self.duration = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def end(self, duration=None):
+        self.duration = time.perf_counter() - self._start if duration is None else duration
+
+    def to_record(self):
+        return {
+            "type": "span",
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start_time,
+            "duration_ms": round(self.duration * 1000, 2),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class Tracer:
+    """Spans and metrics for one scraper run"""
+
+    def __init__(self, trace_path=None, registry=REGISTRY, labels=None, **attributes):
+        self.trace_id = uuid.uuid4().hex
+        self.trace_path = Path(trace_path) if trace_path else None
+        self.registry = registry
+        # Metric labels stay low-cardinality (page type); per-run details go to span attributes
+        self.labels = dict(labels or {})
+        self.attributes = attributes
+        self.spans = []
+
+    def _write(self, records):
+        if not self.trace_path:
+            return
+        self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.trace_path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+
+    def _finish(self, spans):
+        for span in spans:
+            self.spans.append(span)
+            self.registry.observe("span_duration_seconds", span.duration, span=span.name, **self.labels)
+        self._write([{**span.to_record(), "run": self.attributes} for span in spans])
+
+    @contextmanager
+    def span(self, name, **attributes):
+        parent = _current_span.get()
+        span = Span(name, self.trace_id, parent.span_id if parent else None, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.set(error=str(e) or type(e).__name__)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+            self._finish([span])
+
+    def record_spans(self, name, durations, **attributes):
+        """Record spans timed elsewhere (e.g. in-page scroll rounds) under the current span"""
+        parent = _current_span.get()
+        spans = []
+        for index, duration in enumerate(durations):
+            span = Span(name, self.trace_id, parent.span_id if parent else None, {"index": index, **attributes})
+            span.end(duration)
+            spans.append(span)
+        if spans:
+            self._finish(spans)
+
+    def count(self, name, value=1, **labels):
+        self.registry.inc(f"{name}_total", value, **self.labels, **labels)
+        self._write([{"type": "counter", "trace_id": self.trace_id, "name": name, "value": value,
+                      "labels": labels, "run": self.attributes}])
+
+    def observe(self, name, value, **labels):
+        self.registry.observe(name, value, **self.labels, **labels)
+
+    def phase_totals(self, names=("setup_browser", "login", "navigate", "extraction", "save")):
+        """Seconds spent per top-level phase, for run summaries"""
+        totals = {}
+        for span in self.spans:
+            if span.name in names:
+                totals[span.name] = round(totals.get(span.name, 0) + span.duration, 2)
+        return totals
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve_metrics(port=9464, host="127.0.0.1", registry=REGISTRY):
+    """Serve /metrics in Prometheus text format from a background thread; returns the server"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"📈 Metrics at http://{host}:{server.server_address[1]}/metrics")
+    return server
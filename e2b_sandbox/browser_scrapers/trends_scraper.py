@@ -1,3 +1,58 @@
-from e2b_sandbox.browser_scrapers.base_browser_config import browser_settings
+"""
+Trending topics page type for the shared scraping engine.
 
-# TODO: Implement trends scraping logic using browser-use and browser_settings 
\ No newline at end of file
+Each extracted item is a trend rather than a post:
+
+| Field      | Type        | Description                               |
+|------------|-------------|-------------------------------------------|
+| rank       | integer     | Position in the trending list             |
+| name       | string      | Trend name or hashtag                     |
+| context    | string/null | Category line, e.g. "2 · Trending in US"  |
+| post_count | string/null | Post count as displayed, e.g. "12.3K posts" |
+"""
+import asyncio
+
+from e2b_sandbox.browser_scrapers.scraper_engine import PageStrategy, PlaywrightScraper, run_scraper
+
+EXTRACTION_SCRIPT = """
+async (options = {}) => {
+  const trends = [];
+  document.querySelectorAll('div[data-testid="trend"]').forEach((cell, i) => {
+    const lines = cell.innerText.split('\\n').map(l => l.trim()).filter(Boolean);
+    const context = lines.find(l => /trending|·/i.test(l)) || null;
+    const postCount = lines.find(l => /posts?$/i.test(l)) || null;
+    const name = lines.find(l => l !== context && l !== postCount && !/^\\d+$/.test(l)) || null;
+    const rankMatch = context && context.match(/^(\\d+)/);
+    if (name) {
+      trends.push({ rank: rankMatch ? Number(rankMatch[1]) : i + 1, name, context, post_count: postCount });
+    }
+  });
+  return {
+    pageType: options.pageType || 'trends',
+    dateStr: new Date().toISOString().split('T')[0],
+    posts: trends,
+    totalPosts: trends.length
+  };
+}
+"""
+
+
+class TrendsStrategy(PageStrategy):
+    page_type = "trends"
+    ready_selector = 'div[data-testid="trend"]'
+    extraction_script = EXTRACTION_SCRIPT
+
+    def build_url(self, handle, base_url="https://x.com"):
+        return f"{base_url}/explore/tabs/trending"
+
+
+class PlaywrightTrendsScraper(PlaywrightScraper):
+    """Scrapes the trending topics list"""
+    strategy = TrendsStrategy()
+
+
+async def main():
+    await run_scraper(PlaywrightTrendsScraper())
+
+if __name__ == "__main__":
+    asyncio.run(main())
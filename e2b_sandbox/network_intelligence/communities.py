@@ -0,0 +1,305 @@
+"""
+Community detection over the user interaction graph.
+
+Two methods, both running on flat edge arrays (interactions.py, made
+undirected) with every step vectorized:
+
+- louvain            modularity optimization. The local-moving phase is
+                     synchronous: every node computes its best neighboring
+                     community at once (segment sums over edges grouped by
+                     node and neighbor community), then a random half of the
+                     nodes that would gain moves. That avoids a Python loop
+                     per node and the ping-pong of fully synchronous moves.
+                     Communities are then collapsed into nodes and the
+                     process repeats until modularity stops improving.
+- label_propagation  each node takes the label with the most edge weight
+                     among its neighbors, again for a random half per round
+
+After the first round only nodes next to a move are re-scored, and a phase
+stops once fewer than `tol` of the nodes would still change community.
+
+Re-runs are incremental: the previous partition (communities.json, by
+handle) is the starting assignment, so a daily refresh only moves the users
+whose neighborhoods changed. Community ids are kept stable across runs by
+matching each new community to the previous one it overlaps most, and are
+written back to the PostStore users table (PostStore.set_communities), so
+queries can filter by community.
+
+Usage:
+    python -m e2b_sandbox.network_intelligence.communities --graph extracted_data/graph --db extracted_data/posts.db
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from e2b_sandbox.network_intelligence.interactions import InteractionGraph
+from e2b_sandbox.network_intelligence.knowledge_graph import KnowledgeGraph
+
+DEFAULT_PARTITION_PATH = "extracted_data/communities.json"
+MIN_GAIN = 1e-12
+# Share of improving nodes that move each round; moving all at once makes neighbors swap back and forth
+MOVE_PROBABILITY = 0.5
+
+
+def modularity(src, dst, weight, labels, resolution=1.0):
+    """Modularity of labels on a symmetric edge list (both directions present)"""
+    m2 = weight.sum()
+    if m2 == 0:
+        return 0.0
+    degree = np.bincount(src, weights=weight, minlength=len(labels))
+    n_labels = labels.max() + 1
+    internal = np.bincount(labels[src], weights=weight * (labels[src] == labels[dst]), minlength=n_labels)
+    totals = np.bincount(labels, weights=degree, minlength=n_labels)
+    return float(internal.sum() / m2 - resolution * np.square(totals / m2).sum())
+
+
+def _dense(labels):
+    return np.unique(labels, return_inverse=True)[1]
+
+
+def _neighbor_label_weights(src, dst, weight, labels, n):
+    """(node, neighbor label, summed weight) for every distinct pair, sorted by node; no self loops expected"""
+    keys = src * n + labels[dst]
+    order = np.argsort(keys)
+    keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    keys = keys[starts]
+    return keys // n, keys % n, np.add.reduceat(weight[order], starts)
+
+
+def _best_per_node(nodes, candidates, scores):
+    """Highest-scoring candidate per node (nodes sorted); ties go to the smallest label. A segment max, no sort"""
+    if not len(nodes):
+        return nodes, candidates, scores
+    boundary = np.r_[True, nodes[1:] != nodes[:-1]]
+    segment = np.cumsum(boundary) - 1
+    hits = np.flatnonzero(scores == np.maximum.reduceat(scores, np.flatnonzero(boundary))[segment])
+    best = hits[np.r_[True, segment[hits][1:] != segment[hits][:-1]]]
+    return nodes[best], candidates[best], scores[best]
+
+
+class CommunityDetector:
+    """Louvain-style modularity optimization and label propagation, seeded from a previous partition"""
+
+    def __init__(self, method="louvain", resolution=1.0, seed=0, max_rounds=50, tol=1e-4,
+                 partition_path=DEFAULT_PARTITION_PATH):
+        if method not in ("louvain", "label_propagation"):
+            raise ValueError(f"Unknown community detection method: {method}")
+        self.method = method
+        self.resolution = resolution
+        self.rng = np.random.default_rng(seed)
+        self.max_rounds = max_rounds
+        # Stop once fewer than this share of the nodes change community in a round
+        self.tol = tol
+        self.partition_path = Path(partition_path) if partition_path else None
+        self.partition = {}
+        if self.partition_path and self.partition_path.exists():
+            self.partition = json.loads(self.partition_path.read_text(encoding="utf-8"))["communities"]
+        self.stats = {}
+
+    # --- seeding -------------------------------------------------------------
+
+    def _initial_labels(self, interactions):
+        """Previous communities by handle; users seen for the first time start alone"""
+        n = len(interactions)
+        labels = np.arange(n)
+        if self.partition:
+            previous = np.array([self.partition.get(interactions.handle(i), -1) for i in range(n)])
+            known = previous >= 0
+            # Offset past the fresh singleton labels so the two ranges never collide
+            labels[known] = previous[known] + n
+        return _dense(labels)
+
+    # --- louvain -------------------------------------------------------------
+
+    def _local_moving(self, src, dst, weight, labels, m2):
+        """Synchronous moving rounds until fewer than tol of the nodes move; returns (labels, rounds)"""
+        n = len(labels)
+        degree = np.bincount(src, weights=weight, minlength=n)
+        totals = np.bincount(labels, weights=degree, minlength=n)
+        # Self loops (collapsed communities) count in the degree but never pull a node anywhere
+        keep = src != dst
+        src, dst, weight = src[keep], dst[keep], weight[keep]
+        active = None
+        rounds = 0
+        for rounds in range(1, self.max_rounds + 1):
+            # Only nodes next to last round's moves can have a better community now
+            if active is None:
+                nodes, candidates, w_to = _neighbor_label_weights(src, dst, weight, labels, n)
+            else:
+                edges = active[src]
+                nodes, candidates, w_to = _neighbor_label_weights(src[edges], dst[edges], weight[edges], labels, n)
+            own = candidates == labels[nodes]
+            # Community totals as seen by the node, i.e. without the node itself in its own community
+            seen_totals = totals[candidates] - np.where(own, degree[nodes], 0)
+            scores = w_to - self.resolution * degree[nodes] * seen_totals / m2
+            stay = -self.resolution * degree * (totals[labels] - degree) / m2
+            stay[nodes[own]] = scores[own]
+            best_nodes, best_labels, best_scores = _best_per_node(nodes, candidates, scores)
+            improving = (best_labels != labels[best_nodes]) & (best_scores > stay[best_nodes] + MIN_GAIN)
+            # Two singletons joining each other would just trade places; only the higher label moves
+            sizes = np.bincount(labels, minlength=n)
+            swap = (sizes[labels[best_nodes]] == 1) & (sizes[best_labels] == 1) & (best_labels > labels[best_nodes])
+            improving &= ~swap
+            movers = improving & (self.rng.random(len(improving)) < MOVE_PROBABILITY)
+            if improving.sum() <= self.tol * n:
+                break
+            moved = best_nodes[movers]
+            labels = labels.copy()
+            labels[moved] = best_labels[movers]
+            totals = np.bincount(labels, weights=degree, minlength=n)
+            active = np.zeros(n, dtype=bool)
+            active[moved] = True
+            active[dst[active[src]]] = True
+            # Improving nodes that sat this round out try again
+            active[best_nodes[improving]] = True
+        return labels, rounds
+
+    def louvain(self, src, dst, weight, labels):
+        """Multi-level Louvain; returns labels for the original nodes"""
+        m2 = weight.sum()
+        assignment = np.arange(len(labels))
+        # The first level starts from the seed partition and is always kept
+        best_q = -np.inf
+        total_rounds = 0
+        for level in range(1, 32):
+            moved, rounds = self._local_moving(src, dst, weight, labels, m2)
+            total_rounds += rounds
+            moved = _dense(moved)
+            q = modularity(src, dst, weight, moved, self.resolution)
+            if q < best_q - MIN_GAIN:
+                break
+            assignment = moved[assignment]
+            best_q = q
+            if moved.max() + 1 == len(labels):
+                break
+            # Collapse communities into nodes; intra-community weight becomes self loops
+            n = moved.max() + 1
+            keys, inverse = np.unique(moved[src] * n + moved[dst], return_inverse=True)
+            src, dst, weight = keys // n, keys % n, np.bincount(inverse, weights=weight)
+            labels = np.arange(n)
+        self.stats.update(levels=level, rounds=total_rounds)
+        return assignment
+
+    # --- label propagation ---------------------------------------------------
+
+    def label_propagation(self, src, dst, weight, labels):
+        """Weighted majority-label rounds, same pruning and stopping rule as the Louvain moving phase"""
+        n = len(labels)
+        keep = src != dst
+        src, dst, weight = src[keep], dst[keep], weight[keep]
+        active = None
+        rounds = 0
+        for rounds in range(1, self.max_rounds + 1):
+            if active is None:
+                nodes, candidates, w_to = _neighbor_label_weights(src, dst, weight, labels, n)
+            else:
+                edges = active[src]
+                nodes, candidates, w_to = _neighbor_label_weights(src[edges], dst[edges], weight[edges], labels, n)
+            # Random tie-breaking; always taking the smallest label freezes early plateaus
+            w_to = w_to + self.rng.random(len(w_to)) * 1e-9
+            best_nodes, best_labels, best_scores = _best_per_node(nodes, candidates, w_to)
+            own = np.zeros(n)
+            own_pairs = candidates == labels[nodes]
+            own[nodes[own_pairs]] = w_to[own_pairs]
+            improving = (best_labels != labels[best_nodes]) & (best_scores > own[best_nodes])
+            movers = improving & (self.rng.random(len(improving)) < MOVE_PROBABILITY)
+            if improving.sum() <= self.tol * n:
+                break
+            moved = best_nodes[movers]
+            labels = labels.copy()
+            labels[moved] = best_labels[movers]
+            active = np.zeros(n, dtype=bool)
+            active[moved] = True
+            active[dst[active[src]]] = True
+            # Improving nodes that sat this round out try again
+            active[best_nodes[improving]] = True
+        self.stats.update(rounds=rounds)
+        return _dense(labels)
+
+    # --- driver --------------------------------------------------------------
+
+    def _stable_ids(self, interactions, labels):
+        """Renumber communities so each keeps the id of the previous community it overlaps most"""
+        n_labels = labels.max() + 1 if len(labels) else 0
+        mapping = np.full(n_labels, -1)
+        if self.partition:
+            previous = np.array([self.partition.get(interactions.handle(i), -1) for i in range(len(labels))])
+            known = previous >= 0
+            if known.any():
+                pairs, counts = np.unique(np.stack([labels[known], previous[known]]), axis=1, return_counts=True)
+                taken = set()
+                for index in np.argsort(-counts, kind="stable"):
+                    label, old = pairs[:, index]
+                    if mapping[label] < 0 and old not in taken:
+                        mapping[label] = old
+                        taken.add(old)
+        next_id = max(self.partition.values(), default=-1) + 1
+        for label in np.flatnonzero(mapping < 0):
+            mapping[label] = next_id
+            next_id += 1
+        return mapping[labels]
+
+    def detect(self, interactions):
+        """Partition the users of an InteractionGraph; returns {handle: community id}"""
+        if not len(interactions):
+            return {}
+        src, dst, weight = interactions.symmetric()
+        labels = self._initial_labels(interactions)
+        if self.method == "louvain":
+            labels = self.louvain(src, dst, weight, labels)
+        else:
+            labels = self.label_propagation(src, dst, weight, labels)
+        labels = self._stable_ids(interactions, _dense(labels))
+        self.stats.update(
+            method=self.method,
+            users=len(interactions),
+            communities=int(len(np.unique(labels))),
+            modularity=round(modularity(src, dst, weight, _dense(labels), self.resolution), 6),
+        )
+        self.partition = {interactions.handle(i): int(label) for i, label in enumerate(labels.tolist())}
+        return self.partition
+
+    def members(self, community_id):
+        return sorted(handle for handle, label in self.partition.items() if label == community_id)
+
+    def sizes(self):
+        sizes = {}
+        for label in self.partition.values():
+            sizes[label] = sizes.get(label, 0) + 1
+        return dict(sorted(sizes.items(), key=lambda item: -item[1]))
+
+    def save(self):
+        self.partition_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.partition_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps({"stats": self.stats, "communities": self.partition}), encoding="utf-8")
+        tmp_path.replace(self.partition_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect communities in the user interaction graph")
+    parser.add_argument("--graph", default="extracted_data/graph", help="Graph snapshot directory")
+    parser.add_argument("--partition", default=DEFAULT_PARTITION_PATH)
+    parser.add_argument("--method", choices=["louvain", "label_propagation"], default="louvain")
+    parser.add_argument("--resolution", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", help="Write community ids to this PostStore's users table")
+    args = parser.parse_args()
+
+    interactions = InteractionGraph.from_knowledge_graph(KnowledgeGraph.load(args.graph))
+    detector = CommunityDetector(args.method, args.resolution, args.seed, partition_path=args.partition)
+    partition = detector.detect(interactions)
+    detector.save()
+    if args.db:
+        from e2b_sandbox.network_intelligence.post_store import PostStore
+        with PostStore(args.db) as store:
+            store.set_communities(partition)
+    print(json.dumps(detector.stats, indent=2))
+    for community_id, size in list(detector.sizes().items())[:10]:
+        print(f"👥 {community_id}: {size} users, e.g. {', '.join('@' + h for h in detector.members(community_id)[:5])}")
+
+
+if __name__ == "__main__":
+    main()
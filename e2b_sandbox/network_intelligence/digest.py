@@ -0,0 +1,316 @@
+"""
+"The most important conversations in your network this week", kept current.
+
+DigestEngine scores every conversation (a ThreadIndex thread) from
+
+- engagement     likes, retweets, replies and quotes of its posts, plus the
+                 number of posts scraped in it
+- influence      summed PageRank of its participants (influence.py), scaled
+                 so an average user counts 1
+- recency        exponential decay with a configurable half-life
+
+Decay is applied in log space: a conversation's rank key is
+log(engagement) + log(influence) + rate * last_activity, and its score at
+time t is key - rate * t. Every key shifts by the same amount as time
+passes, so the order never goes stale and nothing has to be re-scored on a
+timer.
+
+Each digest user has a network (handles they interact with). The engine
+materializes one bounded min-heap of rank keys per (user, window) for
+day/week/month. When a batch of posts arrives only the conversations it
+touched are re-scored, and only the views of users whose network includes a
+participant are updated. A digest is then a filter + sort of at most
+`buffer` entries; a view that dropped entries and now has fewer than k in
+its window is rebuilt from that user's conversations.
+
+Usage:
+    python -m e2b_sandbox.network_intelligence.digest ada grace --db extracted_data/posts.db --graph extracted_data/graph
+"""
+import argparse
+import heapq
+import json
+import math
+import time
+from collections import defaultdict
+
+from e2b_sandbox.browser_scrapers.high_water_marks import post_id
+from e2b_sandbox.browser_scrapers.post_normalization import flatten_post
+from e2b_sandbox.network_intelligence.engagement import count_columns
+from e2b_sandbox.network_intelligence.threads import ThreadIndex
+from e2b_sandbox.network_intelligence.trends import parse_timestamp
+
+WINDOWS = {"day": 86400, "week": 7 * 86400, "month": 30 * 86400}
+ENGAGEMENT_WEIGHTS = {"likes": 1.0, "retweets": 1.5, "quotes": 2.0, "replies": 2.0}
+
+
+def engagement_scores(posts):
+    """Weighted interaction count of each post, as a float array"""
+    columns = count_columns(posts, ENGAGEMENT_WEIGHTS)
+    return sum(weight * columns[field] for field, weight in ENGAGEMENT_WEIGHTS.items()).astype(float)
+
+
+class _Conversation:
+    __slots__ = ("root", "participants", "engagement", "influence", "updated", "key")
+
+    def __init__(self, root, participants, engagement, influence, updated, key):
+        self.root = root
+        self.participants = participants
+        self.engagement = engagement
+        self.influence = influence
+        self.updated = updated
+        self.key = key
+
+
+class DigestEngine:
+    """Per-conversation scores and per-user top-K views, refreshed as posts arrive"""
+
+    def __init__(self, threads=None, influence=None, half_life_hours=48, buffer=50, windows=WINDOWS):
+        self.threads = threads or ThreadIndex()
+        self.decay_rate = math.log(2) / (half_life_hours * 3600)
+        self.buffer = buffer
+        self.windows = windows
+        self.influence = {}
+        self.engagement = {}
+        self.conversations = {}
+        self.by_participant = defaultdict(set)
+        self.networks = {}
+        self.audience = defaultdict(set)
+        self.views = {}
+        self.view_members = defaultdict(set)
+        # Views that dropped entries to stay within buffer, so a short view may be missing some
+        self.truncated = set()
+        if influence:
+            self.set_influence(influence)
+
+    # --- scoring -------------------------------------------------------------
+
+    def _influence_of(self, participants):
+        if not self.influence:
+            return 1.0
+        scale = len(self.influence)
+        return sum(self.influence.get(p, 0.0) for p in participants) * scale
+
+    def _score(self, thread):
+        posts = [self.threads.posts[m] for m in thread.members if m in self.threads.posts]
+        participants = frozenset(p["username"].lower() for p in posts if p.get("username"))
+        engagement = sum(self.engagement.get(m, 0.0) for m in thread.members) + len(posts)
+        influence = self._influence_of(participants)
+        updated = parse_timestamp(thread.updated) or 0.0
+        key = math.log1p(engagement) + math.log1p(influence) + self.decay_rate * updated
+        return _Conversation(thread.root, participants, engagement, influence, updated, key)
+
+    def score(self, root, now=None):
+        """Log-space score of a conversation at time now"""
+        conversation = self.conversations.get(root)
+        if conversation is None:
+            return None
+        return conversation.key - self.decay_rate * (now if now is not None else time.time())
+
+    # --- ingestion -----------------------------------------------------------
+
+    def ingest(self, posts, now=None):
+        """Add posts; returns the roots of the conversations that were re-scored"""
+        now = now if now is not None else time.time()
+        posts = list(posts)
+        self.threads.ingest(posts)
+        records = [record for post in posts for record in flatten_post(post) if post_id(record)]
+        touched = set()
+        for record, value in zip(records, engagement_scores(records).tolist()):
+            tweet_id = post_id(record)
+            # Embedded copies carry no counts; keep what the post's own record had
+            if value or tweet_id not in self.engagement:
+                self.engagement[tweet_id] = value
+            touched.add(tweet_id)
+        threads = {id(thread): thread for thread in (self.threads.threads[t] for t in touched)}
+        for thread in threads.values():
+            self._refresh(thread, now)
+        return [thread.root for thread in threads.values()]
+
+    @classmethod
+    def from_store(cls, store, influence=None, now=None, **kwargs):
+        """Build from a PostStore's columns, without decoding the raw post JSON"""
+        engine = cls(influence=influence, **kwargs)
+        rows = store.conn.execute(
+            "SELECT id, parent_id, username, author, text, date, permalink, likes, retweets, replies, quotes "
+            "FROM posts")
+        engine.ingest([dict(row) for row in rows], now)
+        return engine
+
+    def _refresh(self, thread, now):
+        for member in thread.members:
+            # Conversations that were just merged into this one
+            if member != thread.root and member in self.conversations:
+                self._drop(member)
+        old = self.conversations.get(thread.root)
+        conversation = self._score(thread)
+        if old is not None:
+            for participant in old.participants - conversation.participants:
+                self.by_participant[participant].discard(thread.root)
+        for participant in conversation.participants:
+            self.by_participant[participant].add(thread.root)
+        self.conversations[thread.root] = conversation
+        for user in self._audience_of(conversation.participants):
+            for window in self.windows:
+                self._update_view(user, window, conversation, now)
+
+    def _audience_of(self, participants):
+        users = set()
+        for participant in participants:
+            users |= self.audience.get(participant, set())
+        return users
+
+    def _drop(self, root):
+        conversation = self.conversations.pop(root)
+        for participant in conversation.participants:
+            self.by_participant[participant].discard(root)
+        for user in self._audience_of(conversation.participants):
+            for window in self.windows:
+                self._remove_from_view((user, window), root)
+
+    # --- views ---------------------------------------------------------------
+
+    def _remove_from_view(self, view, root):
+        members = self.view_members.get(view)
+        if members and root in members:
+            members.discard(root)
+            heap = self.views[view]
+            heap[:] = [entry for entry in heap if entry[1] != root]
+            heapq.heapify(heap)
+
+    def _update_view(self, user, window, conversation, now):
+        view = (user, window)
+        self._remove_from_view(view, conversation.root)
+        if conversation.updated < now - self.windows[window]:
+            return
+        heap = self.views.setdefault(view, [])
+        members = self.view_members[view]
+        entry = (conversation.key, conversation.root)
+        if len(heap) < self.buffer:
+            heapq.heappush(heap, entry)
+            members.add(conversation.root)
+        elif entry > heap[0]:
+            members.discard(heapq.heapreplace(heap, entry)[1])
+            members.add(conversation.root)
+            self.truncated.add(view)
+        else:
+            self.truncated.add(view)
+
+    def _rebuild_view(self, user, window, now, size=None):
+        size = max(size or 0, self.buffer)
+        cutoff = now - self.windows[window]
+        roots = set()
+        for handle in self.networks.get(user, ()):
+            roots |= self.by_participant.get(handle, set())
+        entries = ((c.key, c.root) for c in map(self.conversations.get, roots) if c.updated >= cutoff)
+        heap = heapq.nlargest(size + 1, entries)
+        if len(heap) > size:
+            self.truncated.add((user, window))
+            heap = heap[:size]
+        else:
+            self.truncated.discard((user, window))
+        heapq.heapify(heap)
+        self.views[(user, window)] = heap
+        self.view_members[(user, window)] = {root for _, root in heap}
+
+    def set_network(self, user, handles, now=None):
+        """Define whose conversations count for user (user's own are always included)"""
+        user = user.lstrip("@").lower()
+        for handle in self.networks.get(user, ()):
+            self.audience[handle].discard(user)
+        network = {h.lstrip("@").lower() for h in handles} | {user}
+        self.networks[user] = network
+        for handle in network:
+            self.audience[handle].add(user)
+        now = now if now is not None else time.time()
+        for window in self.windows:
+            self._rebuild_view(user, window, now)
+
+    def set_networks_from_interactions(self, interactions, users=None, now=None):
+        """Each user's network is everyone they reply to, quote, like or mention"""
+        targets = defaultdict(set)
+        for src, dst in zip(interactions.src.tolist(), interactions.dst.tolist()):
+            targets[src].add(interactions.handle(dst))
+        for user in users or [interactions.handle(i) for i in range(len(interactions))]:
+            index = interactions.index_of(user)
+            self.set_network(user, targets.get(index, ()), now)
+
+    def set_influence(self, influence, now=None):
+        """Replace participant influence ({handle: pagerank} or an InfluenceEngine) and re-score everything"""
+        scores = getattr(influence, "scores", None)
+        self.influence = dict(scores.get("pagerank", {})) if scores is not None else dict(influence)
+        if not self.conversations:
+            return
+        now = now if now is not None else time.time()
+        for root in list(self.conversations):
+            self.conversations[root] = self._score(self.threads.threads[root])
+        for user in self.networks:
+            for window in self.windows:
+                self._rebuild_view(user, window, now)
+
+    # --- digests -------------------------------------------------------------
+
+    def digest(self, user, window="week", k=5, now=None):
+        """Top-k conversations in user's network active within the window, best first"""
+        user = user.lstrip("@").lower()
+        now = now if now is not None else time.time()
+        cutoff = now - self.windows[window]
+        view = (user, window)
+        entries = [e for e in self.views.get(view, []) if self.conversations[e[1]].updated >= cutoff]
+        if len(entries) < k and view in self.truncated:
+            self._rebuild_view(user, window, now, k)
+            entries = list(self.views[view])
+        results = []
+        for key, root in heapq.nlargest(k, entries):
+            conversation = self.conversations[root]
+            post = self.threads.posts.get(root, {})
+            results.append({
+                "root": root,
+                "score": round(key - self.decay_rate * now, 4),
+                "engagement": conversation.engagement,
+                "influence": round(conversation.influence, 4),
+                "participants": sorted(conversation.participants),
+                "updated": self.threads.threads[root].updated,
+                "author": post.get("username"),
+                "text": post.get("text"),
+            })
+        return results
+
+    def digests(self, users=None, window="week", k=5, now=None):
+        """{user: digest} for the given users (default: every user with a network)"""
+        now = now if now is not None else time.time()
+        return {user: self.digest(user, window, k, now) for user in (users or self.networks)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Top conversations in each user's network")
+    parser.add_argument("users", nargs="+")
+    parser.add_argument("--db", default="extracted_data/posts.db")
+    parser.add_argument("--graph", default="extracted_data/graph", help="Graph snapshot, for the users' networks")
+    parser.add_argument("--influence", default="extracted_data/influence.json")
+    parser.add_argument("--window", choices=sorted(WINDOWS), default="week")
+    parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args()
+
+    from e2b_sandbox.network_intelligence.influence import InfluenceEngine
+    from e2b_sandbox.network_intelligence.interactions import InteractionGraph
+    from e2b_sandbox.network_intelligence.knowledge_graph import KnowledgeGraph
+    from e2b_sandbox.network_intelligence.post_store import PostStore
+
+    with PostStore(args.db) as store:
+        engine = DigestEngine.from_store(store, InfluenceEngine(args.influence))
+    engine.set_networks_from_interactions(InteractionGraph.from_knowledge_graph(KnowledgeGraph.load(args.graph)),
+                                          args.users)
+    started = time.perf_counter()
+    digests = engine.digests(args.users, args.window, args.k)
+    print(f"📰 {len(digests)} digests in {(time.perf_counter() - started) * 1000:.2f} ms "
+          f"over {len(engine.conversations)} conversations")
+    for user, conversations in digests.items():
+        print(f"\n@{user} — top {args.k} this {args.window}:")
+        for rank, c in enumerate(conversations, 1):
+            print(f"  {rank}. @{c['author']}: {(c['text'] or '')[:80]} "
+                  f"({c['engagement']:.0f} engagement, {len(c['participants'])} participants)")
+    print(json.dumps({"conversations": len(engine.conversations), "views": len(engine.views)}))
+
+
+if __name__ == "__main__":
+    main()
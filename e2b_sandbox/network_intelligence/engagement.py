@@ -0,0 +1,100 @@
+"""
+Engagement counts as numbers, parsed in bulk.
+
+The DOM extractors store likes/retweets/replies/views as the button's
+innerText: "1.2K", "3M", "1,234" or "" (X shows nothing for zero), while
+intercepted API posts already carry ints. parse_counts() converts a whole
+column at once with NumPy string operations instead of a regex per value:
+
+    counts, status = parse_counts(["1.2K", "", None, 42, "n/a"])
+    # counts -> [1200, 0, 0, 42, 0]
+    # status -> [PARSED, EMPTY, MISSING, PARSED, FAILED]
+
+normalize_counts() runs that over a batch of posts in place (ints replace
+the strings, "" and unparseable text become None) and reports the failures;
+with keep_raw=True the original strings are kept under "raw_counts".
+count_columns() gives the same columns as int64 arrays for ranking and
+scoring code (digest.py), nullable_counts() as database columns
+(post_store.py).
+"""
+import numpy as np
+
+COUNT_FIELDS = ("likes", "retweets", "replies", "quotes", "views")
+SUFFIXES = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
+
+PARSED, EMPTY, MISSING, FAILED = 0, 1, 2, 3
+
+
+def parse_counts(values):
+    """(int64 counts, int8 status) for a sequence of count strings / numbers / None"""
+    values = list(values)
+    n = len(values)
+    counts = np.zeros(n, dtype=np.int64)
+    status = np.full(n, MISSING, dtype=np.int8)
+    if not n:
+        return counts, status
+    numeric = np.fromiter((isinstance(v, (int, float)) and not isinstance(v, bool) for v in values), dtype=bool,
+                          count=n)
+    textual = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=n)
+    if numeric.any():
+        # NaN counts (missing JSON numbers) stay missing
+        numbers = np.array([values[i] for i in np.flatnonzero(numeric)], dtype=np.float64)
+        finite = np.isfinite(numbers)
+        counts[np.flatnonzero(numeric)[finite]] = np.rint(numbers[finite]).astype(np.int64)
+        status[np.flatnonzero(numeric)[finite]] = PARSED
+    other = ~numeric & ~textual & np.fromiter((v is not None for v in values), dtype=bool, count=n)
+    status[other] = FAILED
+    if not textual.any():
+        return counts, status
+
+    rows = np.flatnonzero(textual)
+    text = np.strings.lower(np.strings.strip(np.array([values[i] for i in rows], dtype=str)))
+    text = np.strings.replace(text, ",", "")
+    empty = np.strings.str_len(text) == 0
+    multiplier = np.ones(len(rows), dtype=np.float64)
+    for suffix, factor in SUFFIXES.items():
+        multiplier[np.strings.endswith(text, suffix)] = factor
+    number = np.strings.strip(np.where(multiplier > 1, np.strings.slice(text, 0, -1), text))
+    # Digits with at most one decimal point
+    valid = np.strings.isdecimal(np.strings.replace(number, ".", "", 1))
+    parsed = np.zeros(len(rows), dtype=np.float64)
+    parsed[valid] = number[valid].astype(np.float64)
+    counts[rows[valid]] = np.rint(parsed[valid] * multiplier[valid]).astype(np.int64)
+    status[rows[valid]] = PARSED
+    status[rows[empty]] = EMPTY
+    status[rows[~valid & ~empty]] = FAILED
+    return counts, status
+
+
+def count_columns(posts, fields=COUNT_FIELDS):
+    """{field: int64 array} for a list of posts; anything that did not parse counts as 0"""
+    return {field: parse_counts([post.get(field) for post in posts])[0] for field in fields}
+
+
+def nullable_counts(posts, fields=COUNT_FIELDS):
+    """({field: [int or None]}, failures) for database columns: None wherever no number was shown or parsed"""
+    columns, failures = {}, 0
+    for field in fields:
+        counts, status = parse_counts([post.get(field) for post in posts])
+        columns[field] = [int(c) if s == PARSED else None for c, s in zip(counts.tolist(), status.tolist())]
+        failures += int((status == FAILED).sum())
+    return columns, failures
+
+
+def normalize_counts(posts, fields=COUNT_FIELDS, keep_raw=False):
+    """Replace count strings with ints in place; returns [(post index, field, raw value)] that failed to parse"""
+    failures = []
+    for field in fields:
+        values = [post.get(field) for post in posts]
+        if not any(isinstance(v, str) for v in values):
+            continue
+        counts, status = parse_counts(values)
+        for i, (post, value) in enumerate(zip(posts, values)):
+            if not isinstance(value, str):
+                continue
+            if keep_raw:
+                post.setdefault("raw_counts", {})[field] = value
+            post[field] = int(counts[i]) if status[i] == PARSED else None
+            if status[i] == FAILED:
+                failures.append((i, field, value))
+    return failures
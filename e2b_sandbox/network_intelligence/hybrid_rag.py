@@ -0,0 +1,202 @@
+"""
+HybridRAG query orchestrator: knowledge graph + vector index, fused.
+
+A query is a handle ("@ada"), a post id ("1790000000000000000") or free
+text. Both retrieval paths run concurrently in worker threads (the NumPy
+work releases the GIL):
+
+- graph   k-hop neighborhood of the handle / post (or of the #topics and
+          @handles named in the text), ranked by hop distance, then by how
+          much interaction (replies, quotes, likes) each post received
+- vector  posts similar to the post, to the text, or to the centroid of
+          the handle's own posts
+
+The ranked lists are fused with reciprocal rank fusion and every result
+says which paths found it and why. Answers are kept in an LRU cache with a
+TTL; ingesting new posts clears it.
+
+Usage:
+    python -m e2b_sandbox.network_intelligence.hybrid_rag @ada --graph extracted_data/graph
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+
+import numpy as np
+from cachetools import TTLCache
+
+from e2b_sandbox.network_intelligence.knowledge_graph import (
+    HASHTAG_RE,
+    MENTION_RE,
+    NODE_TYPE_IDS,
+    KnowledgeGraph,
+    topic_key,
+    tweet_key,
+    user_key,
+)
+from e2b_sandbox.network_intelligence.vector_index import DEFAULT_INDEX_DIR, VectorIndex
+
+RRF_K = 60
+POST_ID_RE = re.compile(r"^\d{5,}$")
+HANDLE_RE = re.compile(r"^@?(\w{1,15})$")
+INTERACTION_EDGES = ("authored", "replies", "quotes", "liked", "mentions", "tagged")
+ENGAGEMENT_EDGES = ("replies", "quotes", "liked")
+
+
+def classify_query(query):
+    """('post', id), ('handle', handle) or ('text', text)"""
+    query = query.strip()
+    if POST_ID_RE.match(query):
+        return "post", query
+    if query.startswith("@") and HANDLE_RE.match(query):
+        return "handle", query.lstrip("@")
+    return "text", query
+
+
+class HybridRAG:
+    """Runs graph expansion and vector search concurrently and fuses the results"""
+
+    def __init__(self, graph, vectors, store=None, hops=2, candidates=200, cache_size=1024, cache_ttl=300):
+        self.graph = graph
+        self.vectors = vectors
+        self.store = store
+        self.hops = hops
+        self.candidates = candidates
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._engagement = None
+
+    def ingest(self, posts, handle=None, page_type=None):
+        """Add posts to the graph and the vector index; cached answers are dropped"""
+        posts = list(posts)
+        self.graph.ingest(posts, handle, page_type)
+        # Merge the new edges now so queries running in worker threads only read
+        self.graph.commit()
+        added = self.vectors.add_posts(posts)
+        self.cache.clear()
+        self._engagement = None
+        return added
+
+    def engagement(self):
+        """Replies + quotes + likes received per node, recomputed after ingestion"""
+        if self._engagement is None:
+            self._engagement = self.graph.degree(ENGAGEMENT_EDGES, direction="in")
+        return self._engagement
+
+    # --- retrieval paths -----------------------------------------------------
+
+    def _seeds(self, kind, value):
+        if kind == "post":
+            return [tweet_key(value)]
+        if kind == "handle":
+            return [user_key(value)]
+        return [topic_key(t) for t in HASHTAG_RE.findall(value)] + [user_key(m) for m in MENTION_RE.findall(value)]
+
+    def graph_candidates(self, kind, value):
+        """[(tweet_id, hops)] near the query in the graph, closest and most engaged first"""
+        seeds = [key for key in self._seeds(kind, value) if self.graph.node_id(key) is not None]
+        if not seeds:
+            return []
+        ids, hops = self.graph.k_hop(seeds, self.hops, INTERACTION_EDGES)
+        tweets = (self.graph.node_types[ids] == NODE_TYPE_IDS["tweet"]) & (hops > 0)
+        ids, hops = ids[tweets], hops[tweets]
+        # Fewer hops first, then more engagement
+        order = np.lexsort((-self.engagement()[ids], hops))[:self.candidates]
+        keys = self.graph.keys(ids[order])
+        return [(key.split(":", 1)[1], int(hop)) for key, hop in zip(keys, hops[order].tolist())]
+
+    def _query_vector(self, kind, value):
+        if kind == "post":
+            return self.vectors.vector(value)
+        if kind == "handle":
+            node = self.graph.node_id(user_key(value))
+            if node is None:
+                return None
+            authored = self.graph.neighbors(node, "authored")
+            rows = [self.vectors.rows[k.split(":", 1)[1]] for k in self.graph.keys(authored)
+                    if k.split(":", 1)[1] in self.vectors.rows]
+            if not rows:
+                return None
+            centroid = self.vectors.matrix[rows].mean(axis=0)
+            norm = np.linalg.norm(centroid)
+            return centroid / norm if norm else None
+        return self.vectors.embedder.embed([value])[0]
+
+    def vector_candidates(self, kind, value):
+        """[(tweet_id, similarity)] semantically close to the query"""
+        vector = self._query_vector(kind, value)
+        if vector is None or not len(self.vectors):
+            return []
+        exclude = {value} if kind == "post" else set()
+        return self.vectors.search(vector, min(self.candidates, len(self.vectors)), exclude=exclude)
+
+    # --- fusion --------------------------------------------------------------
+
+    def fuse(self, graph_hits, vector_hits, k):
+        results = {}
+        for rank, (tweet_id, hops) in enumerate(graph_hits):
+            entry = results.setdefault(tweet_id, {"id": tweet_id, "score": 0.0, "sources": {}})
+            entry["score"] += 1 / (RRF_K + rank + 1)
+            entry["sources"]["graph"] = {"rank": rank + 1, "hops": hops}
+        for rank, (tweet_id, similarity) in enumerate(vector_hits):
+            entry = results.setdefault(tweet_id, {"id": tweet_id, "score": 0.0, "sources": {}})
+            entry["score"] += 1 / (RRF_K + rank + 1)
+            entry["sources"]["vector"] = {"rank": rank + 1, "similarity": round(similarity, 4)}
+        ranked = sorted(results.values(), key=lambda r: (-r["score"], r["id"]))[:k]
+        for result in ranked:
+            reasons = []
+            if "graph" in result["sources"]:
+                hops = result["sources"]["graph"]["hops"]
+                reasons.append(f"{hops} hop{'s' if hops != 1 else ''} away in the interaction graph")
+            if "vector" in result["sources"]:
+                reasons.append(f"similar content ({result['sources']['vector']['similarity']:.2f})")
+            result["why"] = "; ".join(reasons)
+            result["score"] = round(result["score"], 6)
+            if self.store is not None:
+                result["post"] = self.store.get(result["id"])
+        return ranked
+
+    async def query(self, query, k=10):
+        """Fused, explained results for a handle, post id or text; cached until the next ingest"""
+        started = time.perf_counter()
+        kind, value = classify_query(query)
+        key = (kind, value.lower() if kind == "handle" else value, k)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return {**cached, "cached": True, "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)}
+        # Buffered edges must be merged before both paths read the graph from worker threads
+        self.graph.commit()
+        graph_hits, vector_hits = await asyncio.gather(
+            asyncio.to_thread(self.graph_candidates, kind, value),
+            asyncio.to_thread(self.vector_candidates, kind, value),
+        )
+        answer = {
+            "query": query,
+            "kind": kind,
+            "results": self.fuse(graph_hits, vector_hits, k),
+            "candidates": {"graph": len(graph_hits), "vector": len(vector_hits)},
+        }
+        self.cache[key] = answer
+        return {**answer, "cached": False, "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Query the knowledge graph and vector index together")
+    parser.add_argument("query", help="@handle, post id or free text")
+    parser.add_argument("--graph", default="extracted_data/graph", help="Graph snapshot directory")
+    parser.add_argument("--vectors", default=DEFAULT_INDEX_DIR)
+    parser.add_argument("--db", help="PostStore database, to include the posts in the output")
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    store = None
+    if args.db:
+        from e2b_sandbox.network_intelligence.post_store import PostStore
+        store = PostStore(args.db)
+    rag = HybridRAG(KnowledgeGraph.load(args.graph), VectorIndex(args.vectors), store)
+    print(json.dumps(await rag.query(args.query, args.k), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
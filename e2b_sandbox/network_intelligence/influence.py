@@ -0,0 +1,173 @@
+"""
+Influence scoring over the user interaction graph.
+
+InfluenceEngine computes, with sparse power iteration on NumPy arrays
+(segment sums via bincount, no per-node Python loops):
+
+- pagerank            global PageRank, attention flowing along replies,
+                      quotes, likes and mentions (interactions.py)
+- personalized        PageRank restarting at chosen users ("influential
+                      from @ada's point of view")
+- hubs / authorities  HITS
+- weighted_in_degree  total interaction weight received
+- amplification       quote weight received, i.e. how much a user's posts
+                      get re-broadcast
+
+Scores are kept by handle and saved to influence.json. A refresh starts
+the power iterations from the previous scores (new users get the average),
+so a daily refresh with a few new edges converges in a handful of
+iterations instead of a full recompute.
+
+Usage:
+    python -m e2b_sandbox.network_intelligence.influence --graph extracted_data/graph --top 20
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+
+from e2b_sandbox.network_intelligence.interactions import InteractionGraph
+from e2b_sandbox.network_intelligence.knowledge_graph import KnowledgeGraph
+
+DEFAULT_SCORES_PATH = "extracted_data/influence.json"
+METRICS = ("pagerank", "hubs", "authorities", "weighted_in_degree", "amplification")
+
+
+def _normalized(x):
+    total = x.sum()
+    return x / total if total > 0 else np.full(len(x), 1 / len(x))
+
+
+class InfluenceEngine:
+    """PageRank variants, HITS and in-degree scores with warm starts"""
+
+    def __init__(self, scores_path=DEFAULT_SCORES_PATH, damping=0.85, tol=1e-9, max_iter=200):
+        self.scores_path = Path(scores_path) if scores_path else None
+        self.damping = damping
+        self.tol = tol
+        self.max_iter = max_iter
+        self.scores = {}
+        self.iterations = {}
+        if self.scores_path and self.scores_path.exists():
+            self.scores = json.loads(self.scores_path.read_text(encoding="utf-8"))
+
+    def _warm_start(self, interactions, metric):
+        """Previous scores mapped onto the current user indices, or None"""
+        previous = self.scores.get(metric)
+        if not previous:
+            return None
+        x = np.array([previous.get(interactions.handle(i), np.nan) for i in range(len(interactions))])
+        known = ~np.isnan(x)
+        if not known.any():
+            return None
+        x[~known] = x[known].mean()
+        return _normalized(x)
+
+    def pagerank(self, interactions, personalization=None, start=None):
+        """(scores, iterations); personalization is a restart distribution over users"""
+        n = len(interactions)
+        if n == 0:
+            return np.empty(0), 0
+        restart = _normalized(np.asarray(personalization, dtype=np.float64)) if personalization is not None \
+            else np.full(n, 1 / n)
+        out_weight = interactions.out_weight()
+        dangling = out_weight == 0
+        # Probability of following each edge from its source
+        transition = interactions.weight / np.where(dangling, 1, out_weight)[interactions.src]
+        x = start if start is not None else restart.copy()
+        for iteration in range(1, self.max_iter + 1):
+            flow = np.bincount(interactions.dst, weights=x[interactions.src] * transition, minlength=n)
+            new = self.damping * (flow + x[dangling].sum() * restart) + (1 - self.damping) * restart
+            if np.abs(new - x).sum() < self.tol:
+                return new, iteration
+            x = new
+        return x, self.max_iter
+
+    def hits(self, interactions, start=None):
+        """(hubs, authorities, iterations), each normalized to sum to 1"""
+        n = len(interactions)
+        if n == 0:
+            return np.empty(0), np.empty(0), 0
+        hubs = start if start is not None else np.full(n, 1 / n)
+        src, dst, weight = interactions.src, interactions.dst, interactions.weight
+        authorities = hubs
+        for iteration in range(1, self.max_iter + 1):
+            authorities = _normalized(np.bincount(dst, weights=hubs[src] * weight, minlength=n))
+            new_hubs = _normalized(np.bincount(src, weights=authorities[dst] * weight, minlength=n))
+            if np.abs(new_hubs - hubs).sum() < self.tol:
+                return new_hubs, authorities, iteration
+            hubs = new_hubs
+        return hubs, authorities, self.max_iter
+
+    def personalized(self, interactions, handles, k=20):
+        """Top users by PageRank restarting at the given handles, warm-started from the global scores"""
+        restart = np.zeros(len(interactions))
+        for handle in handles:
+            index = interactions.index_of(handle)
+            if index is not None:
+                restart[index] = 1
+        if not restart.any():
+            return []
+        scores, iterations = self.pagerank(interactions, restart, self._warm_start(interactions, "pagerank"))
+        self.iterations["personalized"] = iterations
+        return self._top(interactions, scores, k, exclude=np.flatnonzero(restart))
+
+    def refresh(self, interactions):
+        """Recompute every metric, warm-starting the iterative ones; returns iterations per metric"""
+        pagerank, self.iterations["pagerank"] = self.pagerank(
+            interactions, start=self._warm_start(interactions, "pagerank"))
+        hubs, authorities, self.iterations["hits"] = self.hits(interactions, self._warm_start(interactions, "hubs"))
+        computed = {
+            "pagerank": pagerank,
+            "hubs": hubs,
+            "authorities": authorities,
+            "weighted_in_degree": interactions.in_weight(),
+            "amplification": interactions.kinds.get("quote", np.zeros(len(interactions))),
+        }
+        handles = [interactions.handle(i) for i in range(len(interactions))]
+        self.scores = {metric: dict(zip(handles, values.tolist())) for metric, values in computed.items()}
+        return dict(self.iterations)
+
+    def _top(self, interactions, scores, k, exclude=()):
+        scores = scores.copy()
+        scores[list(exclude)] = -np.inf
+        top = np.argsort(-scores, kind="stable")[:k]
+        return [(interactions.handle(i), float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+    def top(self, metric="pagerank", k=20):
+        ranked = sorted(self.scores.get(metric, {}).items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:k]
+
+    def score(self, handle, metric="pagerank"):
+        return self.scores.get(metric, {}).get(handle.lstrip("@").lower())
+
+    def save(self):
+        self.scores_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.scores_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(self.scores), encoding="utf-8")
+        tmp_path.replace(self.scores_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Influence scores for users in the interaction graph")
+    parser.add_argument("--graph", default="extracted_data/graph", help="Graph snapshot directory")
+    parser.add_argument("--scores", default=DEFAULT_SCORES_PATH)
+    parser.add_argument("--metric", choices=METRICS, default="pagerank")
+    parser.add_argument("--personalize", nargs="+", help="Personalized PageRank from these handles")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    interactions = InteractionGraph.from_knowledge_graph(KnowledgeGraph.load(args.graph))
+    engine = InfluenceEngine(args.scores)
+    iterations = engine.refresh(interactions)
+    engine.save()
+    print(f"📈 {len(interactions)} users, {interactions.num_edges} interactions, iterations: {iterations}")
+    ranked = engine.personalized(interactions, args.personalize, args.top) if args.personalize \
+        else engine.top(args.metric, args.top)
+    for handle, value in ranked:
+        print(f"{value:.6f}  @{handle}")
+
+
+if __name__ == "__main__":
+    main()
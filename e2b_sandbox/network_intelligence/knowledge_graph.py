@@ -0,0 +1,412 @@
+"""
+In-process knowledge graph of users, tweets and topics built from scraper output.
+
+Nodes are interned strings ("user:ada", "tweet:1790...", "topic:zk") mapped
+to dense integer ids; edges are typed and stored as CSR arrays (NumPy) in
+both directions, so neighbor, k-hop and edge-filter queries are array
+slices and masks instead of Python loops or a graph database round trip:
+
+| Edge      | From  | To    | Source                                     |
+|-----------|-------|-------|--------------------------------------------|
+| authored  | user  | tweet | username                                   |
+| replies   | tweet | tweet | parent_id / reply_chain                    |
+| quotes    | tweet | tweet | retweet / quoted_id                        |
+| liked     | user  | tweet | posts scraped from a handle's likes page   |
+| mentions  | tweet | user  | @handles in the text                       |
+| tagged    | tweet | topic | #hashtags in the text                      |
+
+Edges are a set: seeing the same post again adds nothing. New posts are
+buffered and merged into the CSR arrays on the next query (or commit()).
+save() writes the arrays as .npy files that load() memory-maps, so a large
+graph opens without being read into memory.
+
+Usage:
+    python -m e2b_sandbox.network_intelligence.knowledge_graph build extracted_data/*.json --out extracted_data/graph
+    python -m e2b_sandbox.network_intelligence.knowledge_graph query extracted_data/graph user:ada --hops 2
+"""
+import argparse
+import json
+import re
+from array import array
+from pathlib import Path
+
+import numpy as np
+
+from e2b_sandbox.browser_scrapers.high_water_marks import post_id
+from e2b_sandbox.browser_scrapers.post_normalization import flatten_post
+
+NODE_TYPES = ("user", "tweet", "topic")
+EDGE_TYPES = ("authored", "replies", "quotes", "liked", "mentions", "tagged")
+NODE_TYPE_IDS = {name: i for i, name in enumerate(NODE_TYPES)}
+EDGE_TYPE_IDS = {name: i for i, name in enumerate(EDGE_TYPES)}
+
+MENTION_RE = re.compile(r"(?<![\w@])@(\w{1,15})")
+HASHTAG_RE = re.compile(r"(?<![\w#])#(\w+)")
+
+SNAPSHOT_VERSION = 1
+
+
+def user_key(handle):
+    return f"user:{handle.lstrip('@').lower()}"
+
+
+def tweet_key(tweet_id):
+    return f"tweet:{tweet_id}"
+
+
+def topic_key(topic):
+    return f"topic:{topic.lstrip('#').lower()}"
+
+
+class StringInterner:
+    """Dense integer ids for node keys.
+
+    Keys are stored as one UTF-8 blob plus offsets so a snapshot can be
+    memory-mapped; the key -> id dict is only built on the first lookup.
+    """
+
+    def __init__(self, keys=None):
+        self._keys = list(keys or [])
+        self._ids = None
+        self._blob = None
+        self._offsets = None
+
+    def __len__(self):
+        return len(self._offsets) - 1 if self._offsets is not None else len(self._keys)
+
+    def _materialize(self):
+        if self._offsets is not None:
+            blob = bytes(self._blob)
+            self._keys = [blob[start:end].decode("utf-8")
+                          for start, end in zip(self._offsets[:-1].tolist(), self._offsets[1:].tolist())]
+            self._blob = self._offsets = None
+        if self._ids is None:
+            self._ids = {key: i for i, key in enumerate(self._keys)}
+
+    def intern(self, key):
+        if self._ids is None:
+            self._materialize()
+        node = self._ids.get(key)
+        if node is None:
+            node = self._ids[key] = len(self._keys)
+            self._keys.append(key)
+        return node
+
+    def lookup(self, key):
+        if self._ids is None:
+            self._materialize()
+        return self._ids.get(key)
+
+    def key(self, node):
+        if self._offsets is not None:
+            return bytes(self._blob[self._offsets[node]:self._offsets[node + 1]]).decode("utf-8")
+        return self._keys[node]
+
+    def save(self, directory):
+        if self._offsets is not None:
+            blob, offsets = np.asarray(self._blob), np.asarray(self._offsets)
+        else:
+            encoded = [key.encode("utf-8") for key in self._keys]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(e) for e in encoded], out=offsets[1:])
+            blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        np.save(directory / "key_blob.npy", blob)
+        np.save(directory / "key_offsets.npy", offsets)
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r"):
+        interner = cls()
+        interner._blob = np.load(directory / "key_blob.npy", mmap_mode=mmap_mode)
+        interner._offsets = np.load(directory / "key_offsets.npy", mmap_mode=mmap_mode)
+        return interner
+
+
+def _csr(order, rows, n):
+    """indptr for rows[order] grouped by row, rows in 0..n-1"""
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows[order], minlength=n), out=indptr[1:])
+    return indptr
+
+
+def _gather(indptr, nodes):
+    """Positions of every CSR entry of the given rows, vectorized"""
+    starts, ends = indptr[nodes], indptr[nodes + 1]
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(total, dtype=np.int64)
+
+
+class KnowledgeGraph:
+    """Typed multi-relational graph over interned node ids with CSR adjacency"""
+
+    def __init__(self):
+        self.interner = StringInterner()
+        self._node_types = array("B")
+        self.node_types = np.empty(0, dtype=np.uint8)
+        # Forward CSR (src -> dst) and the reverse index into it (dst -> src)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.empty(0, dtype=np.int64)
+        self.edge_types = np.empty(0, dtype=np.uint8)
+        self.rev_indptr = np.zeros(1, dtype=np.int64)
+        self.rev_edges = np.empty(0, dtype=np.int64)
+        self._pending = (array("q"), array("q"), array("B"))
+
+    def __len__(self):
+        return len(self.interner)
+
+    @property
+    def num_edges(self):
+        self.commit()
+        return len(self.indices)
+
+    # --- ingestion -----------------------------------------------------------
+
+    def node(self, key, node_type=None):
+        """Id of key, adding the node if needed"""
+        before = len(self.interner)
+        node = self.interner.intern(key)
+        if node == before:
+            if len(self._node_types) < before:
+                self._node_types = array("B", self.node_types.tolist())
+            self._node_types.append(NODE_TYPE_IDS[node_type or key.split(":", 1)[0]])
+        return node
+
+    def node_id(self, key):
+        return self.interner.lookup(key)
+
+    def add_edge(self, src_key, edge_type, dst_key):
+        src, dst, types = self._pending
+        src.append(self.node(src_key))
+        dst.append(self.node(dst_key))
+        types.append(EDGE_TYPE_IDS[edge_type])
+
+    def ingest(self, posts, handle=None, page_type=None):
+        """Add the nodes and edges of scraped posts (nested or normalized); returns tweets seen"""
+        seen = 0
+        for post in posts:
+            for i, record in enumerate(flatten_post(post)):
+                tweet_id = post_id(record)
+                if not tweet_id:
+                    continue
+                seen += 1
+                tweet = tweet_key(tweet_id)
+                self.node(tweet)
+                if record.get("username"):
+                    self.add_edge(user_key(record["username"]), "authored", tweet)
+                if record.get("parent_id"):
+                    self.add_edge(tweet, "replies", tweet_key(record["parent_id"]))
+                if record.get("quoted_id"):
+                    self.add_edge(tweet, "quotes", tweet_key(record["quoted_id"]))
+                text = record.get("text") or ""
+                for mention in set(MENTION_RE.findall(text)):
+                    self.add_edge(tweet, "mentions", user_key(mention))
+                for tag in set(HASHTAG_RE.findall(text)):
+                    self.add_edge(tweet, "tagged", topic_key(tag))
+                # Only the post listed on the likes page was liked, not what it quotes or replies to
+                if page_type == "likes" and handle and i == 0 and not record.get("embedded"):
+                    self.add_edge(user_key(handle), "liked", tweet)
+        return seen
+
+    def ingest_file(self, path):
+        """Load a save_results JSON file or an NDJSON/JSONL stream or delta file"""
+        path = Path(path)
+        with open(path, encoding="utf-8") as f:
+            if path.suffix in (".ndjson", ".jsonl"):
+                posts = [json.loads(line) for line in f if line.strip()]
+                parts = path.stem.rsplit("_", 2 if path.suffix == ".ndjson" else 1)
+                handle, page_type = parts[0], parts[1] if len(parts) > 1 else None
+            else:
+                data = json.load(f)
+                posts = data.get("posts", [])
+                handle, page_type = data.get("username") or data.get("user"), data.get("pageType")
+        return self.ingest(posts, handle, page_type)
+
+    @classmethod
+    def from_store(cls, store):
+        """Build the graph from a PostStore: posts plus likes observations"""
+        graph = cls()
+        graph.ingest(json.loads(row[0]) for row in store.conn.execute("SELECT raw FROM posts"))
+        for handle, tweet_id in store.conn.execute(
+                "SELECT DISTINCT handle, post_id FROM observations WHERE page_type = 'likes'"):
+            graph.add_edge(user_key(handle), "liked", tweet_key(tweet_id))
+        graph.commit()
+        return graph
+
+    def commit(self):
+        """Merge buffered edges into the CSR arrays (deduplicated); returns edges added"""
+        n = len(self.interner)
+        if len(self._node_types) >= n and len(self.node_types) < n:
+            self.node_types = np.frombuffer(self._node_types, dtype=np.uint8).copy()
+        src_new, dst_new, types_new = self._pending
+        if not len(src_new) and len(self.indptr) == n + 1:
+            return 0
+        old_edges = len(self.indices)
+        old_src = np.repeat(np.arange(len(self.indptr) - 1, dtype=np.int64), np.diff(self.indptr))
+        src = np.concatenate([old_src, np.frombuffer(src_new, dtype=np.int64)])
+        dst = np.concatenate([self.indices, np.frombuffer(dst_new, dtype=np.int64)])
+        types = np.concatenate([self.edge_types, np.frombuffer(types_new, dtype=np.uint8)])
+        self._pending = (array("q"), array("q"), array("B"))
+
+        order = np.lexsort((dst, types, src))
+        src, dst, types = src[order], dst[order], types[order]
+        if len(src):
+            keep = np.ones(len(src), dtype=bool)
+            keep[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1]) | (types[1:] != types[:-1])
+            src, dst, types = src[keep], dst[keep], types[keep]
+        self.indptr = _csr(slice(None), src, n)
+        self.indices = dst
+        self.edge_types = types
+        self.rev_edges = np.argsort(dst, kind="stable")
+        self.rev_indptr = _csr(self.rev_edges, dst, n)
+        return len(self.indices) - old_edges
+
+    # --- queries -------------------------------------------------------------
+
+    def _ids(self, nodes):
+        """Node ids from ids or keys; unknown keys are dropped"""
+        if isinstance(nodes, np.ndarray):
+            return nodes.astype(np.int64, copy=False)
+        if isinstance(nodes, (str, int, np.integer)):
+            nodes = [nodes]
+        ids = [self.interner.lookup(n) if isinstance(n, str) else int(n) for n in nodes]
+        return np.array([i for i in ids if i is not None], dtype=np.int64)
+
+    def _type_mask(self, positions, edge_types):
+        if edge_types is None:
+            return np.ones(len(positions), dtype=bool)
+        if isinstance(edge_types, str):
+            edge_types = [edge_types]
+        wanted = np.array([EDGE_TYPE_IDS[t] for t in edge_types], dtype=np.uint8)
+        return np.isin(self.edge_types[positions], wanted)
+
+    def neighbors(self, nodes, edge_types=None, direction="out"):
+        """Unique neighbor ids of one or more nodes, following out, in or both edge directions"""
+        self.commit()
+        ids = self._ids(nodes)
+        found = []
+        if direction in ("out", "both"):
+            positions = _gather(self.indptr, ids)
+            found.append(self.indices[positions[self._type_mask(positions, edge_types)]])
+        if direction in ("in", "both"):
+            positions = self.rev_edges[_gather(self.rev_indptr, ids)]
+            found.append(self._edge_sources(positions[self._type_mask(positions, edge_types)]))
+        return np.unique(np.concatenate(found)) if found else np.empty(0, dtype=np.int64)
+
+    def _edge_sources(self, positions):
+        """Source node of forward edge positions (binary search in indptr)"""
+        return np.searchsorted(self.indptr, positions, side="right") - 1
+
+    def k_hop(self, nodes, k=2, edge_types=None, direction="both"):
+        """Nodes within k hops as (ids, hop distance) arrays; the start nodes have distance 0"""
+        self.commit()
+        start = np.unique(self._ids(nodes))
+        distance = np.full(len(self.interner), -1, dtype=np.int16)
+        distance[start] = 0
+        frontier = start
+        for hop in range(1, k + 1):
+            if not len(frontier):
+                break
+            reached = self.neighbors(frontier, edge_types, direction)
+            frontier = reached[distance[reached] < 0]
+            distance[frontier] = hop
+        found = np.flatnonzero(distance >= 0)
+        return found, distance[found]
+
+    def edges(self, edge_types=None, src_type=None, dst_type=None):
+        """All edges matching the filters as (src ids, dst ids, edge type ids) arrays"""
+        self.commit()
+        src = np.repeat(np.arange(len(self.indptr) - 1, dtype=np.int64), np.diff(self.indptr))
+        mask = self._type_mask(np.arange(len(self.indices)), edge_types)
+        if src_type:
+            mask &= self.node_types[src] == NODE_TYPE_IDS[src_type]
+        if dst_type:
+            mask &= self.node_types[self.indices] == NODE_TYPE_IDS[dst_type]
+        return src[mask], self.indices[mask], self.edge_types[mask]
+
+    def degree(self, edge_types=None, direction="out"):
+        """Per-node edge counts for the given types"""
+        src, dst, _ = self.edges(edge_types)
+        return np.bincount(src if direction == "out" else dst, minlength=len(self.interner))
+
+    def nodes_of_type(self, node_type):
+        self.commit()
+        return np.flatnonzero(self.node_types == NODE_TYPE_IDS[node_type])
+
+    def keys(self, ids):
+        return [self.interner.key(int(i)) for i in ids]
+
+    # --- snapshots -----------------------------------------------------------
+
+    def save(self, directory):
+        """Write the graph as .npy arrays plus a small metadata file"""
+        self.commit()
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ("node_types", "indptr", "indices", "edge_types", "rev_indptr", "rev_edges"):
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        self.interner.save(directory)
+        meta = {"version": SNAPSHOT_VERSION, "nodes": len(self), "edges": len(self.indices),
+                "node_types": NODE_TYPES, "edge_types": EDGE_TYPES}
+        (directory / "graph.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        return directory
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r"):
+        """Open a snapshot; arrays are memory-mapped unless mmap_mode is None"""
+        directory = Path(directory)
+        meta = json.loads((directory / "graph.json").read_text(encoding="utf-8"))
+        if meta["version"] != SNAPSHOT_VERSION or tuple(meta["edge_types"]) != EDGE_TYPES:
+            raise ValueError(f"Unsupported graph snapshot in {directory}")
+        graph = cls()
+        for name in ("node_types", "indptr", "indices", "edge_types", "rev_indptr", "rev_edges"):
+            setattr(graph, name, np.load(directory / f"{name}.npy", mmap_mode=mmap_mode))
+        graph.interner = StringInterner.load(directory, mmap_mode)
+        graph._node_types = array("B")
+        return graph
+
+    def summary(self):
+        self.commit()
+        return {
+            "nodes": {name: int((self.node_types == i).sum()) for i, name in enumerate(NODE_TYPES)},
+            "edges": {name: int((self.edge_types == i).sum()) for i, name in enumerate(EDGE_TYPES)},
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the knowledge graph")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Build a snapshot from saved results or a PostStore")
+    build_parser.add_argument("files", nargs="*")
+    build_parser.add_argument("--db", help="Read posts from a PostStore database")
+    build_parser.add_argument("--out", default="extracted_data/graph")
+    query_parser = subparsers.add_parser("query", help="k-hop neighborhood of a node")
+    query_parser.add_argument("snapshot")
+    query_parser.add_argument("node", help="Node key, e.g. user:ada or tweet:1790000000000000000")
+    query_parser.add_argument("--hops", type=int, default=1)
+    query_parser.add_argument("--edge-types", nargs="+", choices=EDGE_TYPES)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if args.db:
+            from e2b_sandbox.network_intelligence.post_store import PostStore
+            with PostStore(args.db) as store:
+                graph = KnowledgeGraph.from_store(store)
+        else:
+            graph = KnowledgeGraph()
+            for path in args.files:
+                graph.ingest_file(path)
+        graph.save(args.out)
+        print(f"🕸️  Graph saved to: {args.out}")
+        print(json.dumps(graph.summary(), indent=2))
+    else:
+        graph = KnowledgeGraph.load(args.snapshot)
+        ids, hops = graph.k_hop(args.node, args.hops, args.edge_types)
+        for key, hop in zip(graph.keys(ids), hops.tolist()):
+            print(f"{hop}  {key}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Near-duplicate post detection with MinHash and LSH.
+
+Copy-paste threads, bot replies and reposts with small edits arrive as
+distinct tweet ids. NearDuplicateIndex groups them so embedding,
+classification and graph work can run once per cluster:
+
+1. text is normalized (lowercase, URLs and leading @mentions dropped,
+   whitespace collapsed) and cut into character shingles
+2. MinHash signatures for a whole batch at once: every shingle of every post
+   is hashed with a rolling hash over one code-point array, permuted by
+   num_perm multiply-shift hashes, and reduced per post with minimum.reduceat
+3. LSH: the signature is split into bands; posts sharing any band key are
+   candidates, kept only if their signatures agree on >= threshold of the
+   positions (the estimated Jaccard similarity of their shingles)
+4. a new post joins the cluster of its most similar match, or starts its
+   own; a cluster is named after its earliest post
+
+Clusters are never merged: a post that matches two clusters joins one of
+them, so a dup_cluster_id already written to NDJSON or the post store never
+changes. Each bucket remembers only the first post that landed in it, so a
+new post is compared with at most `bands` earlier posts and lookups stay
+O(1) as the index grows. add() sets post["dup_cluster_id"] on the posts it
+is given; the scraper engine does that for every batch when its PostPipeline
+has dedup= set.
+
+Usage:
+    python -m e2b_sandbox.network_intelligence.near_duplicates extracted_data/*.json
+"""
+import argparse
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+
+from e2b_sandbox.browser_scrapers.high_water_marks import post_id
+from e2b_sandbox.network_intelligence.vector_index import URL_RE
+
+DEFAULT_INDEX_PATH = "extracted_data/near_duplicates.npz"
+LEADING_MENTIONS_RE = re.compile(r"^(?:@\w+\s*)+")
+# Rolling-hash windows handled per chunk, bounding the (windows x num_perm) matrix
+CHUNK_WINDOWS = 65536
+
+
+def normalize_text(text):
+    text = URL_RE.sub(" ", (text or "").lower())
+    return " ".join(LEADING_MENTIONS_RE.sub("", text.strip()).split())
+
+
+class NearDuplicateIndex:
+    """Incremental MinHash/LSH index assigning dup_cluster_id to posts"""
+
+    def __init__(self, num_perm=64, bands=16, threshold=0.8, shingle=5, seed=0, path=DEFAULT_INDEX_PATH):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.threshold = threshold
+        self.shingle = shingle
+        self.path = Path(path) if path else None
+        rng = np.random.default_rng(seed)
+        self.perm_a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self.perm_b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+        self.band_mult = rng.integers(1, 2 ** 63, self.rows_per_band, dtype=np.uint64) | np.uint64(1)
+        self.powers = np.uint64(1_000_003) ** np.arange(shingle - 1, -1, -1, dtype=np.uint64)
+        self.signatures = np.zeros((1024, num_perm), dtype=np.uint32)
+        self.ids = []
+        self.rows = {}
+        # Row of each post's cluster root, fixed when the post is added
+        self.cluster_rows = []
+        self.buckets = [{} for _ in range(bands)]
+        if self.path and self.path.exists():
+            self._load()
+
+    def __len__(self):
+        return len(self.ids)
+
+    # --- signatures ------------------------------------------------------------
+
+    def signatures_for(self, texts):
+        """(len(texts), num_perm) uint32 MinHash signatures of normalized texts"""
+        padded = [t.ljust(self.shingle, "\0") for t in texts]
+        result = np.empty((len(padded), self.num_perm), dtype=np.uint32)
+        start = 0
+        while start < len(padded):
+            # Take posts until the chunk holds CHUNK_WINDOWS shingles (at least one post)
+            end, windows = start, 0
+            while end < len(padded) and (end == start or windows + len(padded[end]) <= CHUNK_WINDOWS):
+                windows += len(padded[end]) - self.shingle + 1
+                end += 1
+            result[start:end] = self._signature_chunk(padded[start:end])
+            start = end
+        return result
+
+    def _signature_chunk(self, texts):
+        codes = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        lengths = np.array([len(t) for t in texts])
+        offsets = np.r_[0, np.cumsum(lengths)[:-1]]
+        # Rolling hash of every window, then keep the windows that start and end inside one post
+        hashes = np.lib.stride_tricks.sliding_window_view(codes, self.shingle) @ self.powers
+        window_counts = lengths - self.shingle + 1
+        keep = np.concatenate([np.arange(o, o + c) for o, c in zip(offsets, window_counts)])
+        shingles = hashes[keep]
+        shingles ^= shingles >> np.uint64(29)
+        # Multiply-shift hashing: the high 32 bits of a*x + b, one (a, b) per permutation
+        # (num_perm, windows) so each post's minimum is taken over contiguous memory
+        permuted = ((self.perm_a[:, None] * shingles + self.perm_b[:, None]) >> np.uint64(32)).astype(np.uint32)
+        starts = np.r_[0, np.cumsum(window_counts)[:-1]]
+        return np.minimum.reduceat(permuted, starts, axis=1).T
+
+    def band_keys(self, signatures):
+        """(n, bands) uint64 keys, one per band of rows_per_band signature positions"""
+        banded = signatures.reshape(len(signatures), self.bands, self.rows_per_band).astype(np.uint64)
+        return (banded * self.band_mult).sum(axis=2, dtype=np.uint64)
+
+    # --- clusters --------------------------------------------------------------
+
+    def _append(self, signatures):
+        needed = len(self.ids) + len(signatures)
+        if needed > len(self.signatures):
+            grown = np.zeros((max(needed, 2 * len(self.signatures)), self.num_perm), dtype=np.uint32)
+            grown[:len(self.ids)] = self.signatures[:len(self.ids)]
+            self.signatures = grown
+        self.signatures[len(self.ids):needed] = signatures
+
+    def add(self, posts):
+        """Index posts and set post["dup_cluster_id"]; returns the cluster ids in order"""
+        posts = list(posts)
+        fresh = {}
+        for post in posts:
+            tweet_id = post_id(post)
+            text = normalize_text(post.get("text"))
+            if tweet_id and text and tweet_id not in self.rows and tweet_id not in fresh:
+                fresh[tweet_id] = text
+        if fresh:
+            signatures = self.signatures_for(list(fresh.values()))
+            keys = self.band_keys(signatures).tolist()
+            first_row = len(self.ids)
+            self._append(signatures)
+            for offset, tweet_id in enumerate(fresh):
+                row = first_row + offset
+                self.ids.append(tweet_id)
+                self.rows[tweet_id] = row
+                candidates = set()
+                for band, key in enumerate(keys[offset]):
+                    earlier = self.buckets[band].setdefault(key, row)
+                    if earlier != row:
+                        candidates.add(earlier)
+                cluster_row = row
+                if candidates:
+                    candidates = np.array(sorted(candidates))
+                    agreement = (self.signatures[candidates] == self.signatures[row]).mean(axis=1)
+                    # Most similar match, the earliest one on ties
+                    best = int(np.argmax(agreement))
+                    if agreement[best] >= self.threshold:
+                        cluster_row = self.cluster_rows[candidates[best]]
+                self.cluster_rows.append(cluster_row)
+        clusters = []
+        for post in posts:
+            cluster = self.cluster_of(post_id(post)) or post_id(post)
+            if cluster:
+                post["dup_cluster_id"] = cluster
+            clusters.append(cluster)
+        return clusters
+
+    def cluster_of(self, tweet_id):
+        row = self.rows.get(str(tweet_id)) if tweet_id else None
+        return None if row is None else self.ids[self.cluster_rows[row]]
+
+    def clusters(self, min_size=2):
+        """{cluster id: [member ids]} for clusters with at least min_size posts"""
+        members = {}
+        for row, tweet_id in enumerate(self.ids):
+            members.setdefault(self.ids[self.cluster_rows[row]], []).append(tweet_id)
+        return {cluster: ids for cluster, ids in members.items() if len(ids) >= min_size}
+
+    def similarity(self, a, b):
+        """Estimated Jaccard similarity of two indexed posts' shingles"""
+        rows = self.rows.get(str(a)), self.rows.get(str(b))
+        if None in rows:
+            return None
+        return float((self.signatures[rows[0]] == self.signatures[rows[1]]).mean())
+
+    # --- persistence -----------------------------------------------------------
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp.npz")
+        meta = {"num_perm": self.num_perm, "bands": self.bands, "shingle": self.shingle}
+        np.savez(tmp_path, signatures=self.signatures[:len(self.ids)], ids=np.array(self.ids, dtype=str),
+                 cluster_rows=np.array(self.cluster_rows, dtype=np.int64), perm_a=self.perm_a, perm_b=self.perm_b,
+                 band_mult=self.band_mult, meta=np.array(json.dumps(meta)))
+        tmp_path.replace(self.path)
+
+    def _load(self):
+        with np.load(self.path) as data:
+            meta = json.loads(str(data["meta"]))
+            if (meta["num_perm"], meta["bands"], meta["shingle"]) != (self.num_perm, self.bands, self.shingle):
+                raise ValueError(f"{self.path} was built with different MinHash settings: {meta}")
+            self.perm_a, self.perm_b, self.band_mult = data["perm_a"], data["perm_b"], data["band_mult"]
+            signatures = data["signatures"]
+            self._append(signatures)
+            self.ids = data["ids"].tolist()
+            self.cluster_rows = data["cluster_rows"].tolist()
+        self.rows = {tweet_id: row for row, tweet_id in enumerate(self.ids)}
+        if not len(signatures):
+            return
+        # Buckets hold the first row per key, which np.unique's first index reproduces
+        for band, keys in enumerate(self.band_keys(signatures).T):
+            unique, first = np.unique(keys, return_index=True)
+            self.buckets[band] = dict(zip(unique.tolist(), first.tolist()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate posts in saved results")
+    parser.add_argument("files", nargs="+", help="Saved JSON / NDJSON results")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    args = parser.parse_args()
+
+    index = NearDuplicateIndex(threshold=args.threshold, path=args.index)
+    for path in args.files:
+        with open(path, encoding="utf-8") as f:
+            if path.endswith((".ndjson", ".jsonl")):
+                posts = [json.loads(line) for line in f if line.strip()]
+            else:
+                posts = json.load(f).get("posts", [])
+        index.add(posts)
+    index.save()
+    clusters = index.clusters()
+    print(f"🧬 {len(index)} posts, {len(clusters)} near-duplicate clusters "
+          f"covering {sum(len(m) for m in clusters.values())} posts")
+    for cluster, members in sorted(clusters.items(), key=lambda item: -len(item[1]))[:10]:
+        print(f"  {cluster}: {len(members)} posts")
+
+
+if __name__ == "__main__":
+    main()
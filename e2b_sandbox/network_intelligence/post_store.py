@@ -0,0 +1,346 @@
+"""
+Indexed SQLite store for scraped posts.
+
+save_results writes one pretty-printed JSON file per (user, pageType, day),
+so every analysis re-parses whole files. PostStore keeps the same posts in
+SQLite instead:
+
+- posts         one row per tweet id, latest text/counts, the raw post JSON
+                and the near-duplicate cluster set by near_duplicates.py
+- users         every author seen, with first/last seen times and the
+                community id assigned by communities.py
+- observations  which page (handle, pageType) showed which post, and when
+
+Writes are batched upserts keyed by tweet id, and the database runs in WAL
+mode with a busy timeout so several scrapers can write at once. Embedded
+posts (quotes, reply_chain ancestors) are stored as posts too, with
+quoted_id/parent_id pointing at them.
+
+Usage:
+    python -m e2b_sandbox.network_intelligence.post_store import extracted_data/*.json
+"""
+import argparse
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+from e2b_sandbox.browser_scrapers.high_water_marks import post_id
+from e2b_sandbox.network_intelligence.engagement import COUNT_FIELDS, nullable_counts
+
+DEFAULT_DB_PATH = "extracted_data/posts.db"
+BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username     TEXT PRIMARY KEY COLLATE NOCASE,
+    display_name TEXT,
+    first_seen   TEXT NOT NULL,
+    last_seen    TEXT NOT NULL,
+    community_id INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS posts (
+    id         TEXT PRIMARY KEY,
+    username   TEXT COLLATE NOCASE,
+    author     TEXT,
+    text       TEXT,
+    date       TEXT,
+    permalink  TEXT,
+    parent_id  TEXT,
+    quoted_id  TEXT,
+    likes      INTEGER,
+    retweets   INTEGER,
+    replies    INTEGER,
+    quotes     INTEGER,
+    views      INTEGER,
+    raw        TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen  TEXT NOT NULL,
+    dup_cluster_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_posts_username_date ON posts (username, date);
+CREATE INDEX IF NOT EXISTS idx_posts_date ON posts (date);
+CREATE INDEX IF NOT EXISTS idx_posts_parent ON posts (parent_id);
+
+CREATE TABLE IF NOT EXISTS observations (
+    post_id     TEXT NOT NULL,
+    handle      TEXT NOT NULL COLLATE NOCASE,
+    page_type   TEXT NOT NULL,
+    observed_at TEXT NOT NULL,
+    position    INTEGER,
+    PRIMARY KEY (post_id, handle, page_type, observed_at)
+);
+CREATE INDEX IF NOT EXISTS idx_observations_page ON observations (handle, page_type, observed_at);
+"""
+
+UPSERT_POST = """
+INSERT INTO posts (id, username, author, text, date, permalink, parent_id, quoted_id,
+                   likes, retweets, replies, quotes, views, raw, first_seen, last_seen, dup_cluster_id)
+VALUES (:id, :username, :author, :text, :date, :permalink, :parent_id, :quoted_id,
+        :likes, :retweets, :replies, :quotes, :views, :raw, :seen, :seen, :dup_cluster_id)
+ON CONFLICT (id) DO UPDATE SET
+    username  = COALESCE(excluded.username, posts.username),
+    author    = COALESCE(excluded.author, posts.author),
+    text      = CASE WHEN excluded.text != '' THEN excluded.text ELSE posts.text END,
+    date      = COALESCE(excluded.date, posts.date),
+    permalink = COALESCE(excluded.permalink, posts.permalink),
+    parent_id = COALESCE(excluded.parent_id, posts.parent_id),
+    quoted_id = COALESCE(excluded.quoted_id, posts.quoted_id),
+    likes     = COALESCE(excluded.likes, posts.likes),
+    retweets  = COALESCE(excluded.retweets, posts.retweets),
+    replies   = COALESCE(excluded.replies, posts.replies),
+    quotes    = COALESCE(excluded.quotes, posts.quotes),
+    views     = COALESCE(excluded.views, posts.views),
+    raw       = excluded.raw,
+    last_seen = MAX(posts.last_seen, excluded.last_seen),
+    dup_cluster_id = COALESCE(excluded.dup_cluster_id, posts.dup_cluster_id)
+"""
+
+UPSERT_USER = """
+INSERT INTO users (username, display_name, first_seen, last_seen) VALUES (?, ?, ?, ?)
+ON CONFLICT (username) DO UPDATE SET
+    display_name = COALESCE(excluded.display_name, users.display_name),
+    last_seen    = MAX(users.last_seen, excluded.last_seen)
+"""
+
+INSERT_OBSERVATION = """
+INSERT OR IGNORE INTO observations (post_id, handle, page_type, observed_at, position) VALUES (?, ?, ?, ?, ?)
+"""
+
+# Columns added after the first release: (table, column, type), added to older databases on open
+MIGRATIONS = (
+    ("users", "community_id", "INTEGER"),
+    ("posts", "dup_cluster_id", "TEXT"),
+)
+
+
+def parse_count(value):
+    """Engagement count as an int: API ints pass through, DOM text like '1,234' or '1.2K' is parsed"""
+    columns, _ = nullable_counts([{"count": value}], ("count",))
+    return columns["count"][0]
+
+
+def _now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _post_row(post, seen, counts):
+    retweet = post.get("retweet")
+    return {
+        "id": post_id(post),
+        "username": post.get("username"),
+        "author": post.get("author"),
+        "text": post.get("text") or "",
+        "date": post.get("date"),
+        "permalink": post.get("permalink"),
+        "parent_id": post.get("parent_id"),
+        "quoted_id": post.get("quoted_id") or (post_id(retweet) if isinstance(retweet, dict) else None),
+        **counts,
+        "dup_cluster_id": post.get("dup_cluster_id"),
+        "raw": json.dumps({k: v for k, v in post.items() if k != "embedded"}, ensure_ascii=False),
+        "seen": seen,
+    }
+
+
+def _embedded_posts(post):
+    """Quotes, reply_chain ancestors and perplexity_context carried inside a post"""
+    for key in ("retweet", "perplexity_context"):
+        if isinstance(post.get(key), dict):
+            yield post[key]
+            yield from _embedded_posts(post[key])
+    for ancestor in post.get("reply_chain") or []:
+        yield ancestor
+        yield from _embedded_posts(ancestor)
+
+
+class PostStore:
+    """SQLite-backed posts/users/observations with batched upserts and a small query API"""
+
+    def __init__(self, path=DEFAULT_DB_PATH, batch_size=BATCH_SIZE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        # Count strings that were neither a number nor empty, since this store was opened
+        self.count_parse_failures = 0
+        self.conn = sqlite3.connect(str(self.path), timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=30000")
+        self.conn.executescript(SCHEMA)
+        for table, column, column_type in MIGRATIONS:
+            columns = {row["name"] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_dup_cluster ON posts (dup_cluster_id)")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def upsert_posts(self, posts, handle=None, page_type=None, observed_at=None):
+        """Upsert posts (and their embedded posts) and record where they were seen; returns rows written"""
+        seen = observed_at or _now()
+        written = 0
+        batch = list(posts)
+        for start in range(0, len(batch), self.batch_size):
+            chunk = batch[start:start + self.batch_size]
+            post_rows, user_rows, observation_rows = {}, {}, []
+            items = []
+            for position, post in enumerate(chunk, start):
+                items.extend([post, *_embedded_posts(post)])
+                # Tweets only referenced by a normalized post were not listed on the page
+                if handle and page_type and post_id(post) and not post.get("embedded"):
+                    observation_rows.append((post_id(post), handle, page_type, seen, position))
+            # Count text ("1.2K") is parsed for the whole chunk at once
+            counts, failures = nullable_counts(items)
+            self.count_parse_failures += failures
+            for i, item in enumerate(items):
+                row = _post_row(item, seen, {field: counts[field][i] for field in COUNT_FIELDS})
+                if not row["id"]:
+                    continue
+                post_rows[row["id"]] = row
+                if row["username"]:
+                    user_rows[row["username"].lower()] = (row["username"], row["author"], seen, seen)
+            with self.conn:
+                self.conn.executemany(UPSERT_POST, list(post_rows.values()))
+                self.conn.executemany(UPSERT_USER, list(user_rows.values()))
+                self.conn.executemany(INSERT_OBSERVATION, observation_rows)
+            written += len(post_rows)
+        return written
+
+    def import_file(self, path):
+        """Load a save_results JSON file or an NDJSON/JSONL stream or delta file"""
+        path = Path(path)
+        with open(path, encoding="utf-8") as f:
+            if path.suffix in (".ndjson", ".jsonl"):
+                posts = [json.loads(line) for line in f if line.strip()]
+                # {handle}_{pageType}_{date}.ndjson streams, {handle}_{pageType}.jsonl deltas
+                parts = path.stem.rsplit("_", 2 if path.suffix == ".ndjson" else 1)
+                handle, page_type = parts[0], parts[1] if len(parts) > 1 else None
+                observed_at = None
+            else:
+                data = json.load(f)
+                posts = data.get("posts", [])
+                handle = data.get("username") or data.get("user")
+                page_type = data.get("pageType")
+                observed_at = data.get("scrape_timestamp")
+        return self.upsert_posts(posts, handle, page_type, observed_at)
+
+    @staticmethod
+    def _decode(rows):
+        return [json.loads(row["raw"]) for row in rows]
+
+    def get(self, tweet_id):
+        row = self.conn.execute("SELECT raw FROM posts WHERE id = ?", (str(tweet_id),)).fetchone()
+        return json.loads(row["raw"]) if row else None
+
+    def posts_by_handle(self, handle, since=None, until=None, limit=None):
+        """Posts authored by handle with since <= date < until (ISO dates or datetimes), newest first"""
+        query = "SELECT raw FROM posts WHERE username = ?"
+        params = [handle]
+        if since:
+            query += " AND date >= ?"
+            params.append(since)
+        if until:
+            query += " AND date < ?"
+            params.append(until)
+        query += " ORDER BY date DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self._decode(self.conn.execute(query, params))
+
+    def likes_of(self, handle, since=None, limit=None):
+        """Posts first seen on handle's likes page at or after since, most recently liked first.
+
+        X does not expose when something was liked, so the first observation
+        on the likes page stands in for it.
+        """
+        query = """
+            SELECT p.raw, MIN(o.observed_at) AS liked_at
+            FROM observations o JOIN posts p ON p.id = o.post_id
+            WHERE o.handle = ? AND o.page_type = 'likes'
+            GROUP BY o.post_id
+        """
+        params = [handle]
+        if since:
+            query += " HAVING liked_at >= ?"
+            params.append(since)
+        query += " ORDER BY liked_at DESC, p.id DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self._decode(self.conn.execute(query, params))
+
+    def replies_to(self, tweet_id):
+        return self._decode(self.conn.execute(
+            "SELECT raw FROM posts WHERE parent_id = ? ORDER BY date", (str(tweet_id),)))
+
+    def observations(self, tweet_id):
+        rows = self.conn.execute(
+            "SELECT handle, page_type, observed_at, position FROM observations WHERE post_id = ? ORDER BY observed_at",
+            (str(tweet_id),))
+        return [dict(row) for row in rows]
+
+    def user(self, username):
+        row = self.conn.execute("SELECT * FROM users WHERE username = ?", (username,)).fetchone()
+        return dict(row) if row else None
+
+    def set_communities(self, communities):
+        """Replace every user's community id with {username: community id}; returns users updated"""
+        with self.conn:
+            self.conn.execute("UPDATE users SET community_id = NULL WHERE community_id IS NOT NULL")
+            cursor = self.conn.executemany("UPDATE users SET community_id = ? WHERE username = ?",
+                                           [(community_id, username) for username, community_id in communities.items()])
+        return cursor.rowcount
+
+    def posts_by_community(self, community_id, since=None, limit=None):
+        """Posts authored by members of a community, newest first"""
+        query = "SELECT p.raw FROM posts p JOIN users u ON u.username = p.username WHERE u.community_id = ?"
+        params = [community_id]
+        if since:
+            query += " AND p.date >= ?"
+            params.append(since)
+        query += " ORDER BY p.date DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self._decode(self.conn.execute(query, params))
+
+    def duplicates_of(self, tweet_id):
+        """Other posts in tweet_id's near-duplicate cluster, oldest first"""
+        rows = self.conn.execute(
+            "SELECT p.raw FROM posts p JOIN posts d ON d.dup_cluster_id = p.dup_cluster_id "
+            "WHERE d.id = ? AND p.id != d.id ORDER BY p.date", (str(tweet_id),))
+        return self._decode(rows)
+
+    def counts(self):
+        return {table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("posts", "users", "observations")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the SQLite post store")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="Load saved JSON / NDJSON results")
+    import_parser.add_argument("files", nargs="+")
+    subparsers.add_parser("stats", help="Row counts")
+    args = parser.parse_args()
+
+    with PostStore(args.db) as store:
+        if args.command == "import":
+            for path in args.files:
+                print(f"📥 {path}: {store.import_file(path)} posts")
+        print(json.dumps(store.counts(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Conversation threading across every scraped file and page type.
+
+ThreadIndex links posts through parent_id (and the ancestors carried in
+reply_chain) into conversation trees as posts are ingested, without
+rescanning anything already seen:
+
+- children      parent id -> reply ids (the parent may not be scraped yet)
+- threads       each post id -> its _Thread (root id, member ids, last activity)
+- activity      day -> post ids with that date, for "updated since" queries
+
+When a late post connects two trees (a reply arrived before its parent),
+the smaller thread's members move into the larger one, so each id moves
+O(log n) times over the life of the index.
+
+Usage:
+    python -m e2b_sandbox.network_intelligence.threads extracted_data/*.json --post 1790000000000000000
+"""
+import argparse
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from e2b_sandbox.browser_scrapers.high_water_marks import post_id
+from e2b_sandbox.browser_scrapers.post_normalization import flatten_post
+
+KEPT_FIELDS = ("username", "author", "text", "date", "permalink", "replying_to")
+
+
+class _Thread:
+    __slots__ = ("root", "members", "updated")
+
+    def __init__(self, root):
+        self.root = root
+        self.members = {root}
+        self.updated = None
+
+
+class ThreadIndex:
+    """Incrementally maintained conversation trees over ingested posts"""
+
+    def __init__(self):
+        self.posts = {}
+        self.parent = {}
+        self.children = defaultdict(set)
+        self.threads = {}
+        self.activity = defaultdict(list)
+
+    def __len__(self):
+        return len(self.posts)
+
+    def _thread(self, tweet_id):
+        thread = self.threads.get(tweet_id)
+        if thread is None:
+            thread = self.threads[tweet_id] = _Thread(tweet_id)
+        return thread
+
+    def _link(self, child, parent):
+        """Record child -> parent and merge their threads; returns False for conflicting or cyclic links"""
+        if child == parent or self.parent.get(child) not in (None, parent):
+            return False
+        parent_thread, child_thread = self._thread(parent), self._thread(child)
+        if parent_thread is child_thread:
+            # Already linked, or parent sits below child: keep the tree acyclic
+            return self.parent.get(child) == parent
+        self.parent[child] = parent
+        self.children[parent].add(child)
+        root = parent_thread.root
+        small, large = sorted((parent_thread, child_thread), key=lambda t: len(t.members))
+        for member in small.members:
+            self.threads[member] = large
+        large.members |= small.members
+        large.root = root
+        if small.updated and (large.updated is None or small.updated > large.updated):
+            large.updated = small.updated
+        return True
+
+    def ingest(self, posts):
+        """Add posts (nested or normalized) and link them into threads; returns how many were new"""
+        added = 0
+        for post in posts:
+            for record in flatten_post(post):
+                tweet_id = post_id(record)
+                if not tweet_id:
+                    continue
+                known = self.posts.get(tweet_id)
+                self.posts[tweet_id] = {**(known or {}), "id": tweet_id,
+                                        **{k: record[k] for k in KEPT_FIELDS if record.get(k) is not None}}
+                if known is None:
+                    added += 1
+                thread = self._thread(tweet_id)
+                if record.get("parent_id"):
+                    self._link(tweet_id, str(record["parent_id"]))
+                    thread = self.threads[tweet_id]
+                date = record.get("date")
+                if date and known is None:
+                    self.activity[date[:10]].append(tweet_id)
+                    if thread.updated is None or date > thread.updated:
+                        thread.updated = date
+        return added
+
+    def ingest_file(self, path):
+        """Load a save_results JSON file or an NDJSON/JSONL stream or delta file"""
+        path = Path(path)
+        with open(path, encoding="utf-8") as f:
+            if path.suffix in (".ndjson", ".jsonl"):
+                posts = [json.loads(line) for line in f if line.strip()]
+            else:
+                posts = json.load(f).get("posts", [])
+        return self.ingest(posts)
+
+    @classmethod
+    def from_store(cls, store):
+        """Build the index from a PostStore without decoding the raw post JSON"""
+        index = cls()
+        rows = store.conn.execute(
+            "SELECT id, parent_id, username, author, text, date, permalink FROM posts")
+        index.ingest(dict(row) for row in rows)
+        return index
+
+    def root(self, tweet_id):
+        thread = self.threads.get(str(tweet_id))
+        return thread.root if thread else None
+
+    def _ordered_children(self, tweet_id):
+        return sorted(self.children.get(tweet_id, ()), key=lambda c: (self.posts.get(c, {}).get("date") or "", c))
+
+    def _node(self, tweet_id):
+        return self.posts.get(tweet_id) or {"id": tweet_id, "status": "missing"}
+
+    def thread(self, tweet_id):
+        """The full conversation containing tweet_id, root first, as posts with a depth field"""
+        root = self.root(tweet_id)
+        if root is None:
+            return []
+        ordered, stack = [], [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            ordered.append({**self._node(node), "depth": depth})
+            stack.extend((child, depth + 1) for child in reversed(self._ordered_children(node)))
+        return ordered
+
+    def tree(self, tweet_id):
+        """The conversation containing tweet_id as nested {"post", "replies"} nodes"""
+        root = self.root(tweet_id)
+        if root is None:
+            return None
+        top = {"post": self._node(root), "replies": []}
+        stack = [(root, top)]
+        while stack:
+            node, out = stack.pop()
+            for child in self._ordered_children(node):
+                child_out = {"post": self._node(child), "replies": []}
+                out["replies"].append(child_out)
+                stack.append((child, child_out))
+        return top
+
+    def stats(self, tweet_id):
+        """Depth/breadth statistics for the conversation containing tweet_id"""
+        root = self.root(tweet_id)
+        if root is None:
+            return None
+        thread = self.threads[root]
+        level, depth, width, max_replies = [root], 0, 1, 0
+        while True:
+            next_level = [child for node in level for child in self.children.get(node, ())]
+            max_replies = max([max_replies] + [len(self.children.get(node, ())) for node in level])
+            if not next_level:
+                break
+            depth += 1
+            width = max(width, len(next_level))
+            level = next_level
+        return {
+            "root": root,
+            "posts": len(thread.members),
+            "missing": sum(1 for member in thread.members if member not in self.posts),
+            "depth": depth,
+            "width": width,
+            "max_replies": max_replies,
+            "participants": len({self.posts[m].get("username", "").lower() for m in thread.members
+                                 if m in self.posts and self.posts[m].get("username")}),
+            "updated": thread.updated,
+        }
+
+    def updated_since(self, since, min_posts=1):
+        """Root ids of conversations with a post dated at or after since (ISO date or datetime), newest first"""
+        threads = {}
+        for day in (day for day in self.activity if day >= since[:10]):
+            for tweet_id in self.activity[day]:
+                thread = self.threads[tweet_id]
+                if thread.updated >= since and len(thread.members) >= min_posts:
+                    threads[thread.root] = thread.updated
+        return sorted(threads, key=lambda root: (threads[root], root), reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruct conversations from scraped posts")
+    parser.add_argument("files", nargs="*", help="Saved JSON / NDJSON results")
+    parser.add_argument("--db", help="Read posts from a PostStore database instead")
+    parser.add_argument("--post", help="Print the conversation containing this post id")
+    parser.add_argument("--since", help="List conversations updated since this date")
+    args = parser.parse_args()
+
+    if args.db:
+        from e2b_sandbox.network_intelligence.post_store import PostStore
+        with PostStore(args.db) as store:
+            index = ThreadIndex.from_store(store)
+    else:
+        index = ThreadIndex()
+        for path in args.files:
+            index.ingest_file(path)
+    print(f"🧵 {len(index)} posts in {len({t.root for t in index.threads.values()})} conversations")
+    if args.post:
+        for post in index.thread(args.post):
+            print(f"{'  ' * post['depth']}@{post.get('username', '?')}: {(post.get('text') or '')[:80]}")
+        print(json.dumps(index.stats(args.post), indent=2))
+    if args.since:
+        for root in index.updated_since(args.since)[:20]:
+            print(json.dumps(index.stats(root)))
+
+
+if __name__ == "__main__":
+    main()
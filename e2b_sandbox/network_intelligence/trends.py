@@ -0,0 +1,341 @@
+"""
+Streaming trend detection over posts as the scrapers emit them.
+
+Every post contributes its terms once: hashtags ("#ai"), mentions ("@ada")
+and words. Instead of a counter per distinct term, TrendDetector keeps a
+ring of Count-Min sketches, one per time bucket (an hour by default):
+
+    sketch[bucket, row, hash_row(term)] += 1
+
+so memory is fixed (buckets x depth x width counters) however many terms
+show up. A term's count over any run of buckets is the minimum over rows of
+the summed cells, a constant number of reads: O(1) per lookup, no rescan of
+extracted_data/.
+
+- recent window    the last `window` buckets
+- baseline         the `baseline` buckets before that
+- acceleration     recent count vs. the count the baseline rate predicts for
+                   the recent post volume, (recent + 1) / (expected + 1)
+
+Sketches cannot list their terms, so a bounded heavy-hitter table keeps the
+`capacity` terms with the highest recent counts (re-estimated as the window
+slides); trending() and top() rank those. Posts are bucketed by their own
+date; posts older than the ring are counted as dropped. A two-generation
+Bloom filter of post ids keeps re-scraped posts from being counted twice.
+
+The scraper engine feeds a detector set as a PostPipeline's trends= with
+every batch, and state persists across runs in trends.npz.
+
+Usage:
+    python -m e2b_sandbox.network_intelligence.trends add extracted_data/*.json
+    python -m e2b_sandbox.network_intelligence.trends show --kind hashtag
+"""
+import argparse
+import json
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from e2b_sandbox.browser_scrapers.high_water_marks import post_id
+from e2b_sandbox.network_intelligence.vector_index import TOKEN_RE, URL_RE
+
+DEFAULT_STATE_PATH = "extracted_data/trends.npz"
+# Mersenne prime for the row hashes: (a * crc32 + b) mod P stays inside uint64
+HASH_PRIME = np.uint64(2 ** 61 - 1)
+STOPWORDS = frozenset("""
+the and for are but not you all any can had her was one our out has him his how its may new now see two who
+did get got let say she too use way this that with have from they will what when your just more been than them
+then some into only over such very also here there their would could should about which while where after
+before being these those other just like dont im its it's rt amp https http
+""".split())
+
+
+def parse_timestamp(date):
+    """Epoch seconds for an ISO date/datetime ("2024-05-01T12:00:00.000Z"), or None"""
+    if not date:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(date).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed.timestamp()
+
+
+def post_terms(text):
+    """Distinct hashtags, mentions and words (3+ letters, no stopwords) in a post"""
+    terms = set()
+    for token in TOKEN_RE.findall(URL_RE.sub(" ", text.lower())):
+        if token[0] in "#@":
+            if len(token) > 1:
+                terms.add(token)
+        elif len(token) >= 3 and not token.isdigit() and token not in STOPWORDS:
+            terms.add(token)
+    return terms
+
+
+def term_kind(term):
+    return {"#": "hashtag", "@": "mention"}.get(term[0], "word")
+
+
+class SeenFilter:
+    """Two-generation Bloom filter of post ids, so re-scraped posts are counted once in fixed memory"""
+
+    def __init__(self, bits=2 ** 23, hashes=4, generation_size=1_000_000):
+        self.bits = bits
+        self.hashes = hashes
+        self.generation_size = generation_size
+        self.current = np.zeros(bits // 8, dtype=np.uint8)
+        self.previous = np.zeros(bits // 8, dtype=np.uint8)
+        self.inserted = 0
+
+    def _positions(self, keys):
+        h1 = np.fromiter((zlib.crc32(k.encode("utf-8")) for k in keys), dtype=np.uint64, count=len(keys))
+        h2 = np.fromiter((zlib.adler32(k.encode("utf-8")) for k in keys), dtype=np.uint64, count=len(keys))
+        return ((h1[:, None] + np.arange(self.hashes, dtype=np.uint64) * (h2[:, None] | np.uint64(1)))
+                % np.uint64(self.bits)).astype(np.intp)
+
+    def _contains(self, table, positions):
+        return ((table[positions >> 3] >> (positions & 7).astype(np.uint8)) & 1).all(axis=1)
+
+    def add(self, keys):
+        """Insert keys; returns a bool list, True for keys not seen before (false positives aside)"""
+        if not keys:
+            return []
+        positions = self._positions(keys)
+        new = ~(self._contains(self.current, positions) | self._contains(self.previous, positions))
+        # Repeats inside the batch
+        first = {}
+        for i, key in enumerate(keys):
+            if new[i] and first.setdefault(key, i) != i:
+                new[i] = False
+        if self.inserted >= self.generation_size:
+            self.previous, self.current = self.current, np.zeros_like(self.current)
+            self.inserted = 0
+        fresh = positions[new].ravel()
+        np.bitwise_or.at(self.current, fresh >> 3, np.left_shift(1, fresh & 7).astype(np.uint8))
+        self.inserted += int(new.sum())
+        return new.tolist()
+
+
+class TrendDetector:
+    """Sliding-window Count-Min sketches plus a bounded heavy-hitter table"""
+
+    def __init__(self, bucket_seconds=3600, window=6, baseline=48, width=2 ** 14, depth=4, capacity=1000,
+                 min_count=5, threshold=3.0, state_path=DEFAULT_STATE_PATH, seed=0):
+        self.bucket_seconds = bucket_seconds
+        self.window = window
+        self.baseline = baseline
+        self.buckets = window + baseline
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        self.min_count = min_count
+        self.threshold = threshold
+        self.state_path = Path(state_path) if state_path else None
+        rng = np.random.default_rng(seed)
+        self.hash_a = rng.integers(1, 2 ** 31, depth, dtype=np.uint64)
+        self.hash_b = rng.integers(0, 2 ** 61 - 1, depth, dtype=np.uint64)
+        self.sketch = np.zeros((self.buckets, depth, width), dtype=np.uint32)
+        # Posts per bucket, for volume-adjusted baselines
+        self.volume = np.zeros(self.buckets, dtype=np.int64)
+        self.current = None
+        self.first = None
+        self.dropped = 0
+        self.candidates = {}
+        self.seen = SeenFilter()
+        if self.state_path and self.state_path.exists():
+            self._load()
+
+    def __len__(self):
+        return len(self.candidates)
+
+    # --- hashing and windows ---------------------------------------------------
+
+    def columns(self, terms):
+        """(len(terms), depth) sketch columns"""
+        base = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in terms), dtype=np.uint64, count=len(terms))
+        return ((base[:, None] * self.hash_a + self.hash_b) % HASH_PRIME % np.uint64(self.width)).astype(np.intp)
+
+    def _slots(self, first_epoch, last_epoch):
+        """Ring slots for epochs first..last (inclusive) still held in the ring"""
+        first_epoch = max(first_epoch, self.current - self.buckets + 1, self.first)
+        return np.arange(first_epoch, last_epoch + 1) % self.buckets
+
+    def _windows(self):
+        """(recent slots, baseline slots)"""
+        recent = self._slots(self.current - self.window + 1, self.current)
+        baseline = self._slots(self.current - self.window - self.baseline + 1, self.current - self.window)
+        return recent, baseline
+
+    def _estimate(self, columns, slots):
+        """Count-Min estimates over the given slots for each row of columns"""
+        if not len(slots) or not len(columns):
+            return np.zeros(len(columns), dtype=np.int64)
+        cells = self.sketch[slots[:, None, None], np.arange(self.depth)[None, None, :], columns[None, :, :]]
+        return cells.sum(axis=0, dtype=np.int64).min(axis=1)
+
+    def _advance(self, epoch):
+        """Slide the ring forward so epoch is the newest bucket"""
+        if self.current is None:
+            self.current = self.first = epoch
+            return
+        if epoch <= self.current:
+            return
+        stale = np.arange(self.current + 1, min(epoch, self.current + self.buckets) + 1) % self.buckets
+        self.sketch[stale] = 0
+        self.volume[stale] = 0
+        self.current = epoch
+        self.first = max(self.first, epoch - self.buckets + 1)
+
+    # --- ingestion -------------------------------------------------------------
+
+    def add_posts(self, posts, now=None):
+        """Count the terms of a batch of posts; returns the number of posts counted"""
+        now = now if now is not None else time.time()
+        posts = [p for p in posts if isinstance(p, dict) and p.get("text") and not p.get("embedded")]
+        posts = [p for p, new in zip(posts, self.seen.add([post_id(p) or p["text"] for p in posts])) if new]
+        epochs, terms = [], []
+        for post in posts:
+            text = post["text"]
+            timestamp = parse_timestamp(post.get("date")) or now
+            found = post_terms(text)
+            epochs.append(int(min(timestamp, now) // self.bucket_seconds))
+            terms.append(found)
+        if not epochs:
+            return 0
+        self._advance(max(epochs))
+        oldest = self.current - self.buckets + 1
+        counted = 0
+        flat_terms, flat_slots = [], []
+        for epoch, found in zip(epochs, terms):
+            if epoch < oldest:
+                self.dropped += 1
+                continue
+            counted += 1
+            self.volume[epoch % self.buckets] += 1
+            self.first = min(self.first, epoch)
+            flat_terms.extend(found)
+            flat_slots.extend([epoch % self.buckets] * len(found))
+        if flat_terms:
+            columns = self.columns(flat_terms)
+            np.add.at(self.sketch, (np.array(flat_slots)[:, None], np.arange(self.depth)[None, :], columns), 1)
+            self._update_candidates(set(flat_terms))
+        return counted
+
+    def _update_candidates(self, terms):
+        """Re-estimate the heavy hitters plus this batch's terms and keep the top `capacity`"""
+        pool = list(self.candidates.keys() | terms)
+        recent = self._estimate(self.columns(pool), self._windows()[0])
+        keep = np.flatnonzero(recent > 0)
+        if len(keep) > self.capacity:
+            keep = keep[np.argsort(-recent[keep], kind="stable")[:self.capacity]]
+        self.candidates = {pool[i]: int(recent[i]) for i in keep.tolist()}
+
+    # --- queries ---------------------------------------------------------------
+
+    def stats(self, terms):
+        """Recent count, baseline count and acceleration for each term"""
+        if self.current is None:
+            return [{"term": t, "recent": 0, "baseline": 0, "acceleration": 0.0} for t in terms]
+        terms = [t.lower() for t in terms]
+        columns = self.columns(terms)
+        recent_slots, baseline_slots = self._windows()
+        recent = self._estimate(columns, recent_slots)
+        baseline = self._estimate(columns, baseline_slots)
+        recent_volume = self.volume[recent_slots].sum()
+        baseline_volume = self.volume[baseline_slots].sum()
+        # What the baseline share of posts predicts for the current window's volume
+        expected = baseline * recent_volume / baseline_volume if baseline_volume else np.zeros(len(terms))
+        acceleration = (recent + 1) / (expected + 1)
+        return [{"term": term, "kind": term_kind(term), "recent": int(r), "baseline": int(b),
+                 "expected": round(float(e), 2), "acceleration": round(float(a), 3)}
+                for term, r, b, e, a in zip(terms, recent.tolist(), baseline.tolist(), expected.tolist(),
+                                            acceleration.tolist())]
+
+    def count(self, term):
+        """Estimated posts using term in the recent window"""
+        return self.stats([term])[0]["recent"]
+
+    def _ranked(self, kind):
+        terms = [t for t in self.candidates if kind is None or term_kind(t) == kind]
+        return self.stats(terms) if terms else []
+
+    def top(self, k=20, kind=None):
+        """Heavy hitters in the recent window"""
+        return sorted(self._ranked(kind), key=lambda s: (-s["recent"], s["term"]))[:k]
+
+    def trending(self, k=20, kind=None):
+        """Terms used at least min_count times recently whose rate accelerated past threshold"""
+        flagged = [s for s in self._ranked(kind) if s["recent"] >= self.min_count and s["acceleration"] >= self.threshold]
+        return sorted(flagged, key=lambda s: (-s["acceleration"], -s["recent"], s["term"]))[:k]
+
+    # --- persistence -----------------------------------------------------------
+
+    def memory_bytes(self):
+        return self.sketch.nbytes + self.volume.nbytes + self.seen.current.nbytes + self.seen.previous.nbytes
+
+    def save(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {"current": self.current, "first": self.first, "dropped": self.dropped, "seen": self.seen.inserted,
+                "bucket_seconds": self.bucket_seconds, "candidates": self.candidates}
+        tmp_path = self.state_path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, sketch=self.sketch, volume=self.volume, hash_a=self.hash_a, hash_b=self.hash_b,
+                 seen=np.stack([self.seen.current, self.seen.previous]), meta=np.array(json.dumps(meta)))
+        tmp_path.replace(self.state_path)
+
+    def _load(self):
+        with np.load(self.state_path) as data:
+            if data["sketch"].shape != self.sketch.shape:
+                raise ValueError(f"{self.state_path} was saved with a different sketch shape {data['sketch'].shape}")
+            self.sketch = data["sketch"]
+            self.volume = data["volume"]
+            self.hash_a, self.hash_b = data["hash_a"], data["hash_b"]
+            self.seen.current, self.seen.previous = data["seen"]
+            meta = json.loads(str(data["meta"]))
+        if meta["bucket_seconds"] != self.bucket_seconds:
+            raise ValueError(f"{self.state_path} uses {meta['bucket_seconds']}s buckets")
+        self.current, self.first, self.dropped = meta["current"], meta["first"], meta["dropped"]
+        self.seen.inserted = meta["seen"]
+        self.candidates = meta["candidates"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming trend detection over scraped posts")
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    add_parser = subparsers.add_parser("add", help="Count the posts in saved JSON / NDJSON results")
+    add_parser.add_argument("files", nargs="+")
+    show_parser = subparsers.add_parser("show", help="Accelerating terms and heavy hitters")
+    show_parser.add_argument("--kind", choices=["hashtag", "mention", "word"])
+    show_parser.add_argument("-k", type=int, default=20)
+    show_parser.add_argument("terms", nargs="*", help="Look up these terms instead")
+    args = parser.parse_args()
+
+    detector = TrendDetector(state_path=args.state)
+    if args.command == "add":
+        for path in args.files:
+            with open(path, encoding="utf-8") as f:
+                if path.endswith((".ndjson", ".jsonl")):
+                    posts = [json.loads(line) for line in f if line.strip()]
+                else:
+                    posts = json.load(f).get("posts", [])
+            print(f"📥 {path}: {detector.add_posts(posts)} posts")
+        detector.save()
+        print(f"💾 {len(detector)} heavy hitters, {detector.memory_bytes() / 1_000_000:.1f} MB of counters, "
+              f"{detector.dropped} posts older than the window dropped")
+    elif args.terms:
+        print(json.dumps(detector.stats(args.terms), indent=2))
+    else:
+        print("🔥 Trending:")
+        for s in detector.trending(args.k, args.kind):
+            print(f"  {s['term']:<30} x{s['acceleration']:<8} ({s['recent']} recent, {s['expected']} expected)")
+        print("📊 Most used:")
+        for s in detector.top(args.k, args.kind):
+            print(f"  {s['term']:<30} {s['recent']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+"""
+Local vector index for "related content" lookups over post text.
+
+Embeddings come from a pluggable embedder: anything with a `dim` attribute
+and an `embed(texts) -> float32 array (n, dim)` method returning unit
+vectors. The default HashingEmbedder hashes word unigrams and bigrams into a
+fixed number of buckets (sublinear term frequency, signed hashing), so the
+index works offline and never needs a vocabulary or a model download.
+
+VectorIndex keeps the vectors in a memory-mapped float32 matrix keyed by
+tweet id (vectors.f32 + ids.txt in its directory) and offers:
+
+- exact top-k search: one matmul per block of rows, batched over queries
+- approximate search over a navigable small-world graph (NSWGraph) once the
+  index is larger than ann_threshold; the graph grows with every insert
+
+Inserts are incremental: scrapers can add posts batch by batch, and a post
+seen again only has its vector replaced. Posts tagged as near-duplicates of
+an earlier post (dup_cluster_id, near_duplicates.py) are not embedded once
+the cluster's first post is in the index; until then the first member seen
+stands in for the cluster.
+
+Usage:
+    python -m e2b_sandbox.network_intelligence.vector_index add extracted_data/*.json
+    python -m e2b_sandbox.network_intelligence.vector_index query "zero knowledge proofs"
+"""
+import argparse
+import heapq
+import json
+import re
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from e2b_sandbox.browser_scrapers.high_water_marks import post_id
+from e2b_sandbox.browser_scrapers.post_normalization import flatten_post
+
+DEFAULT_INDEX_DIR = "extracted_data/vectors"
+TOKEN_RE = re.compile(r"[#@]?\w+")
+URL_RE = re.compile(r"https?://\S+")
+INITIAL_CAPACITY = 1024
+SEARCH_BLOCK_ROWS = 65536
+
+
+class HashingEmbedder:
+    """Feature-hashed bag of words and bigrams, L2-normalized"""
+
+    def __init__(self, dim=256, bigrams=True):
+        self.dim = dim
+        self.bigrams = bigrams
+
+    @property
+    def name(self):
+        return f"hashing-{self.dim}{'-bigrams' if self.bigrams else ''}"
+
+    def tokens(self, text):
+        words = TOKEN_RE.findall(URL_RE.sub(" ", text.lower()))
+        if self.bigrams:
+            return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        return words
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = {}
+            for token in self.tokens(text or ""):
+                # crc32 rather than hash(): str hashes change between processes
+                h = zlib.crc32(token.encode("utf-8"))
+                counts[h] = counts.get(h, 0) + 1
+            if not counts:
+                continue
+            hashes = np.fromiter(counts.keys(), dtype=np.uint32, count=len(counts))
+            weights = 1 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(vectors[row], hashes % self.dim, signs * weights)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+
+class NSWGraph:
+    """Navigable small-world graph over rows of a vector matrix (cosine similarity)
+
+    Each node keeps up to m links; an insert searches the graph for its
+    nearest nodes and links both ways, replacing a node's weakest link when
+    it is full. Searches are a best-first beam over the links.
+    """
+
+    def __init__(self, m=16, ef_construction=48, seed=0):
+        self.m = m
+        self.ef_construction = ef_construction
+        self.links = np.full((0, m), -1, dtype=np.int32)
+        # Similarity of each link to its node (-inf for a free slot), so a full node's weakest link is an argmin
+        self.link_sims = np.full((0, m), -np.inf, dtype=np.float32)
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+
+    def _grow(self, size):
+        if size > len(self.links):
+            capacity = max(size, 2 * len(self.links), INITIAL_CAPACITY)
+            links = np.full((capacity, self.m), -1, dtype=np.int32)
+            link_sims = np.full((capacity, self.m), -np.inf, dtype=np.float32)
+            links[:len(self.links)] = self.links
+            link_sims[:len(self.links)] = self.link_sims
+            self.links, self.link_sims = links, link_sims
+
+    def _entry_points(self, n=8):
+        # Several random entry points make up for the missing hierarchy of HNSW
+        return np.unique(np.concatenate([[0], self.rng.integers(0, self.count, size=n)]))
+
+    def search(self, vectors, query, k=10, ef=64):
+        """(rows, similarities) of the approximate k nearest rows, best first"""
+        if self.count == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        ef = max(ef, k)
+        entries = self._entry_points()
+        sims = (vectors[entries] @ query).tolist()
+        entries = entries.tolist()
+        visited = set(entries)
+        candidates = [(-s, r) for s, r in zip(sims, entries)]
+        heapq.heapify(candidates)
+        results = heapq.nlargest(ef, zip(sims, entries))
+        heapq.heapify(results)
+        links = self.links
+        while candidates:
+            neg_sim, row = heapq.heappop(candidates)
+            if len(results) >= ef and -neg_sim < results[0][0]:
+                break
+            neighbors = [n for n in links[row].tolist() if n >= 0 and n not in visited]
+            if not neighbors:
+                continue
+            visited.update(neighbors)
+            for sim, neighbor in zip((vectors[neighbors] @ query).tolist(), neighbors):
+                if len(results) < ef:
+                    heapq.heappush(results, (sim, neighbor))
+                elif sim > results[0][0]:
+                    heapq.heapreplace(results, (sim, neighbor))
+                else:
+                    continue
+                heapq.heappush(candidates, (-sim, neighbor))
+        best = heapq.nlargest(k, results)
+        return (np.array([r for _, r in best], dtype=np.int64),
+                np.array([s for s, _ in best], dtype=np.float32))
+
+    def insert(self, vectors, row):
+        """Link row (already present in vectors) into the graph, both ways"""
+        self._grow(row + 1)
+        if self.count:
+            nearest, sims = self.search(vectors, vectors[row], self.m, self.ef_construction)
+            keep = nearest != row
+            nearest, sims = nearest[keep], sims[keep]
+            self.links[row, :len(nearest)] = nearest
+            self.link_sims[row, :len(nearest)] = sims
+            # Back links: take a free slot or replace the neighbor's weakest link if row is closer
+            weakest = np.argmin(self.link_sims[nearest], axis=1)
+            closer = self.link_sims[nearest, weakest] < sims
+            self.links[nearest[closer], weakest[closer]] = row
+            self.link_sims[nearest[closer], weakest[closer]] = sims[closer]
+        self.count = max(self.count, row + 1)
+
+    def save(self, path):
+        np.savez(path, links=self.links[:self.count], link_sims=self.link_sims[:self.count])
+
+    @classmethod
+    def load(cls, path, m=16):
+        graph = cls(m)
+        with np.load(path) as data:
+            graph.links, graph.link_sims = data["links"], data["link_sims"]
+        graph.count = len(graph.links)
+        return graph
+
+
+class VectorIndex:
+    """Memory-mapped float32 embeddings keyed by tweet id, with exact and NSW search"""
+
+    def __init__(self, directory=DEFAULT_INDEX_DIR, embedder=None, ann_threshold=50_000, m=16):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.embedder = embedder or HashingEmbedder()
+        self.dim = self.embedder.dim
+        self.ann_threshold = ann_threshold
+        self.meta_path = self.directory / "index.json"
+        self.vectors_path = self.directory / "vectors.f32"
+        self.ids_path = self.directory / "ids.txt"
+        self.graph_path = self.directory / "nsw_graph.npz"
+        if self.meta_path.exists():
+            meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+            if meta["dim"] != self.dim or meta["embedder"] != getattr(self.embedder, "name", None):
+                raise ValueError(f"{self.directory} was built with {meta['embedder']} ({meta['dim']} dims)")
+        with open(self.ids_path, "a+", encoding="utf-8") as f:
+            f.seek(0)
+            self.ids = f.read().splitlines()
+        self.rows = {tweet_id: row for row, tweet_id in enumerate(self.ids)}
+        self.count = len(self.ids)
+        self._open(max(INITIAL_CAPACITY, self.count))
+        self.m = m
+        self.graph = None
+        if self.graph_path.exists():
+            self.graph = NSWGraph.load(self.graph_path, m)
+            for row in range(self.graph.count, self.count):
+                self.graph.insert(self.matrix, row)
+
+    def __len__(self):
+        return self.count
+
+    def _open(self, capacity):
+        size = capacity * self.dim * 4
+        with open(self.vectors_path, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        self.capacity = capacity
+
+    @property
+    def matrix(self):
+        # Plain ndarray view of the mapping: fancy indexing on np.memmap is several times slower
+        return np.asarray(self._mmap[:self.count])
+
+    def add_vectors(self, ids, vectors):
+        """Insert or replace vectors by id; returns how many ids were new"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        new_ids = [str(i) for i in ids if str(i) not in self.rows]
+        if self.count + len(new_ids) > self.capacity:
+            self._mmap.flush()
+            self._open(max(self.count + len(new_ids), 2 * self.capacity))
+        new_rows = []
+        for tweet_id, vector in zip(ids, vectors):
+            tweet_id = str(tweet_id)
+            row = self.rows.get(tweet_id)
+            if row is None:
+                row = self.rows[tweet_id] = self.count
+                self.ids.append(tweet_id)
+                self.count += 1
+                new_rows.append(row)
+            self._mmap[row] = vector
+        if new_rows:
+            with open(self.ids_path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{self.ids[row]}\n" for row in new_rows))
+        if self.graph is None and self.count >= self.ann_threshold:
+            self.build_ann()
+        elif self.graph is not None:
+            matrix = self.matrix
+            for row in new_rows:
+                self.graph.insert(matrix, row)
+        return len(new_rows)
+
+    def add(self, ids, texts):
+        return self.add_vectors(ids, self.embedder.embed(list(texts)))
+
+    def add_posts(self, posts):
+        """Embed and index the text of posts (and the tweets they embed); returns new ids"""
+        ids, texts, clusters = [], [], set()
+        for post in posts:
+            for record in flatten_post(post):
+                tweet_id = post_id(record)
+                if not tweet_id or not (record.get("text") or "").strip():
+                    continue
+                cluster = record.get("dup_cluster_id") or tweet_id
+                if cluster != tweet_id and (cluster in self.rows or cluster in clusters):
+                    continue
+                clusters.add(cluster)
+                ids.append(tweet_id)
+                texts.append(record["text"])
+        return self.add(ids, texts) if ids else 0
+
+    def vector(self, tweet_id):
+        row = self.rows.get(str(tweet_id))
+        return None if row is None else np.array(self._mmap[row])
+
+    def build_ann(self):
+        """Build the NSW graph over every row inserted so far"""
+        self.graph = NSWGraph(self.m)
+        matrix = self.matrix
+        for row in range(self.count):
+            self.graph.insert(matrix, row)
+        return self.graph
+
+    def search_exact(self, queries, k=10):
+        """Exact top-k for a batch of query vectors: (rows, scores), each (n_queries, k) best first"""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        k = min(k, self.count)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        for start in range(0, self.count, SEARCH_BLOCK_ROWS):
+            block = self._mmap[start:min(start + SEARCH_BLOCK_ROWS, self.count)]
+            scores = queries @ block.T
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k] if scores.shape[1] > k \
+                else np.tile(np.arange(scores.shape[1]), (len(queries), 1))
+            best_rows = np.concatenate([best_rows, top + start], axis=1)
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
+            if best_rows.shape[1] > k:
+                keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        return np.take_along_axis(best_rows, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+    def search(self, query, k=10, exact=None, ef=64, exclude=()):
+        """[(tweet_id, similarity)] for a text or a vector; approximate above ann_threshold unless exact"""
+        if not self.count:
+            return []
+        vector = self.embedder.embed([query])[0] if isinstance(query, str) else np.asarray(query, dtype=np.float32)
+        wanted = k + len(exclude)
+        if exact or (exact is None and self.graph is None):
+            rows, scores = self.search_exact(vector, wanted)
+            rows, scores = rows[0], scores[0]
+        else:
+            rows, scores = self.graph.search(self.matrix, vector, wanted, ef)
+        results = [(self.ids[row], float(score)) for row, score in zip(rows.tolist(), scores.tolist())]
+        return [(tweet_id, score) for tweet_id, score in results if tweet_id not in exclude][:k]
+
+    def related(self, tweet_id, k=10, **kwargs):
+        """Posts most similar to an indexed post, excluding itself"""
+        vector = self.vector(tweet_id)
+        return [] if vector is None else self.search(vector, k, exclude={str(tweet_id)}, **kwargs)
+
+    def flush(self):
+        self._mmap.flush()
+        if self.graph is not None:
+            self.graph.save(self.graph_path)
+        meta = {"dim": self.dim, "embedder": getattr(self.embedder, "name", None), "count": self.count}
+        self.meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+    def close(self):
+        self.flush()
+        del self._mmap
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the local vector index")
+    parser.add_argument("--index", default=DEFAULT_INDEX_DIR)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    add_parser = subparsers.add_parser("add", help="Index saved JSON / NDJSON results")
+    add_parser.add_argument("files", nargs="+")
+    query_parser = subparsers.add_parser("query", help="Posts similar to a text or a post id")
+    query_parser.add_argument("query")
+    query_parser.add_argument("-k", type=int, default=10)
+    query_parser.add_argument("--exact", action="store_true")
+    args = parser.parse_args()
+
+    with VectorIndex(args.index) as index:
+        if args.command == "add":
+            for path in args.files:
+                path = Path(path)
+                with open(path, encoding="utf-8") as f:
+                    if path.suffix in (".ndjson", ".jsonl"):
+                        posts = [json.loads(line) for line in f if line.strip()]
+                    else:
+                        posts = json.load(f).get("posts", [])
+                print(f"📥 {path}: {index.add_posts(posts)} new vectors")
+            print(f"🔎 {len(index)} posts indexed in {args.index}")
+        else:
+            results = index.related(args.query, args.k) if args.query in index.rows \
+                else index.search(args.query, args.k, exact=args.exact or None)
+            for tweet_id, score in results:
+                print(f"{score:.3f}  {tweet_id}")
+
+
+if __name__ == "__main__":
+    main()
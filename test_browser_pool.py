@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Tests for the browser pool's JSON-lines lease protocol, with stubbed browsers.
+"""
+
+import asyncio
+import json
+
+import pytest
+from playwright.async_api import Error as PlaywrightError
+
+from e2b_sandbox.browser_scrapers.browser_pool import BrowserPool, PoolClient, PoolError
+from e2b_sandbox.browser_scrapers.playwright_posts_scraper import PlaywrightPostsScraper
+from e2b_sandbox.browser_scrapers.script_executor import MethodCache
+from e2b_sandbox.browser_scrapers.session_cache import SessionCache
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class ProfilePage:
+    """A page in a persistent profile that is either logged in to X or bounced to the login flow"""
+
+    def __init__(self, logged_in):
+        self.logged_in = logged_in
+        self.url = "about:blank"
+        self.visited = []
+
+    async def goto(self, url, wait_until=None):
+        self.visited.append(url)
+        self.url = url if self.logged_in or not url.endswith("/home") else "https://x.com/i/flow/login"
+
+    async def wait_for_load_state(self, state=None):
+        pass
+
+    async def wait_for_selector(self, selector, timeout=None):
+        if not self.logged_in:
+            raise TimeoutError(f"{selector} not found")
+        return object()
+
+
+class ProfileContext(FakeContext):
+    def __init__(self, logged_in):
+        super().__init__()
+        self.pages = [ProfilePage(logged_in)]
+        self.cookies = []
+
+    async def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+
+
+class StubPool(BrowserPool):
+    """BrowserPool whose instances are fake contexts; launch_failures makes the next N launches fail"""
+
+    def __init__(self, **kwargs):
+        super().__init__(control_port=0, **kwargs)
+        self.launch_failures = 0
+
+    async def _launch(self, instance):
+        if self.launch_failures:
+            self.launch_failures -= 1
+            raise RuntimeError("chromium did not start")
+        instance.context = FakeContext()
+        instance.generation += 1
+        instance.leases = 0
+        instance.logged_in = True
+
+
+class RefusingChromium:
+    """Stands in for playwright.chromium when the leased endpoint does not answer CDP"""
+
+    def __init__(self):
+        self.endpoints = []
+
+    async def connect_over_cdp(self, endpoint):
+        self.endpoints.append(endpoint)
+        raise PlaywrightError(f"connect ECONNREFUSED {endpoint}")
+
+
+async def started(pool):
+    for instance in pool.instances:
+        await pool._launch(instance)
+        pool.idle.put_nowait(instance)
+    server = await asyncio.start_server(pool._handle_client, "127.0.0.1", 0)
+    return server, f"127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+
+async def request(address, message):
+    host, port = address.split(":")
+    reader, writer = await asyncio.open_connection(host, int(port))
+    writer.write((json.dumps(message) + "\n").encode())
+    response = json.loads(await reader.readline())
+    writer.close()
+    return response
+
+
+def test_lease_release_and_dropped_clients():
+    async def scenario():
+        pool = StubPool(size=1, max_leases=2)
+        server, address = await started(pool)
+        async with server:
+            client = PoolClient(address)
+            lease = await client.lease()
+            assert lease["ok"] and lease["logged_in"] and lease["endpoint"] == pool.instances[0].endpoint
+
+            # The only instance is leased
+            with pytest.raises(PoolError, match="No browser free"):
+                await PoolClient(address).lease(timeout=0.05)
+            assert (await request(address, {"op": "release", "lease_id": "nope"}))["error"] == "Unknown lease nope"
+            assert (await request(address, {"op": "fly"}))["ok"] is False
+
+            await client.release()
+            status = await request(address, {"op": "status"})
+            assert status["instances"][0]["leased"] is False and status["instances"][0]["leases"] == 1
+
+            # A client that disconnects while holding a lease frees it; the second lease hits max_leases
+            crashed = PoolClient(address)
+            await crashed.lease()
+            await crashed.close()
+            lease = await PoolClient(address).lease(timeout=1)
+            assert lease["ok"]
+            assert pool.instances[0].generation == 2
+
+    asyncio.run(scenario())
+
+
+def test_failed_relaunch_keeps_the_instance_in_the_pool():
+    async def scenario():
+        pool = StubPool(size=1)
+        await started(pool)
+        instance = pool.instances[0]
+        old_context = instance.context
+
+        lease = await pool.lease()
+        pool.launch_failures = 1
+        await pool.release(lease["lease_id"], healthy=False)
+
+        assert old_context.closed and pool.idle.qsize() == 1
+        assert instance.status()["alive"] is False and instance.logged_in is False
+
+        # The next lease relaunches it; if that fails too the lease errors but the instance stays
+        pool.launch_failures = 1
+        with pytest.raises(PoolError, match="could not be relaunched"):
+            await pool.lease(timeout=1)
+        assert pool.idle.qsize() == 1
+        lease = await pool.lease(timeout=1)
+        assert lease["logged_in"] and instance.status()["alive"] is True
+
+    asyncio.run(scenario())
+
+
+def test_scraper_falls_back_and_returns_the_lease_when_cdp_is_refused(tmp_path):
+    async def scenario():
+        pool = StubPool(size=1)
+        server, address = await started(pool)
+        async with server:
+            scraper = PlaywrightPostsScraper(target_handle="ada", output_dir=tmp_path, method_cache=MethodCache(),
+                                             pool_address=address)
+            chromium = RefusingChromium()
+            scraper.playwright = type("FakePlaywright", (), {"chromium": chromium})()
+
+            assert await scraper._attach_to_pool() is False
+            assert chromium.endpoints == [pool.instances[0].endpoint]
+            assert scraper.pool_client is None and scraper.pool_lease is None and scraper.browser is None
+
+            # The lease went back unhealthy, so the instance was relaunched and is free again
+            status = pool.instances[0].status()
+            assert status["leased"] is False and status["generation"] == 2
+            lease = await PoolClient(address).lease(timeout=1)
+            assert lease["ok"]
+
+    asyncio.run(scenario())
+
+
+def test_log_in_restores_the_cached_session_and_checks_it(tmp_path):
+    async def scenario():
+        cache = SessionCache(tmp_path)
+        cache.path_for("ada").write_text(json.dumps({"cookies": [{"name": "auth_token", "value": "t"}]}))
+        pool = StubPool(size=2, username="ada", session_cache=cache)
+        valid, expired = pool.instances
+        valid.context, expired.context = ProfileContext(logged_in=True), ProfileContext(logged_in=False)
+
+        await pool._log_in(valid)
+        assert valid.logged_in and valid.context.cookies == [{"name": "auth_token", "value": "t"}]
+        assert valid.context.pages[0].visited == ["https://x.com/home", "about:blank"]
+
+        # An expired session goes through the login form, which fails here without a real page
+        await pool._log_in(expired)
+        assert expired.logged_in is False and "https://x.com/login" in expired.context.pages[0].visited
+
+    asyncio.run(scenario())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for community detection over the interaction graph.
+"""
+
+import numpy as np
+
+from e2b_sandbox.network_intelligence.communities import CommunityDetector, modularity
+from e2b_sandbox.network_intelligence.interactions import InteractionGraph
+from e2b_sandbox.network_intelligence.post_store import PostStore
+
+
+def clusters_graph(groups=3, size=6, extra=()):
+    """Dense reply clusters joined in a ring by single weak edges"""
+    handles = [f"user{g}_{i}" for g in range(groups) for i in range(size)] + [h for h, _ in extra]
+    src, dst, weight = [], [], []
+    for g in range(groups):
+        members = range(g * size, (g + 1) * size)
+        for a in members:
+            for b in members:
+                if a != b:
+                    src.append(a), dst.append(b), weight.append(1.0)
+        src.append(g * size), dst.append(((g + 1) % groups) * size), weight.append(0.5)
+    for offset, (_, target) in enumerate(extra):
+        src.append(groups * size + offset), dst.append(handles.index(target)), weight.append(1.0)
+    return InteractionGraph(np.arange(len(handles)), [f"user:{h}" for h in handles],
+                            np.array(src), np.array(dst), np.array(weight))
+
+
+def groups_of(partition):
+    groups = {}
+    for handle, community_id in partition.items():
+        groups.setdefault(community_id, set()).add(handle.split("_")[0])
+    return groups
+
+
+def test_louvain_and_label_propagation_find_the_clusters(tmp_path):
+    interactions = clusters_graph()
+    for method in ("louvain", "label_propagation"):
+        detector = CommunityDetector(method, partition_path=tmp_path / f"{method}.json")
+        partition = detector.detect(interactions)
+
+        assert sorted(map(sorted, groups_of(partition).values())) == [["user0"], ["user1"], ["user2"]]
+        assert detector.stats["modularity"] > 0.5
+
+    src, dst, weight = interactions.symmetric()
+    assert modularity(src, dst, weight, np.zeros(len(interactions), dtype=np.int64)) == 0.0
+
+
+def test_rerun_keeps_ids_and_places_new_users(tmp_path):
+    path = tmp_path / "communities.json"
+    detector = CommunityDetector(partition_path=path)
+    before = detector.detect(clusters_graph())
+    detector.save()
+
+    detector = CommunityDetector(partition_path=path, seed=7)
+    after = detector.detect(clusters_graph(extra=[("newcomer", "user1_3")]))
+
+    assert all(after[handle] == community_id for handle, community_id in before.items())
+    assert after["newcomer"] == before["user1_3"]
+
+
+def test_community_ids_are_written_to_the_store(tmp_path):
+    with PostStore(tmp_path / "posts.db") as store:
+        store.upsert_posts([{"id": "1", "username": "user0_0", "text": "a", "date": "2024-05-01"},
+                            {"id": "2", "username": "user1_0", "text": "b", "date": "2024-05-02"}])
+        partition = CommunityDetector(partition_path=None).detect(clusters_graph())
+
+        assert store.set_communities(partition) == 2
+        assert store.user("user0_0")["community_id"] == partition["user0_0"]
+        assert [p["id"] for p in store.posts_by_community(partition["user1_0"])] == ["2"]
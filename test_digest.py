@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the top-K conversation digest.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from e2b_sandbox.network_intelligence.digest import DigestEngine
+from e2b_sandbox.network_intelligence.post_store import PostStore
+
+NOW = datetime(2024, 5, 20, 12, tzinfo=timezone.utc)
+
+
+def at(days_ago):
+    return (NOW - timedelta(days=days_ago)).isoformat().replace("+00:00", "Z")
+
+
+def conversation(root, author, days_ago, likes="0", replies=()):
+    posts = [{"id": root, "username": author, "text": f"{root} by {author}", "date": at(days_ago), "likes": likes}]
+    posts += [{"id": f"{root}{i}", "username": user, "text": "reply", "date": at(days_ago), "parent_id": root}
+              for i, user in enumerate(replies)]
+    return posts
+
+
+def engine():
+    digest = DigestEngine(half_life_hours=48, buffer=3)
+    digest.set_network("ada", ["grace", "linus"], now=NOW.timestamp())
+    digest.set_network("alan", ["barbara"], now=NOW.timestamp())
+    digest.ingest(conversation("100", "grace", 0.2, "1.2K") + conversation("200", "linus", 2, "50", ["grace"])
+                  + conversation("300", "barbara", 0.1, "10") + conversation("400", "ada", 10, "9K")
+                  + conversation("500", "linus", 5, "2"), now=NOW.timestamp())
+    return digest
+
+
+def roots(results):
+    return [r["root"] for r in results]
+
+
+def test_windows_rank_by_engagement_and_recency():
+    digest = engine()
+    now = NOW.timestamp()
+
+    assert roots(digest.digest("ada", "day", now=now)) == ["100"]
+    assert roots(digest.digest("ada", "week", now=now)) == ["100", "200", "500"]
+    assert roots(digest.digest("ada", "month", now=now))[0] == "100"
+    assert "400" in roots(digest.digest("ada", "month", now=now))
+    assert roots(digest.digest("@Alan", "week", now=now)) == ["300"]
+    # Scores decay with time but the order does not change
+    later = digest.digest("ada", "week", now=now + 3600)
+    assert later[0]["score"] < digest.digest("ada", "week", now=now)[0]["score"]
+    assert roots(later) == ["100", "200", "500"]
+
+
+def test_new_replies_update_only_the_affected_views():
+    digest = engine()
+    now = NOW.timestamp()
+    alan_view = list(digest.views[("alan", "week")])
+
+    refreshed = digest.ingest([{"id": "5009", "username": "ada", "text": "great point", "date": at(0.01),
+                                "parent_id": "500", "likes": "40K"}], now=now)
+
+    assert refreshed == ["500"]
+    assert roots(digest.digest("ada", "day", now=now)) == ["500", "100"]
+    assert digest.views[("alan", "week")] == alan_view
+
+
+def test_merged_threads_and_truncated_views_stay_consistent():
+    digest = engine()
+    now = NOW.timestamp()
+    # 200's root post turns out to reply to 100: one conversation now
+    digest.ingest([{"id": "200", "username": "linus", "text": "200 by linus", "date": at(2), "parent_id": "100"}],
+                  now=now)
+    assert "200" not in digest.conversations
+    assert roots(digest.digest("ada", "month", now=now)) == ["100", "400", "500"]
+
+    # Newer conversations push older ones out of the bounded view; asking for more than it holds rebuilds it
+    digest.ingest(conversation("600", "grace", 0.5, "5") + conversation("700", "grace", 0.6, "5"), now=now)
+    assert len(digest.views[("ada", "month")]) == 3
+    assert roots(digest.digest("ada", "month", k=5, now=now)) == ["100", "400", "600", "700", "500"]
+
+
+def test_from_store_uses_numeric_columns(tmp_path):
+    with PostStore(tmp_path / "posts.db") as store:
+        store.upsert_posts(conversation("100", "grace", 1, "2K") + conversation("200", "grace", 1, "3"))
+        digest = DigestEngine.from_store(store, influence={"grace": 0.5, "ada": 0.5}, now=NOW.timestamp())
+    digest.set_network("ada", ["grace"], now=NOW.timestamp())
+    top = digest.digest("ada", now=NOW.timestamp())
+    assert roots(top) == ["100", "200"] and top[0]["engagement"] == 2001 and top[0]["influence"] == 1.0
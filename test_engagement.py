@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests for bulk engagement-count parsing.
+"""
+
+from e2b_sandbox.network_intelligence.engagement import (
+    EMPTY,
+    FAILED,
+    MISSING,
+    PARSED,
+    count_columns,
+    normalize_counts,
+    parse_counts,
+)
+from e2b_sandbox.network_intelligence.post_store import PostStore, parse_count
+
+
+def test_parse_counts_handles_suffixes_separators_and_failures():
+    counts, status = parse_counts(["1.2K", "", None, 42, "n/a", "1,234", " 3M ", "2.3k", ".5K", "1.2.3", "12 K"])
+
+    assert counts.tolist() == [1200, 0, 0, 42, 0, 1234, 3_000_000, 2300, 500, 0, 12_000]
+    assert status.tolist() == [PARSED, EMPTY, MISSING, PARSED, FAILED, PARSED, PARSED, PARSED, PARSED, FAILED, PARSED]
+    assert parse_count("1.5B") == 1_500_000_000 and parse_count("") is None and parse_count(7) == 7
+
+
+def test_normalize_counts_in_place_with_raw_strings_kept():
+    posts = [{"id": "1", "likes": "1.2K", "views": "", "replies": 3},
+             {"id": "2", "likes": "lots", "views": "10M"}]
+
+    failures = normalize_counts(posts, keep_raw=True)
+
+    assert posts[0] == {"id": "1", "likes": 1200, "views": None, "replies": 3,
+                        "raw_counts": {"likes": "1.2K", "views": ""}}
+    assert posts[1]["likes"] is None and posts[1]["views"] == 10_000_000
+    assert failures == [(1, "likes", "lots")]
+    assert count_columns(posts, ("likes", "views"))["views"].tolist() == [0, 10_000_000]
+
+
+def test_store_parses_count_columns_per_batch(tmp_path):
+    with PostStore(tmp_path / "posts.db") as store:
+        store.upsert_posts([{"id": "1", "username": "ada", "likes": "2.5K", "views": "?",
+                             "retweet": {"id": "2", "username": "grace", "likes": "12"}}])
+        row = store.conn.execute("SELECT likes, views FROM posts WHERE id = '1'").fetchone()
+        assert tuple(row) == (2500, None)
+        assert store.conn.execute("SELECT likes FROM posts WHERE id = '2'").fetchone()[0] == 12
+        assert store.count_parse_failures == 1
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental scraping high-water marks.
+"""
+
+import json
+
+from e2b_sandbox.browser_scrapers.high_water_marks import HighWaterMarkStore
+
+
+def post(tweet_id, **extra):
+    return {"id": str(tweet_id), "permalink": f"https://x.com/ada/status/{tweet_id}", **extra}
+
+
+def test_second_run_appends_only_the_delta(tmp_path):
+    store = HighWaterMarkStore(tmp_path)
+
+    filepath, added = store.append_delta("ada", "posts", [post(1, pinned=True), post(30), post(20), post(10)])
+    assert added == 4
+    assert store.get("ada", "posts")["newest_id"] == "30"
+
+    # Pinned post is known but skipped, the loop boundary is the first non-pinned known post
+    filepath, added = store.append_delta("ada", "posts", [post(1, pinned=True), post(50), post(40), post(30), post(20)])
+    assert added == 2
+    assert store.get("ada", "posts")["newest_id"] == "50"
+    assert store.known_ids("ada", "posts")[:3] == ["50", "40", "1"]
+
+    with open(filepath, encoding="utf-8") as f:
+        lines = [json.loads(line)["id"] for line in f]
+    assert lines == ["1", "30", "20", "10", "50", "40"]
+
+
+def test_likes_use_feed_order_not_id_order(tmp_path):
+    """A newly liked old tweet has a small ID but is still new"""
+    store = HighWaterMarkStore(tmp_path)
+    likes = [{"permalink": f"https://x.com/x/status/{i}"} for i in (900, 800)]
+    store.append_delta("ada", "likes", likes)
+
+    _, added = store.append_delta("ada", "likes", [{"permalink": "https://x.com/x/status/5"}] + likes)
+    assert added == 1
+    assert store.known_ids("ada", "likes")[0] == "5"
+
+
+def test_handle_case_shares_one_mark_and_one_delta_file(tmp_path):
+    store = HighWaterMarkStore(tmp_path)
+
+    first, _ = store.append_delta("Ada", "posts", [post(10)])
+    second, added = store.append_delta("ada", "posts", [post(20), post(10)])
+
+    assert first == second == tmp_path / "ada_posts.jsonl"
+    assert added == 1
+    assert store.get("ADA", "posts")["updated_at"].endswith("Z")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the HybridRAG query orchestrator.
+"""
+
+import asyncio
+
+from e2b_sandbox.network_intelligence.hybrid_rag import HybridRAG, classify_query
+from e2b_sandbox.network_intelligence.knowledge_graph import KnowledgeGraph
+from e2b_sandbox.network_intelligence.vector_index import VectorIndex
+
+POSTS = [
+    {"id": "10001", "username": "ada", "text": "zero knowledge proofs are finally practical #zk"},
+    {"id": "10002", "username": "grace", "parent_id": "10001", "text": "@ada which proof system? #zk"},
+    {"id": "10003", "username": "linus", "text": "practical zero knowledge proofs for rollups"},
+    {"id": "10004", "username": "linus", "text": "sourdough starter tips"},
+]
+
+
+def make_rag(tmp_path):
+    rag = HybridRAG(KnowledgeGraph(), VectorIndex(tmp_path / "vectors"), cache_ttl=60)
+    rag.ingest(POSTS, handle="ada", page_type="posts")
+    return rag
+
+
+def test_classify_query():
+    assert classify_query("@Ada") == ("handle", "Ada")
+    assert classify_query("1790000000000000000") == ("post", "1790000000000000000")
+    assert classify_query("what is #zk") == ("text", "what is #zk")
+
+
+def test_handle_query_fuses_graph_and_vector_results(tmp_path):
+    rag = make_rag(tmp_path)
+
+    answer = asyncio.run(rag.query("@ada", k=3))
+
+    by_id = {r["id"]: r for r in answer["results"]}
+    # grace's reply is one hop from ada's post and close in content: both paths agree
+    assert answer["results"][0]["id"] in {"10001", "10002"}
+    assert set(by_id["10002"]["sources"]) == {"graph", "vector"}
+    assert "hop" in by_id["10002"]["why"] and "similar content" in by_id["10002"]["why"]
+    assert "10004" not in by_id
+
+
+def test_post_and_text_queries(tmp_path):
+    rag = make_rag(tmp_path)
+
+    related = asyncio.run(rag.query("10003", k=2))
+    assert "10003" not in {r["id"] for r in related["results"]}
+    by_id = {r["id"]: r for r in related["results"]}
+    # Same author two hops away vs. the closest text: both make the cut
+    assert by_id["10004"]["sources"]["graph"]["hops"] == 2
+    assert by_id["10001"]["sources"]["vector"]["rank"] == 1
+
+    topical = asyncio.run(rag.query("proofs #zk", k=5))
+    assert {"10001", "10002"} <= {r["id"] for r in topical["results"] if "graph" in r["sources"]}
+
+
+def test_cache_is_cleared_by_ingestion(tmp_path):
+    rag = make_rag(tmp_path)
+
+    assert asyncio.run(rag.query("@ada"))["cached"] is False
+    assert asyncio.run(rag.query("@ADA"))["cached"] is True
+
+    rag.ingest([{"id": "10005", "username": "ada", "text": "more about #zk proofs"}])
+    answer = asyncio.run(rag.query("@ada"))
+    assert answer["cached"] is False
+    assert "10005" in {r["id"] for r in answer["results"]}
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for the interaction graph and influence scores.
+"""
+
+import numpy as np
+
+from e2b_sandbox.network_intelligence.influence import InfluenceEngine
+from e2b_sandbox.network_intelligence.interactions import InteractionGraph
+from e2b_sandbox.network_intelligence.knowledge_graph import KnowledgeGraph
+
+
+def star_graph(extra=()):
+    """Everyone replies to and quotes ada; grace also likes linus"""
+    graph = KnowledgeGraph()
+    graph.ingest([{"id": "1", "username": "ada", "text": "root"}])
+    for i, user in enumerate(["grace", "linus", "alan", "barbara", *extra]):
+        graph.ingest([{"id": f"{10 + i}", "username": user, "parent_id": "1", "text": "reply"},
+                      {"id": f"{20 + i}", "username": user, "text": "quote", "retweet": {"id": "1", "username": "ada"}}])
+    graph.ingest([{"id": "30", "username": "linus", "text": "@grace hi"}], handle="grace", page_type="likes")
+    return graph
+
+
+def test_interaction_graph_collapses_tweets_into_weighted_user_edges():
+    interactions = InteractionGraph.from_knowledge_graph(star_graph())
+    edges = {(interactions.handle(s), interactions.handle(d)): w
+             for s, d, w in zip(interactions.src, interactions.dst, interactions.weight)}
+
+    assert edges[("grace", "ada")] == 2.5
+    # linus mentions grace in a post grace liked
+    assert edges[("grace", "linus")] == 0.5 and edges[("linus", "grace")] == 0.5
+    assert interactions.kinds["quote"][interactions.index_of("@ada")] == 6.0
+
+
+def test_pagerank_hits_and_in_degree(tmp_path):
+    interactions = InteractionGraph.from_knowledge_graph(star_graph())
+    engine = InfluenceEngine(tmp_path / "influence.json")
+
+    engine.refresh(interactions)
+
+    assert engine.top("pagerank", 1)[0][0] == "ada"
+    assert np.isclose(sum(engine.scores["pagerank"].values()), 1)
+    assert engine.top("authorities", 1)[0][0] == "ada"
+    assert engine.score("@ADA", "weighted_in_degree") == 10.0
+    assert engine.score("ada", "amplification") == 6.0
+    personalized = engine.personalized(interactions, ["grace"], k=2)
+    assert [handle for handle, _ in personalized] == ["ada", "linus"]
+
+
+def test_refresh_warm_starts_from_saved_scores(tmp_path):
+    engine = InfluenceEngine(tmp_path / "influence.json", tol=1e-12)
+    engine.refresh(InteractionGraph.from_knowledge_graph(star_graph()))
+    engine.save()
+    updated = InteractionGraph.from_knowledge_graph(star_graph(extra=["edsger"]))
+
+    warm_engine = InfluenceEngine(tmp_path / "influence.json", tol=1e-12)
+    warm = warm_engine.refresh(updated)
+    scratch = InfluenceEngine(None, tol=1e-12)
+    cold = scratch.refresh(updated)
+
+    assert warm["pagerank"] < cold["pagerank"]
+    assert np.isclose(warm_engine.score("ada"), scratch.score("ada"))
+    assert np.isclose(warm_engine.score("edsger", "hubs"), scratch.score("edsger", "hubs"))
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for the CSR knowledge graph.
+"""
+
+import numpy as np
+
+from e2b_sandbox.network_intelligence.knowledge_graph import KnowledgeGraph
+
+
+def sample_graph():
+    graph = KnowledgeGraph()
+    graph.ingest([
+        {"id": "1", "username": "ada", "text": "Proofs are fun #ZK"},
+        {"id": "2", "username": "grace", "parent_id": "1", "text": "@ada agreed #zk #crypto",
+         "retweet": {"id": "9", "username": "linus", "text": "kernel"}},
+    ], handle="ada", page_type="posts")
+    graph.ingest([{"id": "9", "username": "linus", "text": "kernel"}], handle="ada", page_type="likes")
+    return graph
+
+
+def test_ingest_builds_typed_deduplicated_edges():
+    graph = sample_graph()
+    graph.ingest([{"id": "1", "username": "ada", "text": "Proofs are fun #ZK"}])
+
+    assert graph.summary() == {
+        "nodes": {"user": 3, "tweet": 3, "topic": 2},
+        "edges": {"authored": 3, "replies": 1, "quotes": 1, "liked": 1, "mentions": 1, "tagged": 3},
+    }
+    assert graph.keys(graph.neighbors("user:ada")) == ["tweet:1", "tweet:9"]
+    assert sorted(graph.keys(graph.neighbors("tweet:1", "replies", direction="in"))) == ["tweet:2"]
+    assert sorted(graph.keys(graph.neighbors("topic:zk", direction="in"))) == ["tweet:1", "tweet:2"]
+
+
+def test_k_hop_and_edge_filters():
+    graph = sample_graph()
+
+    ids, hops = graph.k_hop("user:ada", 2, edge_types=["authored", "replies"])
+    assert dict(zip(graph.keys(ids), hops.tolist())) == {"user:ada": 0, "tweet:1": 1, "tweet:2": 2}
+
+    src, dst, _ = graph.edges("tagged")
+    assert sorted(zip(graph.keys(src), graph.keys(dst))) == [
+        ("tweet:1", "topic:zk"), ("tweet:2", "topic:crypto"), ("tweet:2", "topic:zk")]
+    src, dst, _ = graph.edges(src_type="user", dst_type="tweet")
+    assert len(src) == 4
+    assert graph.degree("authored")[graph.node_id("user:grace")] == 1
+
+
+def test_snapshot_round_trip_is_memory_mapped(tmp_path):
+    graph = sample_graph()
+    graph.save(tmp_path / "graph")
+
+    loaded = KnowledgeGraph.load(tmp_path / "graph")
+
+    assert isinstance(loaded.indices, np.memmap)
+    assert loaded.summary() == graph.summary()
+    assert loaded.keys(loaded.neighbors("user:ada")) == ["tweet:1", "tweet:9"]
+    loaded.ingest([{"id": "3", "username": "ada", "parent_id": "2", "text": "#zk"}])
+    assert sorted(loaded.keys(loaded.neighbors("tweet:3"))) == ["topic:zk", "tweet:2"]
+    assert len(loaded) == len(graph) + 1
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline mock X server used by the scraper benchmarks.
+Plain HTTP only, no browser needed.
+"""
+
+import json
+import urllib.error
+import urllib.request
+
+from benchmarks.mock_x_server import MockXConfig, MockXServer
+from e2b_sandbox.browser_scrapers.timeline_interceptor import parse_timeline_response
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def fetch(server, path, cookie=True, referer=None):
+    request = urllib.request.Request(server.base_url + path)
+    if cookie:
+        request.add_header("Cookie", "auth_token=mock")
+    if referer:
+        request.add_header("Referer", server.base_url + referer)
+    try:
+        with urllib.request.build_opener(NoRedirect).open(request) as response:
+            return response.status, response.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers.get("Location")
+
+
+def timeline_page(server, operation, handle_path, cursor):
+    variables = urllib.request.quote(json.dumps({"cursor": cursor}))
+    status, body = fetch(server, f"/i/api/graphql/mock/{operation}?variables={variables}", referer=handle_path)
+    assert status == 200
+    return json.loads(body)
+
+
+def test_pages_require_login_and_use_scraper_markup():
+    with MockXServer(MockXConfig(latency_ms=0)) as server:
+        assert fetch(server, "/ada/likes", cookie=False) == (302, "/login")
+        status, login = fetch(server, "/login", cookie=False)
+        assert 'autocomplete="username"' in login and 'data-testid="LoginButton"' in login
+
+        status, page = fetch(server, "/ada/with_replies")
+        assert status == 200
+        assert "'UserTweetsAndReplies'" in page
+        assert "cellInnerDiv" in page and "tweetText" in page
+
+
+def test_timeline_pages_parse_like_x_responses():
+    config = MockXConfig(total_posts=25, page_size=10, latency_ms=0, quote_depth=2, reply_depth=3)
+    with MockXServer(config) as server:
+        seen, cursor = [], "0"
+        while cursor is not None:
+            body = timeline_page(server, "Likes", "/ada/likes", cursor)
+            seen.extend(parse_timeline_response(body))
+            entries = body["data"]["user"]["result"]["timeline_v2"]["timeline"]["instructions"][0]["entries"]
+            cursors = [e["content"]["value"] for e in entries if e["content"]["entryType"] == "TimelineTimelineCursor"]
+            cursor = cursors[0] if cursors else None
+        assert len(seen) == 25
+        assert len({p["id"] for p in seen}) == 25
+        # Every quote_every-th post carries a quote chain of quote_depth
+        assert seen[1]["retweet"]["retweet"]["id"]
+        # Same entry on a repeated request is identical
+        assert parse_timeline_response(timeline_page(server, "Likes", "/ada/likes", "0"))[:10] == seen[:10]
+
+        replies = parse_timeline_response(timeline_page(server, "UserTweetsAndReplies", "/ada/with_replies", "0"))
+        reply = next(p for p in replies if p.get("username") == "ada" and p.get("reply_chain"))
+        assert len(reply["reply_chain"]) == 3
+        assert reply["parent_id"] == reply["reply_chain"][-1]["id"]
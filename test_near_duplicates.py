@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for MinHash/LSH near-duplicate detection.
+"""
+
+from e2b_sandbox.network_intelligence.near_duplicates import NearDuplicateIndex
+from e2b_sandbox.network_intelligence.post_store import PostStore
+from e2b_sandbox.network_intelligence.vector_index import VectorIndex
+
+ANNOUNCEMENT = "Big news: version 2.0 of our parser ships today with streaming support and faster builds!"
+
+
+def posts():
+    return [
+        {"id": "1", "text": ANNOUNCEMENT + " https://t.co/abc"},
+        {"id": "2", "text": "@bob @carol " + ANNOUNCEMENT.upper() + "!! https://t.co/xyz"},
+        {"id": "3", "text": "Completely unrelated thoughts about sourdough starters and rye flour."},
+        {"id": "4", "text": ""},
+        {"id": "5", "text": ANNOUNCEMENT.replace("today", "tomorrow")},
+    ]
+
+
+def test_near_duplicates_share_the_earliest_posts_cluster():
+    index = NearDuplicateIndex(path=None)
+
+    clusters = index.add(posts())
+
+    assert clusters == ["1", "1", "3", "4", "1"]
+    assert index.similarity("1", "2") > 0.9 and index.similarity("1", "3") < 0.2
+    assert index.clusters() == {"1": ["1", "2", "5"]}
+
+
+def test_streamed_batches_join_existing_clusters_and_persist(tmp_path):
+    path = tmp_path / "near_duplicates.npz"
+    first = NearDuplicateIndex(path=path)
+    first.add(posts()[:3])
+    first.save()
+
+    reloaded = NearDuplicateIndex(path=path)
+    batch = [{"id": "6", "text": ANNOUNCEMENT + " 🚀"}, {"id": "2", "text": "edited later"}]
+    assert reloaded.add(batch) == ["1", "1"]
+    assert batch[0]["dup_cluster_id"] == "1" and len(reloaded) == 4
+
+
+def test_a_post_bridging_two_clusters_joins_one_and_ids_never_change():
+    words = ("the quarterly report shows revenue growth across every region and our team "
+             "shipped three major features on schedule this spring").split()
+
+    def edited(n):
+        return " ".join(["zzz" + w for w in words[:n]] + words[n:])
+
+    index = NearDuplicateIndex(path=None)
+    assert index.add([{"id": "a", "text": edited(0)}, {"id": "b", "text": edited(5)}]) == ["a", "b"]
+    assert index.similarity("a", "b") < 0.8
+
+    # Equally close to both: the earlier cluster wins; closer to b: b's cluster
+    assert index.add([{"id": "c", "text": edited(3)}]) == ["a"]
+    assert index.similarity("c", "a") >= 0.8 and index.similarity("c", "b") >= 0.8
+    assert index.add([{"id": "d", "text": edited(4)}]) == ["b"]
+    assert index.cluster_of("b") == "b" and index.cluster_of("a") == "a"
+    assert index.clusters() == {"a": ["a", "c"], "b": ["b", "d"]}
+
+
+def test_store_and_vector_index_use_the_cluster(tmp_path):
+    batch = posts()
+    NearDuplicateIndex(path=None).add(batch)
+
+    with PostStore(tmp_path / "posts.db") as store:
+        store.upsert_posts(batch)
+        assert [p["id"] for p in store.duplicates_of("2")] == ["1", "5"]
+        assert store.duplicates_of("3") == []
+
+    vectors = VectorIndex(tmp_path / "vectors")
+    vectors.add_posts(batch)
+    assert vectors.vector("1") is not None and vectors.vector("2") is None and vectors.vector("3") is not None
+
+
+def test_vector_index_embeds_a_stand_in_until_the_clusters_first_post_arrives(tmp_path):
+    index = NearDuplicateIndex(path=None)
+    index.add(posts()[:1])
+    vectors = VectorIndex(tmp_path / "vectors")
+
+    # A later run sees only members of cluster 1: the first one stands in for it
+    members = [{"id": "6", "text": ANNOUNCEMENT + " 🚀"}, {"id": "7", "text": ANNOUNCEMENT + " 🎉"}]
+    assert index.add(members) == ["1", "1"]
+    vectors.add_posts(members)
+    assert vectors.vector("6") is not None and vectors.vector("7") is None
+
+    vectors.add_posts(posts()[:1])
+    later = posts()[4:5]
+    index.add(later)
+    vectors.add_posts(later)
+    assert vectors.vector("1") is not None and vectors.vector("5") is None
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for normalized (flat, reference-based) post output.
+"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from e2b_sandbox.browser_scrapers.high_water_marks import HighWaterMarkStore
+from e2b_sandbox.browser_scrapers.post_normalization import NORMALIZE_JS, normalize_posts, rebuild_nested
+from e2b_sandbox.browser_scrapers.stream_sink import STREAM_JS, NdjsonSink
+
+
+def nested_thread():
+    root = {"id": "1", "text": "root", "reply_chain": []}
+    middle = {"id": "2", "text": "middle", "parent_id": "1", "reply_chain": [root]}
+    quoted = {"id": "9", "text": "quoted", "reply_chain": []}
+    return [
+        {"id": "3", "text": "reply", "parent_id": "2", "reply_chain": [root, middle], "retweet": quoted},
+        {"id": "4", "text": "other reply", "parent_id": "2", "reply_chain": [root, middle],
+         "perplexity_context": {"id": "5", "text": "@AskPerplexity", "reply_chain": []}},
+    ]
+
+
+def test_each_tweet_is_emitted_once_with_references():
+    records = normalize_posts(nested_thread())
+
+    assert [r["id"] for r in records] == ["3", "1", "2", "9", "4", "5"]
+    assert all("reply_chain" not in r and "retweet" not in r for r in records)
+    by_id = {r["id"]: r for r in records}
+    assert by_id["3"]["quoted_id"] == "9"
+    assert by_id["4"]["context_id"] == "5"
+    assert by_id["2"]["parent_id"] == "1"
+    assert by_id["2"]["embedded"] is True and "embedded" not in by_id["3"]
+    # Flat records pass through unchanged
+    assert normalize_posts(records) == records
+
+
+def test_a_tweet_seen_on_its_own_replaces_its_embedded_copy():
+    records = normalize_posts([*nested_thread(), {"id": "2", "text": "middle", "parent_id": "1", "pinned": True}])
+
+    assert {r["id"]: r for r in records}["2"] == {"id": "2", "text": "middle", "parent_id": "1", "pinned": True}
+
+
+def test_records_without_id_or_permalink_are_all_kept():
+    keyless = [{"text": "promoted", "retweet": {"text": "embedded ad"}}, {"text": "who to follow"}]
+
+    records = normalize_posts([keyless[0], {"id": "7", "text": "kept"}, keyless[1]])
+
+    assert [r["text"] for r in records] == ["promoted", "embedded ad", "kept", "who to follow"]
+    assert records[1]["embedded"] is True and "quoted_id" not in records[0]
+
+
+def test_rebuild_nested_restores_the_original_shape():
+    posts = nested_thread()
+
+    rebuilt = rebuild_nested(normalize_posts(posts))
+
+    assert [p["id"] for p in rebuilt] == ["3", "4"]
+    assert [a["id"] for a in rebuilt[0]["reply_chain"]] == ["1", "2"]
+    assert [a["id"] for a in rebuilt[0]["reply_chain"][1]["reply_chain"]] == ["1"]
+    assert rebuilt[0]["retweet"]["text"] == "quoted"
+    assert rebuilt[1]["perplexity_context"]["id"] == "5"
+    assert "quoted_id" not in rebuilt[0]
+    assert [p["id"] for p in rebuild_nested(normalize_posts(posts), ids=[2])] == ["2"]
+
+
+def test_rebuild_survives_parent_cycles():
+    records = [{"id": "1", "parent_id": "2"}, {"id": "2", "parent_id": "1"}]
+
+    rebuilt = rebuild_nested(records)
+
+    assert [a["id"] for a in rebuilt[0]["reply_chain"]] == ["2"]
+
+
+def test_old_embedded_tweets_do_not_end_the_incremental_delta(tmp_path):
+    store = HighWaterMarkStore(tmp_path)
+    store.append_delta("ada", "replies", [{"id": "1"}])
+
+    records = normalize_posts([{"id": "3", "parent_id": "1", "reply_chain": [{"id": "1"}]}, {"id": "2"}])
+    _, new_posts = store.append_delta("ada", "replies", records)
+
+    assert new_posts == 3
+    assert store.known_ids("ada", "replies") == ["3", "2", "1"]
+
+
+def run_collect_js(posts, stream=False, flush_every_post=False):
+    """Feed posts through the in-page collectTweet() with node; returns (kept posts, emitted batches)"""
+    script = """
+const window = {};
+const batches = [];
+const [posts, options] = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+if (options.stream) window.__parrotfishEmit = async batch => { batches.push(batch); };
+(async (options) => {
+""" + STREAM_JS + NORMALIZE_JS + """
+  for (const post of posts) {
+    collectTweet(post);
+    if (options.flushEveryPost) await flushBatch();
+  }
+  await flushBatch();
+  console.log(JSON.stringify([keptPosts, batches]));
+})(options);
+"""
+    options = {"normalized": True, "stream": stream, "flushEveryPost": flush_every_post}
+    output = subprocess.run(["node", "-e", script], input=json.dumps([posts, options]), capture_output=True,
+                            text=True, check=True).stdout
+    return json.loads(output)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_in_page_collection_agrees_with_normalize_posts(tmp_path):
+    old = {"id": "7", "text": "old take", "reply_chain": []}
+    quote = {"id": "8", "text": "still right", "retweet": old, "reply_chain": []}
+    # The newer self-quote renders first, then the quoted tweet as its own article, then a reply to the quote
+    posts = [
+        quote,
+        {"id": "7", "text": "old take", "likes": "12", "media": ["a.jpg"], "reply_chain": []},
+        {"id": "10", "text": "agreed", "parent_id": "8", "reply_chain": [quote]},
+        *nested_thread(),
+    ]
+    expected = normalize_posts(posts)
+    assert {r["id"]: r for r in expected}["7"] == {"id": "7", "text": "old take", "likes": "12", "media": ["a.jpg"]}
+
+    kept, _ = run_collect_js(posts)
+    assert kept == expected
+
+    for flush_every_post in (False, True):
+        _, batches = run_collect_js(posts, stream=True, flush_every_post=flush_every_post)
+        sink = NdjsonSink(tmp_path / f"stream_{flush_every_post}.ndjson")
+        for batch in batches:
+            sink.write_batch(batch)
+        assert sink.read_all() == expected
+        assert sink.count == len(expected)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite post store.
+"""
+
+import json
+
+from e2b_sandbox.network_intelligence.post_store import PostStore, parse_count
+
+
+def post(tweet_id, username="ada", date="2025-03-01T10:00:00.000Z", **fields):
+    return {"id": tweet_id, "username": username, "author": username.title(), "text": f"post {tweet_id}",
+            "date": date, "permalink": f"https://x.com/{username}/status/{tweet_id}", **fields}
+
+
+def test_upserts_dedup_and_keep_embedded_posts(tmp_path):
+    with PostStore(tmp_path / "posts.db", batch_size=2) as store:
+        quoted = post("9", username="grace", date="2025-02-01T00:00:00.000Z")
+        ancestor = post("8", username="linus")
+        store.upsert_posts([post("1", likes="1.2K"), post("2", retweet=quoted), post("3", reply_chain=[ancestor])],
+                           "ada", "posts", "2025-03-02T00:00:00Z")
+        store.upsert_posts([post("1", likes=1300, text="edited")], "ada", "posts", "2025-03-03T00:00:00Z")
+
+        assert store.counts() == {"posts": 5, "users": 3, "observations": 4}
+        assert store.get("1")["text"] == "edited"
+        assert store.conn.execute("SELECT likes FROM posts WHERE id = '1'").fetchone()[0] == 1300
+        assert store.conn.execute("SELECT quoted_id FROM posts WHERE id = '2'").fetchone()[0] == "9"
+        assert store.get("9")["username"] == "grace"
+        assert [o["observed_at"] for o in store.observations("1")] == ["2025-03-02T00:00:00Z", "2025-03-03T00:00:00Z"]
+        assert store.user("GRACE")["display_name"] == "Grace"
+        assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_posts_by_handle_date_range(tmp_path):
+    with PostStore(tmp_path / "posts.db") as store:
+        store.upsert_posts([post(str(day), date=f"2025-03-{day:02d}T12:00:00.000Z") for day in range(1, 11)],
+                           "ada", "posts")
+        store.upsert_posts([post("99", username="grace")], "grace", "posts")
+
+        posts = store.posts_by_handle("Ada", since="2025-03-03", until="2025-03-06")
+
+        assert [p["id"] for p in posts] == ["5", "4", "3"]
+        assert len(store.posts_by_handle("ada", limit=4)) == 4
+
+
+def test_likes_of_since_uses_first_observation(tmp_path):
+    with PostStore(tmp_path / "posts.db") as store:
+        store.upsert_posts([post("1", username="grace"), post("2", username="linus")], "ada", "likes",
+                           "2025-03-01T00:00:00Z")
+        store.upsert_posts([post("3", username="grace"), post("1", username="grace")], "ada", "likes",
+                           "2025-03-05T00:00:00Z")
+
+        assert [p["id"] for p in store.likes_of("ada")] == ["3", "2", "1"]
+        assert [p["id"] for p in store.likes_of("ada", since="2025-03-02")] == ["3"]
+        assert store.likes_of("grace") == []
+
+
+def test_import_saved_json_and_ndjson(tmp_path):
+    saved = tmp_path / "ada_likes_2025-03-01.json"
+    saved.write_text(json.dumps({"username": "ada", "pageType": "likes", "scrape_timestamp": "2025-03-01T00:00:00Z",
+                                 "posts": [post("1", username="grace")]}), encoding="utf-8")
+    streamed = tmp_path / "some_user_posts_2025-03-02.ndjson"
+    streamed.write_text("\n".join(json.dumps(post(str(i), username="some_user")) for i in (2, 3)) + "\n",
+                        encoding="utf-8")
+
+    with PostStore(tmp_path / "posts.db") as store:
+        assert store.import_file(saved) == 1
+        assert store.import_file(streamed) == 2
+        assert [p["id"] for p in store.likes_of("ada")] == ["1"]
+        assert {o["handle"] for o in store.observations("2")} == {"some_user"}
+
+
+def test_parse_count():
+    assert parse_count("1,234") == 1234
+    assert parse_count("1.2K") == 1200
+    assert parse_count("3M") == 3_000_000
+    assert parse_count(17) == 17
+    assert parse_count("") is None
+    assert parse_count(None) is None
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the resource blocking profile.
+"""
+
+import asyncio
+
+from e2b_sandbox.browser_scrapers.resource_blocking import (
+    ESTIMATED_BYTES,
+    ResourceBlocker,
+    ResourceBlockingProfile,
+)
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = type("Request", (), {"resource_type": resource_type, "url": url})()
+        self.outcome = None
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+    async def abort(self, reason):
+        self.outcome = reason
+
+
+class FakePage:
+    def __init__(self):
+        self.routes = []
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+
+def test_classify_blocks_media_and_analytics_but_keeps_what_extractors_need():
+    profile = ResourceBlockingProfile()
+
+    assert profile.classify("image", "https://pbs.twimg.com/media/a.jpg") == "image"
+    assert profile.classify("media", "https://video.twimg.com/v.mp4") == "media"
+    assert profile.classify("font", "https://abs.twimg.com/f.woff2") == "font"
+    # URL patterns win over the resource type
+    assert profile.classify("xhr", "https://x.com/i/api/1.1/jot/client_event.json") == "analytics"
+    assert profile.classify("image", "https://www.google-analytics.com/collect") == "analytics"
+    for resource_type in ("document", "script", "xhr", "fetch", "stylesheet"):
+        assert profile.classify(resource_type, "https://x.com/i/api/graphql/abc/UserTweets") is None
+
+    images_only = ResourceBlockingProfile(resource_types=["image"], url_patterns=[])
+    assert images_only.classify("font", "https://abs.twimg.com/f.woff2") is None
+    assert images_only.classify("xhr", "https://x.com/i/api/1.1/jot/x") is None
+
+
+def test_report_counts_are_exact_and_bytes_are_labelled_estimates():
+    blocker = ResourceBlocker(ResourceBlockingProfile(estimated_bytes={"image": 10_000}))
+    page = FakePage()
+    asyncio.run(blocker.install(page))
+    asyncio.run(blocker.install(page))
+    assert len(page.routes) == 1
+
+    handler = page.routes[0][1]
+    routes = [FakeRoute("image", "https://pbs.twimg.com/a.jpg"), FakeRoute("image", "https://pbs.twimg.com/b.jpg"),
+              FakeRoute("font", "https://abs.twimg.com/f.woff2"), FakeRoute("xhr", "https://x.com/i/api/graphql/q")]
+    for route in routes:
+        asyncio.run(handler(route))
+
+    assert [r.outcome for r in routes] == ["blockedbyclient"] * 3 + ["continued"]
+    assert blocker.report() == {
+        "blocked_requests": 3,
+        "allowed_requests": 1,
+        "by_type": {"image": 2, "font": 1},
+        "estimated_bytes_by_type": {"image": 20_000, "font": ESTIMATED_BYTES["font"]},
+        "estimated_bytes_saved": 20_000 + ESTIMATED_BYTES["font"],
+    }
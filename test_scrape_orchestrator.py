@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent scrape orchestrator, with stub scrapers and contexts.
+"""
+
+import asyncio
+
+import pytest
+
+from e2b_sandbox.browser_scrapers import scrape_orchestrator
+from e2b_sandbox.browser_scrapers.scrape_orchestrator import ScrapeOrchestrator
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+
+class StubScraper:
+    """Records how many scrapes run at once; behaviour is picked by handle"""
+    active = 0
+    peak = 0
+
+    def __init__(self, target_handle=None, **options):
+        self.handle = target_handle
+        self.options = options
+
+    async def scrape(self, page):
+        StubScraper.active += 1
+        StubScraper.peak = max(StubScraper.peak, StubScraper.active)
+        try:
+            await asyncio.sleep(0.01)
+            if self.handle == "broken":
+                raise RuntimeError("timeline never loaded")
+            if self.handle == "slow":
+                await asyncio.sleep(10)
+            return {"success": True, "total_posts": 3, "resources_blocked": {"estimated_bytes_saved": 100}}
+        finally:
+            StubScraper.active -= 1
+
+
+def run(orchestrator, contexts):
+    async def go():
+        queue = asyncio.Queue()
+        for context in contexts:
+            queue.put_nowait(context)
+        results = await orchestrator.run_tasks(queue)
+        return results, queue.qsize()
+    return asyncio.run(go())
+
+
+def test_tasks_share_a_bounded_pool_and_failures_stay_isolated(monkeypatch):
+    for page_type in ("likes", "posts"):
+        monkeypatch.setitem(scrape_orchestrator.SCRAPER_CLASSES, page_type, StubScraper)
+    StubScraper.active = StubScraper.peak = 0
+    contexts = [FakeContext(), FakeContext()]
+    orchestrator = ScrapeOrchestrator(["ada", "broken", "slow", "grace"], page_types=["likes", "posts"],
+                                      task_timeout=0.2, username="me", password="pw",
+                                      scraper_options={"normalized": True})
+
+    results, returned = run(orchestrator, contexts)
+
+    assert StubScraper.peak == 2
+    # Every context goes back to the pool and every page is closed, whatever the task did
+    assert returned == 2 and all(page.closed for c in contexts for page in c.pages)
+    assert [(r["handle"], r["page_type"]) for r in results][:2] == [("ada", "likes"), ("ada", "posts")]
+    by_handle = {r["handle"]: r for r in results}
+    assert by_handle["broken"]["error"] == "timeline never loaded"
+    assert by_handle["broken"]["error_type"] == "RuntimeError"
+    assert by_handle["slow"]["error"] == "Timed out after 0.2s"
+    assert by_handle["grace"]["success"] and by_handle["grace"]["total_posts"] == 3
+
+    report = ScrapeOrchestrator.aggregate(results, 1.234)
+    assert {k: v for k, v in report.items() if k != "results"} == {
+        "success": False, "total_tasks": 8, "succeeded": 4, "failed": 4,
+        "total_posts": 12, "estimated_bytes_saved": 400, "duration": 1.23,
+    }
+
+
+def test_unknown_page_types_are_rejected():
+    with pytest.raises(ValueError, match="bookmarks"):
+        ScrapeOrchestrator(["ada"], page_types=["likes", "bookmarks"])
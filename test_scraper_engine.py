@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared scraping engine, driven by a fake page.
+"""
+
+import asyncio
+import json
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from e2b_sandbox.browser_scrapers.playwright_likes_scraper import PlaywrightLikesScraper
+from e2b_sandbox.browser_scrapers.playwright_posts_scraper import PlaywrightPostsScraper
+from e2b_sandbox.browser_scrapers.playwright_replies_scraper import PlaywrightRepliesScraper
+from e2b_sandbox.browser_scrapers.post_pipeline import PostPipeline
+from e2b_sandbox.browser_scrapers.scraper_engine import PageStrategy, PlaywrightScraper, run_scraper
+from e2b_sandbox.browser_scrapers.script_executor import MethodCache
+from e2b_sandbox.browser_scrapers.tracing import REGISTRY
+from e2b_sandbox.network_intelligence.near_duplicates import NearDuplicateIndex
+from e2b_sandbox.network_intelligence.post_store import PostStore
+
+
+class FakePage:
+    """Just enough of a Playwright page for navigate() and page.evaluate extraction"""
+
+    def __init__(self, result=None):
+        self.result = result
+        self.url = "about:blank"
+        self.listeners = {}
+        self.evaluated = []
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    async def goto(self, url):
+        self.url = url
+
+    async def wait_for_load_state(self, state=None, timeout=None):
+        pass
+
+    async def wait_for_selector(self, selector, timeout=None):
+        return object()
+
+    async def evaluate(self, script, options=None):
+        self.evaluated.append(options)
+        return json.loads(json.dumps(self.result))
+
+
+class RecordingTrends:
+    """Stands in for a TrendDetector"""
+
+    def __init__(self):
+        self.seen = []
+
+    def add_posts(self, posts):
+        self.seen.extend(post["id"] for post in posts)
+
+
+class ProfileStrategy(PageStrategy):
+    page_type = "profile"
+
+    def build_url(self, handle, base_url="https://x.com"):
+        return f"{base_url}/{handle}/about"
+
+
+def scraper(cls=PlaywrightScraper, tmp_path=None, **kwargs):
+    return cls(username="me", password="pw", target_handle="ada", output_dir=tmp_path, method_cache=MethodCache(),
+               **kwargs)
+
+
+def test_strategy_selection(tmp_path):
+    assert scraper(PlaywrightPostsScraper, tmp_path).page_type == "posts"
+    assert scraper(PlaywrightRepliesScraper, tmp_path).page_type == "replies"
+    assert scraper(PlaywrightLikesScraper, tmp_path).strategy.build_url("ada") == "https://x.com/ada/likes"
+    # An explicit strategy overrides the class's
+    custom = scraper(PlaywrightPostsScraper, tmp_path, strategy=ProfileStrategy())
+    assert custom.page_type == "profile"
+    with pytest.raises(ValueError, match="PageStrategy"):
+        scraper(PlaywrightScraper, tmp_path)
+
+
+def test_interception_needs_timeline_operations(tmp_path):
+    page = FakePage()
+    posts = scraper(PlaywrightPostsScraper, tmp_path, intercept=True)
+    posts.page = page
+    posts._attach_interceptor()
+    assert posts.interceptor is not None and page.listeners["response"]
+
+    profile = scraper(tmp_path=tmp_path, strategy=ProfileStrategy(), intercept=True)
+    profile.page = FakePage()
+    profile._attach_interceptor()
+    assert profile.interceptor is None and not profile.page.listeners
+
+
+def test_stream_batches_go_through_the_pipeline(tmp_path):
+    trends = RecordingTrends()
+    pipeline = PostPipeline(normalized=True, numeric_counts=True, dedup=NearDuplicateIndex(path=None),
+                            store=tmp_path / "posts.db", trends=trends)
+    engine = scraper(PlaywrightPostsScraper, tmp_path, stream=True, pipeline=pipeline)
+    quoted = {"id": "1", "username": "grace", "text": "a long enough post about compilers and type systems"}
+
+    written = engine._write_stream_batch([
+        {"id": "2", "username": "ada", "text": "quoting this", "likes": "1.2K", "views": "lots", "retweet": quoted},
+        {"id": "3", "username": "ada", "text": quoted["text"] + "!", "likes": ""},
+    ])
+    engine.sink.close()
+
+    assert written == 3
+    records = {r["id"]: r for r in engine.sink.read_all()}
+    assert records["2"]["quoted_id"] == "1" and records["1"]["embedded"] is True
+    assert records["2"]["likes"] == 1200 and records["2"]["views"] is None and records["3"]["likes"] is None
+    assert engine._script_options()["normalized"] is True
+    assert records["3"]["dup_cluster_id"] == "1"
+    assert sorted(trends.seen) == ["1", "2", "3"]
+    with PostStore(tmp_path / "posts.db") as store:
+        assert [p["id"] for p in store.duplicates_of("1")] == ["3"]
+        assert store.observations("2")[0]["handle"] == "ada"
+
+
+def test_scrape_with_a_fake_page_saves_pipeline_output(tmp_path):
+    result = {"posts": [{"id": "5", "username": "ada", "text": "hello", "likes": "3K"}], "totalPosts": 1,
+              "dateStr": "2024-05-20", "scrollRounds": 2, "scrollRoundMs": [100, 200]}
+    page = FakePage(result)
+    engine = scraper(PlaywrightPostsScraper, tmp_path, pipeline=PostPipeline(numeric_counts=True))
+
+    outcome = asyncio.run(engine.scrape(page))
+
+    assert page.url == "https://x.com/ada"
+    assert page.evaluated[0]["pageType"] == "posts" and "normalized" not in page.evaluated[0]
+    assert outcome["success"] and outcome["total_posts"] == 1 and outcome["scroll_rounds"] == 2
+    with open(outcome["filepath"], encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved["pageType"] == "posts" and saved["posts"][0]["likes"] == 3000
+    stamped = datetime.strptime(saved["scrape_timestamp"], "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc)
+    assert abs(datetime.now(timezone.utc) - stamped) < timedelta(minutes=1)
+
+
+def test_scraper_cli_writes_the_metrics_textfile(tmp_path):
+    class FailingScraper:
+        page_type, target_handle = "posts", "ada"
+
+        async def run(self):
+            REGISTRY.inc("cli_test_runs")
+            return {"success": False, "error": "no browser here"}
+
+    textfile = tmp_path / "scraper.prom"
+    result = asyncio.run(run_scraper(FailingScraper(), ["--metrics-textfile", str(textfile)]))
+
+    assert result["success"] is False
+    assert "parrotfish_cli_test_runs" in textfile.read_text(encoding="utf-8")
+
+
+def test_scraping_needs_no_analysis_modules():
+    code = ("import sys; import e2b_sandbox.browser_scrapers.scrape_orchestrator; "
+            "print(sorted(m for m in sys.modules if m == 'numpy' or m.startswith('e2b_sandbox.network_intelligence')))")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the extraction script execution layer.
+"""
+
+import asyncio
+
+import pytest
+
+from e2b_sandbox.browser_scrapers.script_executor import (
+    ContextDestroyedError,
+    MethodCache,
+    NoDataYetError,
+    ScriptCrashedError,
+    ScriptExecutor,
+)
+
+
+def has_data(result):
+    return bool(result and result.get("posts"))
+
+
+def make_methods(calls, outcomes):
+    """One async method per (name, outcome); an Exception outcome is raised"""
+    methods = []
+    for name, outcome in outcomes:
+        async def method(name=name, outcome=outcome):
+            calls.append(name)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        method.__name__ = name
+        methods.append(method)
+    return methods
+
+
+def test_cached_method_runs_first():
+    cache = MethodCache()
+    calls = []
+    methods = make_methods(calls, [
+        ("evaluate", Exception("ReferenceError: foo is not defined")),
+        ("script_tag", {"posts": [{"id": "1"}]}),
+    ])
+
+    assert asyncio.run(ScriptExecutor("likes", methods, has_data, cache).run())["posts"]
+    assert calls == ["evaluate", "script_tag"]
+    assert cache.get("likes") == "script_tag"
+
+    calls.clear()
+    asyncio.run(ScriptExecutor("likes", methods, has_data, cache).run())
+    assert calls == ["script_tag"]
+
+
+def test_errors_are_classified_and_fail_fast():
+    calls = []
+    methods = make_methods(calls, [("evaluate", {"posts": []}), ("script_tag", {"posts": [{"id": "1"}]})])
+    with pytest.raises(NoDataYetError):
+        asyncio.run(ScriptExecutor("posts", methods, has_data, MethodCache()).run())
+    # The script ran fine, so the other methods are not tried
+    assert calls == ["evaluate"]
+
+    methods = make_methods([], [("evaluate", Exception("Execution context was destroyed, most likely because of a navigation"))])
+    with pytest.raises(ContextDestroyedError):
+        asyncio.run(ScriptExecutor("posts", methods, has_data, MethodCache()).run())
+
+    cache = MethodCache()
+    cache.record("posts", "evaluate")
+    methods = make_methods([], [("evaluate", Exception("TypeError: x is null")), ("devtools", Exception("TypeError: x is null"))])
+    with pytest.raises(ScriptCrashedError) as excinfo:
+        asyncio.run(ScriptExecutor("posts", methods, has_data, cache).run())
+    assert not excinfo.value.retryable
+    assert cache.get("posts") is None
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Tests for the adaptive scroll pacing policy.
+"""
+
+import json
+import re
+
+from e2b_sandbox.browser_scrapers.scroll_pacing import PACING_JS, ScrollPacing
+
+
+def test_worst_case_idle_backs_off_up_to_the_cap():
+    # 1500 + 3000 + 6000 + 8000 (capped)
+    assert ScrollPacing().worst_case_idle_ms() == 18500
+    # The legacy policy: 15 fixed 3.5 s sleeps
+    assert ScrollPacing.fixed().worst_case_idle_ms() == 52500
+
+
+def test_worst_case_idle_edge_values():
+    assert ScrollPacing(max_idle_rounds=0).worst_case_idle_ms() == 0
+    assert ScrollPacing(max_idle_rounds=1).worst_case_idle_ms() == 1500
+    assert ScrollPacing(initial_wait_ms=0, max_idle_rounds=5).worst_case_idle_ms() == 0
+    assert ScrollPacing(backoff=1.0, max_idle_rounds=3).worst_case_idle_ms() == 4500
+    # An initial wait above the cap is used once, then clamped (as scrollAndWait does)
+    assert ScrollPacing(initial_wait_ms=10000, max_wait_ms=2000, max_idle_rounds=3).worst_case_idle_ms() == 14000
+
+
+def test_to_options_matches_the_js_defaults_and_carries_overrides():
+    js_defaults = re.search(r"Object\.assign\((\{.*?\})", PACING_JS, re.S).group(1)
+    js_defaults = json.loads(re.sub(r"(\w+):", r'"\1":', js_defaults))
+
+    assert ScrollPacing().to_options() == js_defaults
+
+    options = ScrollPacing.fixed(sleep_ms=2000, max_idle_rounds=3).to_options()
+    assert options == {"initialWaitMs": 2000, "maxWaitMs": 2000, "backoff": 1.0, "settleMs": 400,
+                       "maxIdleRounds": 3, "pollMs": 100, "adaptive": False}
+    assert json.loads(json.dumps(options)) == options
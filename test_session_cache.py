@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the persisted session cache.
+"""
+
+import asyncio
+import json
+import os
+import stat
+import time
+
+from e2b_sandbox.browser_scrapers.session_cache import SessionCache, restore_storage_state
+
+STATE = {"cookies": [{"name": "auth_token", "value": "secret", "domain": ".x.com"}], "origins": []}
+
+
+class FakePage:
+    """Records where it was sent and the localStorage items written there"""
+
+    def __init__(self):
+        self.url = "about:blank"
+        self.routed = []
+        self.local_storage = {}
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        self.routed.append(pattern)
+
+    async def goto(self, url):
+        self.url = url
+
+    async def evaluate(self, script, items):
+        self.local_storage.setdefault(self.url, {}).update({item["name"]: item["value"] for item in items})
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.cookies = []
+        self.pages = []
+
+    async def storage_state(self, path=None):
+        return STATE
+
+    async def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+
+    async def new_page(self):
+        self.pages.append(FakePage())
+        return self.pages[-1]
+
+
+def test_save_writes_a_private_file_and_load_returns_it(tmp_path):
+    cache = SessionCache(tmp_path / "sessions")
+
+    path = asyncio.run(cache.save(FakeContext(), "Ada@Example.com"))
+
+    assert path == tmp_path / "sessions" / "ada_example.com.json"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert cache.load("ada@example.com") == str(path)
+    assert not list((tmp_path / "sessions").glob("*.tmp"))
+
+
+def test_stale_unreadable_and_missing_sessions_are_ignored(tmp_path):
+    cache = SessionCache(tmp_path, max_age_hours=1)
+    assert cache.load("ada") is None
+
+    path = asyncio.run(cache.save(FakeContext(), "ada"))
+    old = time.time() - 2 * 3600
+    os.utime(path, (old, old))
+    assert cache.load("ada") is None
+
+    path.write_text("{not json", encoding="utf-8")
+    assert cache.load("ada") is None
+
+    cache.invalidate("ada")
+    assert not path.exists()
+
+
+def test_restore_replays_cookies_and_local_storage(tmp_path):
+    path = tmp_path / "state.json"
+    state = {**STATE, "origins": [
+        {"origin": "https://x.com", "localStorage": [{"name": "theme", "value": "dark"}]},
+        {"origin": "https://api.x.com", "localStorage": []},
+    ]}
+    path.write_text(json.dumps(state), encoding="utf-8")
+    context = FakeContext()
+
+    asyncio.run(restore_storage_state(context, path))
+
+    assert context.cookies == STATE["cookies"]
+    # One page, requests stubbed, only the origin that has localStorage visited, closed afterwards
+    [page] = context.pages
+    assert page.routed == ["**/*"] and page.local_storage == {"https://x.com": {"theme": "dark"}} and page.closed
+
+    # Cookies alone need no page
+    context = FakeContext()
+    path.write_text(json.dumps(STATE), encoding="utf-8")
+    asyncio.run(restore_storage_state(context, path))
+    assert context.cookies == STATE["cookies"] and not context.pages
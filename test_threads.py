@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for conversation thread reconstruction.
+"""
+
+from e2b_sandbox.network_intelligence.threads import ThreadIndex
+
+
+def post(tweet_id, parent_id=None, username="ada", date="2025-03-01T10:00:00.000Z", **fields):
+    return {"id": tweet_id, "parent_id": parent_id, "username": username, "date": date, "text": tweet_id, **fields}
+
+
+def test_replies_that_arrive_before_their_parents_are_merged():
+    index = ThreadIndex()
+    index.ingest([post("4", "2", "grace"), post("3", "2", "linus")])
+    assert index.root("4") == "2"
+
+    index.ingest([post("2", "1"), post("6", "5")])
+    index.ingest([post("1", date="2025-02-28T09:00:00.000Z"), post("5", "4", "ada", "2025-03-02T08:00:00.000Z")])
+
+    assert {index.root(i) for i in ("1", "2", "3", "4", "5", "6")} == {"1"}
+    assert [(p["id"], p["depth"]) for p in index.thread("6")] == [
+        ("1", 0), ("2", 1), ("3", 2), ("4", 2), ("5", 3), ("6", 4)]
+    assert index.stats("3") == {"root": "1", "posts": 6, "missing": 0, "depth": 4, "width": 2, "max_replies": 2,
+                                "participants": 3, "updated": "2025-03-02T08:00:00.000Z"}
+
+
+def test_reply_chains_link_ancestors_and_unknown_parents_are_placeholders():
+    index = ThreadIndex()
+    root, middle = post("1"), post("2", "1")
+    index.ingest([post("3", "2", "grace", reply_chain=[root, middle]), post("8", "7")])
+
+    assert [p["id"] for p in index.thread("1")] == ["1", "2", "3"]
+    assert index.thread("8")[0] == {"id": "7", "status": "missing", "depth": 0}
+    assert index.stats("8")["missing"] == 1
+    assert index.tree("3")["replies"][0]["replies"][0]["post"]["username"] == "grace"
+
+
+def test_cycles_and_conflicting_parents_are_ignored():
+    index = ThreadIndex()
+    index.ingest([post("2", "1"), post("1", "2"), post("2", "9")])
+
+    assert index.root("1") == "1"
+    assert [p["id"] for p in index.thread("2")] == ["1", "2"]
+
+
+def test_updated_since():
+    index = ThreadIndex()
+    index.ingest([post("1", date="2025-03-01T00:00:00Z"), post("2", "1", date="2025-03-05T12:00:00Z"),
+                  post("3", date="2025-03-04T00:00:00Z"), post("4", date="2025-02-01T00:00:00Z")])
+
+    assert index.updated_since("2025-03-03") == ["1", "3"]
+    assert index.updated_since("2025-03-05T13:00:00Z") == []
+    assert index.updated_since("2025-01-01", min_posts=2) == ["1"]
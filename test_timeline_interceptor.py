@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the timeline response interceptor.
+Runs against recorded GraphQL response fixtures in fixtures/timeline.
+"""
+
+import json
+from pathlib import Path
+
+from e2b_sandbox.browser_scrapers.stream_sink import NdjsonSink
+from e2b_sandbox.browser_scrapers.timeline_interceptor import (
+    TimelineInterceptor,
+    parse_timeline_response,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "timeline"
+
+
+def load_fixture(name):
+    with open(FIXTURES / name, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_parse_likes_response():
+    """Likes entries decode into the posts schema with exact counts"""
+    posts = parse_timeline_response(load_fixture("likes_response.json"))
+    by_id = {p["id"]: p for p in posts}
+
+    assert [p["id"] for p in posts] == [
+        "1800000000000000001",
+        "1800000000000000002",
+        "1800000000000000003",
+        "1800000000000000004",
+        "1800000000000000005",
+        "1800000000000000006",
+    ]
+
+    photo = by_id["1800000000000000001"]
+    assert photo["username"] == "ada"
+    assert photo["author"] == "Ada Lovelace"
+    assert photo["text"] == "Sunset over the bay & the bridge https://example.com/sunset"
+    assert photo["permalink"] == "https://x.com/ada/status/1800000000000000001"
+    assert photo["date"] == "2024-07-01T12:00:00.000Z"
+    assert photo["media"] == ["https://pbs.twimg.com/media/AAA.jpg"]
+    assert (photo["likes"], photo["retweets"], photo["replies"], photo["views"]) == (1234, 56, 7, 98765)
+
+    quote = by_id["1800000000000000002"]
+    assert quote["retweet"]["id"] == "1790000000000000000"
+    assert quote["retweet"]["username"] == "grace"
+
+    assert by_id["1800000000000000003"]["media"] == ["https://video.twimg.com/high.mp4"]
+    assert by_id["1800000000000000004"]["text"].startswith("A very long note tweet")
+    assert by_id["1800000000000000005"]["poll"] == {"options": ["Tabs", "Spaces"]}
+    assert by_id["1800000000000000006"] == {"id": "1800000000000000006", "status": "unavailable"}
+
+
+def test_parse_replies_conversation_module():
+    """Conversation modules produce parent_id and a root-first reply_chain"""
+    posts = parse_timeline_response(load_fixture("replies_response.json"))
+    by_id = {p["id"]: p for p in posts}
+
+    # Pinned entry first, plain retweets resolve to the original tweet
+    assert posts[0]["id"] == "1700000000000000000"
+    assert "1800000000000000002" in by_id
+
+    reply = by_id["1810000000000000001"]
+    assert reply["text"] == "A reply"
+    assert reply["parent_id"] == "1810000000000000000"
+    assert reply["replying_to"] == "Replying to @grace"
+    assert [p["id"] for p in reply["reply_chain"]] == ["1810000000000000000"]
+
+
+def test_interceptor_dedupes_and_matches_operations():
+    interceptor = TimelineInterceptor("likes")
+    assert interceptor.matches("https://x.com/i/api/graphql/abcDEF/Likes?variables=%7B%7D")
+    assert not interceptor.matches("https://x.com/i/api/graphql/abcDEF/UserTweets?variables=%7B%7D")
+
+    payload = load_fixture("likes_response.json")
+    assert interceptor.ingest(payload) == 6
+    assert interceptor.ingest(payload) == 0
+
+    results = interceptor.results("ada")
+    assert results["pageType"] == "likes"
+    assert results["totalPosts"] == 6
+    assert results["responsesSeen"] == 2
+
+
+def test_streaming_interceptor_keeps_only_ids(tmp_path):
+    sink = NdjsonSink(tmp_path / "ada_likes.ndjson")
+    interceptor = TimelineInterceptor("likes", on_posts=sink.write_batch)
+
+    payload = load_fixture("likes_response.json")
+    interceptor.ingest(payload)
+    interceptor.ingest(payload)
+    sink.close()
+
+    results = interceptor.results("ada")
+    assert results["posts"] == []
+    assert (results["totalPosts"], results["streamedPosts"]) == (6, 6)
+    assert [p["id"] for p in sink.read_all()] == [p["id"] for p in parse_timeline_response(payload)]
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for scraper run tracing and the Prometheus export.
+"""
+
+import json
+
+import pytest
+
+from e2b_sandbox.browser_scrapers.tracing import MetricsRegistry, Tracer
+
+
+def test_spans_nest_and_land_in_the_trace_file(tmp_path):
+    registry = MetricsRegistry()
+    tracer = Tracer(tmp_path / "traces.jsonl", registry, labels={"page_type": "likes"}, handle="ada")
+
+    with tracer.span("run"):
+        with tracer.span("extraction"):
+            tracer.record_spans("scroll_round", [0.2, 0.4])
+        with pytest.raises(RuntimeError):
+            with tracer.span("save"):
+                raise RuntimeError("disk full")
+    tracer.count("posts_found", 12)
+
+    with open(tmp_path / "traces.jsonl", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    spans = {r["name"]: r for r in records if r["type"] == "span" and r["name"] != "scroll_round"}
+    rounds = [r for r in records if r.get("name") == "scroll_round"]
+
+    assert spans["run"]["parent_id"] is None
+    assert spans["extraction"]["parent_id"] == spans["run"]["span_id"]
+    assert [r["parent_id"] for r in rounds] == [spans["extraction"]["span_id"]] * 2
+    assert [r["duration_ms"] for r in rounds] == [200, 400]
+    assert spans["save"]["status"] == "error"
+    assert spans["save"]["attributes"]["error"] == "disk full"
+    assert records[-1]["run"] == {"handle": "ada"}
+
+
+def test_prometheus_text_export():
+    registry = MetricsRegistry()
+    tracer = Tracer(None, registry, labels={"page_type": "likes"})
+    tracer.count("posts_found", 12)
+    tracer.count("injection_method", method="_execute_via_evaluate")
+    tracer.observe("scroll_round_seconds", 0.3)
+    tracer.observe("scroll_round_seconds", 7)
+
+    text = registry.render()
+    assert "# TYPE parrotfish_posts_found_total counter" in text
+    assert 'parrotfish_posts_found_total{page_type="likes"} 12' in text
+    assert 'parrotfish_injection_method_total{method="_execute_via_evaluate",page_type="likes"} 1' in text
+    assert 'parrotfish_scroll_round_seconds_bucket{page_type="likes",le="0.5"} 1' in text
+    assert 'parrotfish_scroll_round_seconds_bucket{page_type="likes",le="+Inf"} 2' in text
+    assert 'parrotfish_scroll_round_seconds_count{page_type="likes"} 2' in text
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming trend detector.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from e2b_sandbox.network_intelligence.trends import TrendDetector, post_terms
+
+START = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+def posts_at(hour, texts, prefix):
+    date = (START + timedelta(hours=hour, minutes=5)).isoformat().replace("+00:00", "Z")
+    return [{"id": f"{prefix}{hour}_{i}", "text": text, "date": date} for i, text in enumerate(texts)]
+
+
+def detector(tmp_path, **kwargs):
+    options = {"window": 2, "baseline": 6, "width": 2048, "depth": 4, "min_count": 3,
+               "state_path": tmp_path / "trends.npz"}
+    return TrendDetector(**{**options, **kwargs})
+
+
+def feed(trends, now_hour=8):
+    now = (START + timedelta(hours=now_hour + 1)).timestamp()
+    for hour in range(8):
+        # Steady chatter all along; #zkproofs only takes off in the last two hours
+        texts = ["shipping the rust compiler today #rust"] * 4 + ["@ada thoughts on compilers"] * 2
+        if hour >= 6:
+            texts += ["new #zkproofs paper is out"] * 6
+        trends.add_posts(posts_at(hour, texts, "p"), now=now)
+    return now
+
+
+def test_post_terms_skips_urls_stopwords_and_numbers():
+    assert post_terms("The #AI update from @Ada: https://t.co/x 2024 results") == {"#ai", "@ada", "update", "results"}
+
+
+def test_accelerating_terms_are_flagged_against_their_baseline(tmp_path):
+    trends = detector(tmp_path)
+    feed(trends)
+
+    flagged = [s["term"] for s in trends.trending()]
+    # "new" is a stopword; steady terms like #rust and @ada are not flagged
+    assert flagged == ["#zkproofs", "paper"]
+    assert trends.count("#ZKProofs") == 12
+    assert trends.top(1, kind="hashtag")[0]["term"] == "#zkproofs"
+    assert [s["term"] for s in trends.top(5, kind="mention")] == ["@ada"]
+
+
+def test_memory_is_fixed_and_reposts_are_counted_once(tmp_path):
+    trends = detector(tmp_path, capacity=50)
+    size = trends.memory_bytes()
+    now = feed(trends)
+    trends.add_posts([{"id": f"u{i}", "text": f"#tag{i}", "date": "2024-05-01T07:30:00Z"} for i in range(2000)],
+                     now=now)
+    assert trends.memory_bytes() == size and len(trends) == 50
+
+    before = trends.count("#zkproofs")
+    trends.add_posts(posts_at(7, ["new #zkproofs paper is out"] * 6, "p"), now=now)
+    assert trends.count("#zkproofs") == before
+
+
+def test_window_slides_and_state_survives_a_restart(tmp_path):
+    trends = detector(tmp_path)
+    feed(trends)
+    trends.save()
+
+    reloaded = detector(tmp_path)
+    assert reloaded.count("#zkproofs") == 12
+    # Ten hours later the burst has left both windows
+    later = posts_at(18, ["quiet day"], "q")
+    reloaded.add_posts(later, now=(START + timedelta(hours=19)).timestamp())
+    assert reloaded.count("#zkproofs") == 0 and "#zkproofs" not in reloaded.candidates
+    assert reloaded.add_posts(posts_at(2, ["too old #rust"], "old"), now=(START + timedelta(hours=19)).timestamp()) == 0
+    assert reloaded.dropped == 1
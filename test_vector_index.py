@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for the local vector index.
+"""
+
+import numpy as np
+
+from e2b_sandbox.network_intelligence.vector_index import HashingEmbedder, VectorIndex
+
+TEXTS = {
+    "1": "zero knowledge proofs are finally practical",
+    "2": "practical zero knowledge proofs for rollups",
+    "3": "the best sourdough starter recipe",
+    "4": "sourdough bread needs a lively starter",
+    "5": "election polls and policy debates",
+}
+
+
+def test_hashing_embedder_is_normalized_and_stable():
+    embedder = HashingEmbedder(dim=64)
+    vectors = embedder.embed(["Hello world", "hello   WORLD", ""])
+
+    assert vectors.dtype == np.float32 and vectors.shape == (3, 64)
+    assert np.allclose(vectors[0], vectors[1])
+    assert np.isclose(np.linalg.norm(vectors[0]), 1)
+    assert not vectors[2].any()
+
+
+def test_exact_search_and_related_posts(tmp_path):
+    with VectorIndex(tmp_path / "vectors") as index:
+        posts = [{"id": tweet_id, "text": text} for tweet_id, text in TEXTS.items()]
+        assert index.add_posts(posts) == 5
+        assert index.add_posts(posts[:1]) == 0
+
+        assert index.related("1", k=1)[0][0] == "2"
+        assert index.search("sourdough starter", k=2, exact=True)[0][0] in {"3", "4"}
+        rows, scores = index.search_exact(index.embedder.embed(["rollups", "bread"]), k=2)
+        assert rows.shape == (2, 2) and scores[0, 0] >= scores[0, 1]
+
+
+def test_index_reopens_and_grows_past_its_capacity(tmp_path):
+    with VectorIndex(tmp_path / "vectors", HashingEmbedder(dim=32)) as index:
+        index.add([str(i) for i in range(1500)], [f"post number {i}" for i in range(1500)])
+
+    reopened = VectorIndex(tmp_path / "vectors", HashingEmbedder(dim=32))
+    assert len(reopened) == 1500
+    assert np.allclose(reopened.vector("1234"), reopened.embedder.embed(["post number 1234"])[0])
+    assert reopened.search("post number 1234", k=1, exact=True)[0][1] > 0.99
+    reopened.close()
+
+
+def test_approximate_search_after_the_threshold(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(400, 16)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    with VectorIndex(tmp_path / "vectors", HashingEmbedder(dim=16), ann_threshold=300) as index:
+        index.add_vectors([str(i) for i in range(300)], vectors[:300])
+        assert index.graph is not None
+        index.add_vectors([str(i) for i in range(300, 400)], vectors[300:])
+        assert index.graph.count == 400
+
+        exact = {tweet_id for tweet_id, _ in index.search(vectors[350], k=10, exact=True)}
+        approximate = {tweet_id for tweet_id, _ in index.search(vectors[350], k=10)}
+        assert "350" in approximate
+        assert len(exact & approximate) >= 8